@@ -1,21 +1,39 @@
 """Support for Satel Integra devices."""
-import collections
 
 from satel_integra2.satel_integra import AsyncSatel
 import voluptuous as vol
 
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.discovery import async_load_platform
-from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import slugify
 
+from .adapter import check_controller
+from .router import SatelStatusRouter
+from .state import SatelStateStore
+from .frame_log import SatelFrameLogger
+from .commands import SatelCommandQueue
+from .batcher import SatelPartitionBatcher, SatelSwitchBatcher
+from .services import async_setup_services
+from .tap import SatelFrameTap
+from .capture import SatelFrameRecorder
+from .debounce import SatelZoneDebouncer
+from .snapshot import SatelSnapshot
+from .supervisor import SatelConnectionSupervisor
+from .health import SatelHealthMonitor
+from .eventlog import SatelEventLog
+from .discovery import SatelDeviceDiscovery, merge_devices
+from .proxy import SatelLocalProxy
+from .profiler import SatelLatencyProfiler
+from .panel import SatelPanel
+from .monitored import SatelMonitoredDevices
 from .const import (
     _LOGGER, DOMAIN, CONF_DEVICE_CODE, CONF_DEVICE_PARTITIONS, CONF_ARM_HOME_MODE,CONF_KEYPAD,CONF_TROUBLE,CONF_TROUBLE2,
     CONF_ZONES, CONF_OUTPUTS, CONF_TEMP_SENSORS, CONF_SWITCHABLE_OUTPUTS, CONF_INTEGRATION_KEY,DEFAULT_ZONE_MASK,CONF_ZOME_MASK,
     DEFAULT_PORT, DEFAULT_CONF_ARM_HOME_MODE, DEFAULT_ZONE_TYPE,CONF_EXPANDER_BATTERY,DEFAULT_EXPANDER_BATTERY,
-    DATA_SATEL, CONF_EXPANDER, CONF_DEVICE_CODE, CONF_DEVICE_PARTITIONS, CONF_ARM_HOME_MODE, CONF_ZONE_NAME, CONF_ZONE_TYPE,
+    DATA_PANELS, CONF_PANEL_ID, CONF_PANEL_INDEX, CONNECTION_KEYS, COMMAND_QUEUE_DEPTH, COALESCE_WINDOW, CONF_DEBOUNCE, CONF_DISCOVER, CONF_OPTIMISTIC, CONF_PROXY_PORT, CONF_PROXY_HOST, DEFAULT_PROXY_HOST, SNAPSHOT_INTERVAL, LOG_SUMMARY_INTERVAL, LOG_SAMPLE_EVERY, CONF_EXPANDER, CONF_DEVICE_CODE, CONF_DEVICE_PARTITIONS, CONF_ARM_HOME_MODE, CONF_ZONE_NAME, CONF_ZONE_TYPE,
     CONF_ZONES,CONF_ZONES_ALARM,CONF_ZONES_MEM_ALARM,CONF_ZONES_TAMPER,CONF_ZONES_MEM_TAMPER,CONF_ZONES_BYPASS,CONF_ZONES_MASKED,CONF_ZONES_MEM_MASKED, CONF_OUTPUTS, CONF_TEMP_SENSORS, CONF_SWITCHABLE_OUTPUTS,CONF_SWITCHABLE_BYPASS, CONF_INTEGRATION_KEY, CONF_TEMP_SENSOR_NAME,
     ZONES, SIGNAL_PANEL_MESSAGE, SIGNAL_VIOLATED_UPDATED, SIGNAL_ALARM_UPDATED, SIGNAL_MEM_ALARM_UPDATED, SIGNAL_TAMPER_UPDATED, SIGNAL_MEM_TAMPER_UPDATED, SIGNAL_BYPASS_UPDATED, SIGNAL_MASKED_UPDATED, SIGNAL_MEM_MASKED_UPDATED,SIGNAL_OUTPUTS_UPDATED,SIGNAL_OUTPUTS_BYPASS_UPDATED,SIGNAL_TROUBLE_UPDATED,SIGNAL_TROUBLE2_UPDATED,
 )
@@ -68,205 +86,317 @@ def is_alarm_code_necessary(value):
 
     return value
 
-CONFIG_SCHEMA = vol.Schema(
+def unique_panel_ids(panels):
+    """Default panel ids to host and port and check they are unique."""
+    for panel in panels:
+        panel.setdefault(CONF_PANEL_ID, slugify(f"{panel[CONF_HOST]}_{panel[CONF_PORT]}"))
+    panel_ids = [panel[CONF_PANEL_ID] for panel in panels]
+    if len(set(panel_ids)) != len(panel_ids):
+        raise vol.Invalid("Every panel needs a unique id")
+
+    return panels
+
+PANEL_SCHEMA = vol.All(
     {
-        DOMAIN: vol.All(
-            {
-                vol.Required(CONF_HOST): cv.string,
-                vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
-                vol.Optional(CONF_DEVICE_CODE): cv.string,
-                vol.Optional(CONF_DEVICE_PARTITIONS, default={}): {
-                    vol.Coerce(int): PARTITION_SCHEMA
-                },
-                vol.Optional(CONF_ZONES, default={}): {vol.Coerce(int): ZONE_SCHEMA},
-                vol.Optional(CONF_OUTPUTS, default={}): {vol.Coerce(int): ZONE_SCHEMA},
-                vol.Optional(CONF_EXPANDER, default={}): {vol.Coerce(int): EXPANDER_SCHEMA},
-                vol.Optional(CONF_KEYPAD, default={}): {vol.Coerce(int): KEYPAD_SCHEMA},
-                vol.Optional(CONF_TROUBLE, default={}): {vol.Coerce(int): TROUBLE_SCHEMA},
-                
-                vol.Optional(CONF_SWITCHABLE_OUTPUTS, default={}): {
-                    vol.Coerce(int): EDITABLE_OUTPUT_SCHEMA
-                },
-                vol.Optional(CONF_INTEGRATION_KEY, default=''): cv.string,
-                vol.Optional(CONF_TEMP_SENSORS, default={}): {vol.Coerce(int): TEMP_SENSOR_SCHEMA},
-            },
-            is_alarm_code_necessary,
-        )
+        vol.Required(CONF_HOST): cv.string,
+        vol.Optional(CONF_PANEL_ID): cv.slug,
+        vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
+        vol.Optional(CONF_DEVICE_CODE): cv.string,
+        vol.Optional(CONF_DEVICE_PARTITIONS, default={}): {
+            vol.Coerce(int): PARTITION_SCHEMA
+        },
+        vol.Optional(CONF_ZONES, default={}): {vol.Coerce(int): ZONE_SCHEMA},
+        vol.Optional(CONF_OUTPUTS, default={}): {vol.Coerce(int): ZONE_SCHEMA},
+        vol.Optional(CONF_EXPANDER, default={}): {vol.Coerce(int): EXPANDER_SCHEMA},
+        vol.Optional(CONF_KEYPAD, default={}): {vol.Coerce(int): KEYPAD_SCHEMA},
+        vol.Optional(CONF_TROUBLE, default={}): {vol.Coerce(int): TROUBLE_SCHEMA},
+        
+        vol.Optional(CONF_SWITCHABLE_OUTPUTS, default={}): {
+            vol.Coerce(int): EDITABLE_OUTPUT_SCHEMA
+        },
+        vol.Optional(CONF_INTEGRATION_KEY, default=''): cv.string,
+        vol.Optional(CONF_PROXY_PORT): cv.port,
+        vol.Optional(CONF_PROXY_HOST, default=DEFAULT_PROXY_HOST): cv.string,
+        vol.Optional(CONF_TEMP_SENSORS, default={}): {vol.Coerce(int): TEMP_SENSOR_SCHEMA},
+        vol.Optional(CONF_OPTIMISTIC, default=False): cv.boolean,
+        vol.Optional(CONF_DISCOVER, default=False): cv.boolean,
+        vol.Optional(CONF_DEBOUNCE, default={}): {
+            cv.string: vol.All(vol.Coerce(float), vol.Range(min=0, max=60))
+        },
     },
+    is_alarm_code_necessary,
+)
+
+CONFIG_SCHEMA = vol.Schema(
+    {DOMAIN: vol.All(cv.ensure_list, [PANEL_SCHEMA], unique_panel_ids)},
     extra=vol.ALLOW_EXTRA,
 )
 
+PLATFORMS = [
+    Platform.ALARM_CONTROL_PANEL,
+    Platform.BINARY_SENSOR,
+    Platform.SENSOR,
+    Platform.SWITCH,
+]
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
-    """Set up the Satel Integra component."""
-    conf = config[DOMAIN]
-
-    zones = conf.get(CONF_ZONES)
-    outputs = conf.get(CONF_OUTPUTS)
-    switchable_outputs = conf.get(CONF_SWITCHABLE_OUTPUTS)
-    expanders = conf.get(CONF_EXPANDER)
-    keypad = conf.get(CONF_KEYPAD)
-    trouble = conf.get(CONF_TROUBLE)
-    
+    """Set up the Satel Integra component, import the configured panels."""
+    hass.data.setdefault(DATA_PANELS, {})
+    async_setup_services(hass)
+
+    if panels := config.get(DOMAIN):
+        hass.async_create_task(_async_import_panels(hass, panels))
+
+    return True
+
+
+async def _async_import_panels(hass: HomeAssistant, panels: list[dict]) -> None:
+    """Import the panels one at a time, each asking for its position as index.
+
+    The import step only keeps that index if no other panel uses it, one
+    flow at a time so two panels never pick the same free index.
+    """
+    for index, conf in enumerate(panels):
+        await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": SOURCE_IMPORT},
+            data={**conf, CONF_PANEL_INDEX: index},
+        )
+
+
+def entry_conf(entry: ConfigEntry, devices: dict | None = None) -> dict:
+    """Return the validated panel configuration of a config entry.
+
+    Discovered devices are added if discovery is enabled.
+    """
+    data = dict(entry.data)
+    index = data.pop(CONF_PANEL_INDEX, 0)
+    conf = {**data, **entry.options}
+    if devices and conf.get(CONF_DISCOVER):
+        conf = merge_devices(conf, devices)
+    return {**PANEL_SCHEMA(conf), CONF_PANEL_INDEX: index}
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up a panel from a config entry."""
+    await _async_setup_panel(hass, entry, entry_conf(entry))
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    return True
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a panel and close its connection."""
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        hass.data[DATA_PANELS].pop(entry.data[CONF_PANEL_ID]).close()
+
+    return unload_ok
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running panel.
+
+    Changed connection settings need a new connection and reload the entry,
+    changed devices are added or removed on the live connection.
+    """
+    panel = hass.data[DATA_PANELS][entry.data[CONF_PANEL_ID]]
+    conf = entry_conf(entry, panel.discovery.devices)
+    if any(conf.get(key) != panel.conf.get(key) for key in CONNECTION_KEYS):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    await panel.async_update_options(hass, conf)
+
+
+async def _async_setup_panel(
+    hass: HomeAssistant, entry: ConfigEntry, conf: ConfigType
+) -> None:
+    """Set up one panel with its own connection and state."""
+    panel_id = conf[CONF_PANEL_ID]
+    index = conf[CONF_PANEL_INDEX]
+
     host = conf.get(CONF_HOST)
     port = conf.get(CONF_PORT)
-    partitions = conf.get(CONF_DEVICE_PARTITIONS)
     integration_key = conf.get(CONF_INTEGRATION_KEY)
 
-    monitored_outputs = collections.OrderedDict(
-        list(outputs.items()) + list(switchable_outputs.items())
-    )
-    
-    configured_trouble = list()
-    configured_trouble2 = list()
-    
-    for zone_num, device_config_data in expanders.items():
-        battery = device_config_data[CONF_EXPANDER_BATTERY]
-        configured_trouble2.append(zone_num)
-        configured_trouble2.append(zone_num + 64)
-        configured_trouble2.append(zone_num + 64 + 64 + 8 + 8 + 8)
-        if(zone_num < 64 and battery == "yes"):
-            configured_trouble.append(zone_num+ 128 + 1)
-            configured_trouble.append(zone_num+ 128 + 64 +1)
-            configured_trouble.append(zone_num+ 128 + 64 + 64 +1)
-
-
-    for zone_num, device_config_data in trouble.items():
-        configured_trouble.append(zone_num+320)
-
-    for zone_num, device_config_data in keypad.items():
-        configured_trouble2.append(zone_num+ 64 + 64)
-        configured_trouble2.append(zone_num+ 64 + 64 + 8)
-        configured_trouble2.append(zone_num+ 64 + 64 + 8 + 8 + 64)
-        configured_trouble2.append(zone_num+ 64 + 64 + 8 + 8 + 64 + 8)
-
+    # The controller reports the devices in these collections, updated in
+    # place when the options change
+    monitored = SatelMonitoredDevices(conf)
 
     controller = AsyncSatel(
-        host, port, hass.loop, zones, monitored_outputs, partitions, configured_trouble,configured_trouble2) #, integration_key)
+        host, port, hass.loop, monitored.zones, monitored.outputs, monitored.partitions, monitored.trouble, monitored.trouble2) #, integration_key)
+    check_controller(controller)
+
+    tap = SatelFrameTap(controller)
+    recorder = SatelFrameRecorder(hass, tap)
+    store = SatelStateStore()
+    router = SatelStatusRouter(store)
+    debouncer = SatelZoneDebouncer(hass, conf.get(CONF_DEBOUNCE))
 
-    hass.data[DATA_SATEL] = controller
+    # Entities start with the last known state and are reconciled by the
+    # first status frames of the panel
+    snapshot = SatelSnapshot(hass, store, router, panel_id if index else None)
+    await snapshot.async_restore()
 
-    result = await controller.connect()
+    commands = SatelCommandQueue(hass, COMMAND_QUEUE_DEPTH)
 
-    if not result:
-        return False
+    # Connecting runs in the background, entities are unavailable until then
+    supervisor = SatelConnectionSupervisor(hass, controller, router, commands)
+    health = SatelHealthMonitor(controller, tap, router, supervisor)
+    eventlog = SatelEventLog(hass, controller, commands, supervisor, panel_id, index)
 
     @callback
-    def _close(*_):
-        controller.close()
+    def _discovered() -> None:
+        hass.async_create_task(
+            panel.async_update_options(hass, entry_conf(entry, discovery.devices))
+        )
 
-    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _close)
+    # Devices discovered on an earlier start are set up right away
+    discovery = SatelDeviceDiscovery(
+        hass, controller, commands, supervisor, panel_id, index, _discovered
+    )
+    await discovery.async_load()
+    if conf[CONF_DISCOVER] and discovery.devices:
+        conf = entry_conf(entry, discovery.devices)
+        monitored.update(conf)
 
-    _LOGGER.debug("Arm home config: %s, mode: %s ", conf, conf.get(CONF_ARM_HOME_MODE))
+    proxy = None
+    if proxy_port := conf.get(CONF_PROXY_PORT):
+        proxy = SatelLocalProxy(hass, controller, tap, commands, supervisor, panel_id)
+        try:
+            await proxy.async_start(conf[CONF_PROXY_HOST], proxy_port)
+        except OSError as err:
+            _LOGGER.error(
+                "Cannot start the proxy of panel %s on %s port %s: %s",
+                panel_id, conf[CONF_PROXY_HOST], proxy_port, err,
+            )
+            proxy = None
 
-    hass.async_create_task(
-        async_load_platform(hass, Platform.ALARM_CONTROL_PANEL, DOMAIN, conf, config)
+    panel = hass.data[DATA_PANELS][panel_id] = SatelPanel(
+        panel_id=panel_id,
+        index=index,
+        code=conf.get(CONF_DEVICE_CODE),
+        controller=controller,
+        tap=tap,
+        recorder=recorder,
+        store=store,
+        router=router,
+        debouncer=debouncer,
+        snapshot=snapshot,
+        commands=commands,
+        batcher=SatelSwitchBatcher(hass, controller, commands, COALESCE_WINDOW),
+        partition_batcher=SatelPartitionBatcher(
+            hass, controller, commands, COALESCE_WINDOW
+        ),
+        supervisor=supervisor,
+        health=health,
+        eventlog=eventlog,
+        discovery=discovery,
+        proxy=proxy,
+        profiler=SatelLatencyProfiler(tap, router),
+        conf=conf,
+        monitored=monitored,
     )
 
-    hass.async_create_task(
-        async_load_platform(
-            hass,
-            Platform.BINARY_SENSOR,
-            DOMAIN,
-            {CONF_ZONES: zones, CONF_OUTPUTS: outputs,CONF_EXPANDER: expanders, CONF_KEYPAD: keypad, CONF_TROUBLE:trouble},
-            config,
-        )
-    )
+    commands.async_start()
 
-    hass.async_create_task(
-        async_load_platform(
-            hass,
-            Platform.SWITCH,
-            DOMAIN,
-            {
-                CONF_SWITCHABLE_OUTPUTS: switchable_outputs,
-                CONF_ZONES: zones,
-                CONF_DEVICE_CODE: conf.get(CONF_DEVICE_CODE),
-            },
-            config,
-        )
-    )
+    frame_log = SatelFrameLogger(LOG_SUMMARY_INTERVAL, LOG_SAMPLE_EVERY)
+    stop_frame_log = frame_log.async_start(hass)
+    stop_debounce_log = debouncer.async_start(hass, LOG_SUMMARY_INTERVAL)
+    stop_snapshot = snapshot.async_start(hass, SNAPSHOT_INTERVAL)
+    stop_health = health.async_start(hass)
+    await eventlog.async_start()
+    discovery.async_start(conf[CONF_DISCOVER])
+
+    @callback
+    def _close(*_):
+        if controller.closed:
+            return
+        stop_frame_log()
+        stop_debounce_log()
+        stop_snapshot()
+        snapshot.async_schedule_save()
+        supervisor.async_stop()
+        stop_health()
+        eventlog.async_stop()
+        discovery.async_stop()
+        hass.async_create_task(recorder.async_stop())
+        if proxy:
+            hass.async_create_task(proxy.async_stop())
+        if panel.temperature:
+            panel.temperature.async_stop()
+        commands.async_stop()
+        controller.close()
+
+    panel.close = _close
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _close))
 
-    hass.async_create_task(
-        async_load_platform(
-            hass,
-            Platform.SENSOR,
-            DOMAIN,
-            {
-                CONF_TEMP_SENSORS: conf.get(CONF_TEMP_SENSORS),
-            },
-            config,
-        )
-    )
     @callback
     def alarm_status_update_callback():
         """Send status update received from alarm to Home Assistant."""
-        _LOGGER.debug("ARM panel state callback")
-        async_dispatcher_send(hass, SIGNAL_PANEL_MESSAGE)
+        frame_log.record(
+            "partitions",
+            router.async_dispatch_partitions(controller.partition_states, controller.connected),
+        )
     @callback
     def zones_violated_callback(status):
         """Update zone objects as per notification from the alarm."""
-        _LOGGER.warning("Zones VIOLATED callback, status: %s", status)
-        async_dispatcher_send(hass, SIGNAL_VIOLATED_UPDATED, status[ZONES])
+        frame_log.record("violated", router.async_dispatch(SIGNAL_VIOLATED_UPDATED, status[ZONES]), status)
     @callback
     def zones_alarm_callback(status):
         """Update zone objects as per notification from the alarm."""
-        _LOGGER.warning("Zones ALARM callback, status: %s", status)
-        async_dispatcher_send(hass, SIGNAL_ALARM_UPDATED, status[ZONES])
+        frame_log.record("alarm", router.async_dispatch(SIGNAL_ALARM_UPDATED, status[ZONES]), status)
     @callback
     def zones_mem_alarm_callback(status):
         """Update zone objects as per notification from the alarm."""
-        _LOGGER.warning("Zones MEMORY ALARM callback, status: %s", status)
-        async_dispatcher_send(hass, SIGNAL_MEM_ALARM_UPDATED, status[ZONES])
+        frame_log.record("mem_alarm", router.async_dispatch(SIGNAL_MEM_ALARM_UPDATED, status[ZONES]), status)
     @callback
     def zones_tamper_callback(status):
         """Update zone objects as per notification from the alarm."""
-        _LOGGER.warning("Zones TAMPER callback, status: %s", status)
-        async_dispatcher_send(hass, SIGNAL_TAMPER_UPDATED, status[ZONES])
+        frame_log.record("tamper", router.async_dispatch(SIGNAL_TAMPER_UPDATED, status[ZONES]), status)
     @callback
     def zones_mem_tamper_callback(status):
         """Update zone objects as per notification from the alarm."""
-        _LOGGER.warning("Zones MEM TAMPER callback, status: %s", status)
-        async_dispatcher_send(hass, SIGNAL_MEM_TAMPER_UPDATED, status[ZONES])
+        frame_log.record("mem_tamper", router.async_dispatch(SIGNAL_MEM_TAMPER_UPDATED, status[ZONES]), status)
     @callback
     def zones_bypass_callback(status):
         """Update zone objects as per notification from the alarm."""
-        _LOGGER.warning("Zones BYPASS callback, status: %s", status)
-        async_dispatcher_send(hass, SIGNAL_BYPASS_UPDATED, status[ZONES])
+        frame_log.record("bypass", router.async_dispatch(SIGNAL_BYPASS_UPDATED, status[ZONES]), status)
     @callback
     def zones_masked_callback(status):
         """Update zone objects as per notification from the alarm."""
-        _LOGGER.warning("Zones MASK callback, status: %s", status)
-        async_dispatcher_send(hass, SIGNAL_MASKED_UPDATED, status[ZONES])
+        frame_log.record("masked", router.async_dispatch(SIGNAL_MASKED_UPDATED, status[ZONES]), status)
     @callback
     def zones_mem_masked_callback(status):
         """Update zone objects as per notification from the alarm."""
-        _LOGGER.warning("Zones MEM MASKED callback, status: %s", status)
-        async_dispatcher_send(hass, SIGNAL_MEM_MASKED_UPDATED, status[ZONES])
+        frame_log.record("mem_masked", router.async_dispatch(SIGNAL_MEM_MASKED_UPDATED, status[ZONES]), status)
 
     @callback
     def outputs_update_callback(status):
         """Update zone objects as per notification from the alarm."""
-        _LOGGER.warning("OUTPUT updated callback, status: %s", status)
-        async_dispatcher_send(hass, SIGNAL_OUTPUTS_UPDATED, status["outputs"])
+        frame_log.record("outputs", router.async_dispatch(SIGNAL_OUTPUTS_UPDATED, status["outputs"]), status)
     @callback
     def trouble_callback(status):
         """Update zone objects as per notification from the alarm."""
-        _LOGGER.warning("TROUBLE callback, status: %s", status)
-        async_dispatcher_send(hass, SIGNAL_TROUBLE_UPDATED, status["trouble"])
+        frame_log.record("trouble", router.async_dispatch(SIGNAL_TROUBLE_UPDATED, status["trouble"]), status)
     @callback
     def trouble2_callback(status):
         """Update zone objects as per notification from the alarm."""
-        _LOGGER.warning("TROUBLE2 callback, status: %s", status)
-        async_dispatcher_send(hass, SIGNAL_TROUBLE2_UPDATED, status["trouble2"])
-    # Create a task instead of adding a tracking job, since this task will
-    # run until the connection to satel_integra is closed.
-    hass.loop.create_task(controller.keep_alive())
-    hass.loop.create_task(controller.partition_armed_delay())
-
-    hass.loop.create_task(
-        controller.monitor_status(
-            alarm_status_update_callback, zones_violated_callback, zones_alarm_callback, zones_mem_alarm_callback, zones_tamper_callback,zones_mem_tamper_callback,zones_bypass_callback,zones_masked_callback,zones_mem_masked_callback,outputs_update_callback,trouble_callback,trouble2_callback
+        frame_log.record("trouble2", router.async_dispatch(SIGNAL_TROUBLE2_UPDATED, status["trouble2"]), status)
+    @callback
+    def _start_monitoring():
+        """Start monitoring once the first connection is made."""
+        # Create a task instead of adding a tracking job, since this task will
+        # run until the connection to satel_integra is closed.
+        hass.loop.create_task(controller.keep_alive())
+        hass.loop.create_task(controller.partition_armed_delay())
+
+        hass.loop.create_task(
+            controller.monitor_status(
+                alarm_status_update_callback, zones_violated_callback, zones_alarm_callback, zones_mem_alarm_callback, zones_tamper_callback,zones_mem_tamper_callback,zones_bypass_callback,zones_masked_callback,zones_mem_masked_callback,outputs_update_callback,trouble_callback,trouble2_callback
+            )
         )
-    )
 
-    return True
+    supervisor.async_start(_start_monitoring)
@@ -0,0 +1,122 @@
+"""Access to the AsyncSatel internals the integration builds on.
+
+AsyncSatel has no public API for raw frames, message handlers or the
+reconnect delay. Every use of its private members goes through this
+module and is checked to exist on the controller, so an update of
+satel_integra2 only needs changes here.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import satel_integra2
+
+from homeassistant.exceptions import HomeAssistantError
+
+# Private members of AsyncSatel used by this module
+PRIVATE_MEMBERS = (
+    "_message_handlers",
+    "_read_data",
+    "_send_data",
+    "_reconnection_timeout",
+    "_writer",
+)
+
+MessageHandler = Callable[[bytes], None]
+
+
+def check_controller(controller) -> None:
+    """Raise if the controller lacks a private member used by the integration.
+
+    The version is not checked: the integration installs a fork of
+    satel_integra2 whose version does not track the PyPI releases.
+    """
+    if missing := [name for name in PRIVATE_MEMBERS if not hasattr(controller, name)]:
+        raise HomeAssistantError(
+            f"satel_integra2 {_version()} is not supported, missing {', '.join(missing)}"
+        )
+
+
+def message_handlers(controller) -> dict[bytes, MessageHandler]:
+    """Return the handlers of received frames by command byte.
+
+    Handlers get the decoded frame, starting with the command.
+    """
+    return controller._message_handlers  # noqa: SLF001
+
+
+async def async_send_frame(controller, frame: bytes) -> None:
+    """Send an encoded frame, encrypted if the controller uses a key."""
+    await controller._send_data(frame)  # noqa: SLF001
+
+
+def wrap_frame_io(
+    controller,
+    on_read: Callable[[bytes], None],
+    on_send: Callable[[bytes], None],
+) -> None:
+    """Call on_read with every decoded frame read and on_send before a send."""
+    read_data = controller._read_data  # noqa: SLF001
+    send_data = controller._send_data  # noqa: SLF001
+
+    async def _read_data():
+        data = await read_data()
+        if data:
+            on_read(data)
+        return data
+
+    async def _send_data(data):
+        on_send(data)
+        return await send_data(data)
+
+    controller._read_data = _read_data  # noqa: SLF001
+    controller._send_data = _send_data  # noqa: SLF001
+
+
+def wrap_connection(
+    controller,
+    on_connect: Callable[[bool], None],
+    on_monitoring: Callable[[], None],
+) -> None:
+    """Call on_connect with the result of every connect of the controller.
+
+    on_monitoring is called every time monitoring starts while connected,
+    including the restarts of the monitoring loop after a reconnect.
+    """
+    connect = controller.connect
+    start_monitoring = controller.start_monitoring
+
+    async def _connect():
+        result = await connect()
+        on_connect(result)
+        return result
+
+    async def _start_monitoring():
+        result = await start_monitoring()
+        if controller.connected:
+            on_monitoring()
+        return result
+
+    controller.connect = _connect
+    controller.start_monitoring = _start_monitoring
+
+
+def reconnect_delay(controller) -> float:
+    """Return the seconds the monitoring loop sleeps before reconnecting."""
+    return controller._reconnection_timeout  # noqa: SLF001
+
+
+def set_reconnect_delay(controller, delay: float) -> None:
+    """Set the seconds the monitoring loop sleeps before reconnecting."""
+    controller._reconnection_timeout = delay  # noqa: SLF001
+
+
+def drop_connection(controller) -> None:
+    """Close the socket, the monitoring loop notices and reconnects."""
+    if writer := controller._writer:  # noqa: SLF001
+        writer.close()
+
+
+def _version() -> str:
+    return getattr(satel_integra2, "__version__", "unknown")
+
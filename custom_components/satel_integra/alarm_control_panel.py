@@ -3,59 +3,46 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections import OrderedDict
-
-from satel_integra2.satel_integra import AlarmState
-
 import homeassistant.components.alarm_control_panel as alarm
 from homeassistant.components.alarm_control_panel import (
     AlarmControlPanelEntityFeature,
     AlarmControlPanelState,
 )
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds to wait for the panel to report a disarm before clearing the alarm
+DISARM_CONFIRM_TIMEOUT = 5
+
 from .entity import SatelIntegraEntity
 from .const import (
     CONF_ARM_HOME_MODE,
     CONF_DEVICE_PARTITIONS,
     CONF_ZONE_NAME,
-    DATA_SATEL,
+    CONF_PANEL_ID,
+    DATA_PANELS,
     SIGNAL_PANEL_MESSAGE,
 )
 
-STATE_MAP = OrderedDict(
-    [
-        (AlarmState.TRIGGERED, AlarmControlPanelState.TRIGGERED),
-        (AlarmState.TRIGGERED_FIRE, AlarmControlPanelState.TRIGGERED),
-        (AlarmState.TRIGGERED_MEM, AlarmControlPanelState.TRIGGERED),
-        (AlarmState.TRIGGERED_MEM_FIRE, AlarmControlPanelState.TRIGGERED),
-        (AlarmState.ENTRY_TIME, AlarmControlPanelState.PENDING),
-        (AlarmState.ARMED_MODE3, AlarmControlPanelState.ARMED_HOME),
-        (AlarmState.ARMED_MODE2, AlarmControlPanelState.ARMED_HOME),
-        (AlarmState.ARMED_MODE1, AlarmControlPanelState.ARMED_HOME),
-        (AlarmState.ARMED_MODE0, AlarmControlPanelState.ARMED_AWAY),
-        (AlarmState.EXIT_COUNTDOWN_OVER_10, AlarmControlPanelState.PENDING),
-        (AlarmState.EXIT_COUNTDOWN_UNDER_10, AlarmControlPanelState.PENDING),
-    ]
-)
-
-async def async_setup_platform(
+async def async_setup_entry(
     hass: HomeAssistant,
-    config: ConfigType,
+    entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
-    discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
     """Set up for Satel Integra alarm panels."""
-    if not discovery_info:
-        return
+    panel = hass.data[DATA_PANELS][entry.data[CONF_PANEL_ID]]
+    panel.async_add_platform(
+        Platform.ALARM_CONTROL_PANEL, _build_entities, async_add_entities
+    )
 
-    configured_partitions = discovery_info[CONF_DEVICE_PARTITIONS]
-    controller = hass.data[DATA_SATEL]
+
+def _build_entities(panel, conf):
+    """Build an alarm panel per configured partition."""
+    configured_partitions = conf[CONF_DEVICE_PARTITIONS]
 
     devices = []
 
@@ -63,11 +50,11 @@ async def async_setup_platform(
         zone_name = device_config_data[CONF_ZONE_NAME]
         arm_home_mode = device_config_data.get(CONF_ARM_HOME_MODE)
         device = SatelIntegraAlarmPanel(
-            controller, zone_name, arm_home_mode, partition_num
+            panel, zone_name, arm_home_mode, partition_num
         )
         devices.append(device)
 
-    async_add_entities(devices)
+    return devices
 
 class SatelIntegraAlarmPanel(SatelIntegraEntity, alarm.AlarmControlPanelEntity):
     """Representation of an AlarmDecoder-based alarm panel."""
@@ -79,55 +66,36 @@ class SatelIntegraAlarmPanel(SatelIntegraEntity, alarm.AlarmControlPanelEntity):
         | AlarmControlPanelEntityFeature.ARM_AWAY
     )
 
-    def __init__(self, controller, name, arm_home_mode, partition_id):
+    def __init__(self, panel, name, arm_home_mode, partition_id):
         """Initialize the alarm panel."""
-        super().__init__(controller, partition_id, name, "zone")
+        super().__init__(panel, partition_id, name, "zone")
         self._arm_home_mode = arm_home_mode
         self._device_number = partition_id
-        self._satel_alarm_state = self._read_alarm_state()
-    
+        self._satel_alarm_state = None
+
+    @property
+    def definition(self):
+        """Return the definition, including the arm home mode."""
+        return (*super().definition, self._arm_home_mode)
+
     async def async_added_to_hass(self) -> None:
         """Update alarm status and register callbacks for future updates."""
+        await super().async_added_to_hass()
         _LOGGER.debug("Starts listening for panel messages")
+        router = self._panel.router
+        self._satel_alarm_state = router.partition_state(self._device_number)
         self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass, SIGNAL_PANEL_MESSAGE, self._update_alarm_status
+            router.async_subscribe(
+                SIGNAL_PANEL_MESSAGE, self._device_number, self._update_alarm_status
             )
         )
 
-
     @callback
-    def _update_alarm_status(self):
+    def _update_alarm_status(self, state):
         """Handle alarm status update."""
-        state = self._read_alarm_state()
-        if state != self._satel_alarm_state:
-            _LOGGER.debug("Partition %s CHANGED current: %s, old: %s", self._device_number,state,self._satel_alarm_state)
-            self._satel_alarm_state = state
-            self.async_write_ha_state()
-        else:
-            _LOGGER.debug("Partition %s NOT CHANGED state: %s", self._device_number,state)
-            
-
-    def _read_alarm_state(self):
-        """Read current status of the alarm and translate it into HA status."""
-
-        # Default - disarmed:
-        hass_alarm_status = AlarmControlPanelState.DISARMED
-
-        if not self._satel.connected:
-            return None
-
-        _LOGGER.debug("State map of Satel: %s", self._satel.partition_states)
-
-        for satel_state, ha_state in STATE_MAP.items():
-            if (
-                satel_state in self._satel.partition_states
-                and self._device_number in self._satel.partition_states[satel_state]
-            ):
-                hass_alarm_status = ha_state
-                break
-
-        return hass_alarm_status
+        _LOGGER.debug("Partition %s CHANGED current: %s, old: %s", self._device_number, state, self._satel_alarm_state)
+        self._satel_alarm_state = state
+        self.async_write_ha_state()
 
     async def async_alarm_disarm(self, code: str | None = None) -> None:
         """Send disarm command."""
@@ -139,27 +107,50 @@ class SatelIntegraAlarmPanel(SatelIntegraEntity, alarm.AlarmControlPanelEntity):
 
         _LOGGER.debug("Disarming, self._satel_alarm_state: %s", self._satel_alarm_state)
 
-        await self._satel.disarm(code, [self._device_number])
+        partitions = self._panel.partition_batcher
+        router = self._panel.router
+        # Waiting for the panel to confirm the disarm before clearing the
+        # alarm, a partition that is not armed has nothing to confirm
+        disarmed = None
+        if clear_alarm_necessary and router.armed([self._device_number]):
+            disarmed = router.async_wait_disarmed([self._device_number])
+
+        try:
+            await partitions.async_disarm(code, [self._device_number])
+            if disarmed:
+                async with asyncio.timeout(DISARM_CONFIRM_TIMEOUT):
+                    await disarmed
+        except TimeoutError:
+            _LOGGER.warning(
+                "Partition %s disarm not confirmed within %ss, clearing the alarm anyway",
+                self._device_number, DISARM_CONFIRM_TIMEOUT,
+            )
+        finally:
+            if disarmed:
+                disarmed.cancel()
 
-        if clear_alarm_necessary:
-            # Wait 1s before clearing the alarm
-            await asyncio.sleep(1)
-            _LOGGER.debug("Disarming, partition is triggered, clear alarm necessary self._satel_alarm_state: %s", self._satel_alarm_state)
-            await self._satel.clear_alarm(code, [self._device_number])
+        if not clear_alarm_necessary:
+            return
+        _LOGGER.debug("Disarming, partition is triggered, clear alarm necessary self._satel_alarm_state: %s", self._satel_alarm_state)
+        await partitions.async_clear_alarm(code, [self._device_number])
 
     async def async_alarm_arm_away(self, code: str | None = None) -> None:
         """Send arm away command."""
         _LOGGER.debug("Arming away")
 
         if code:
-            await self._satel.arm(code, [self._device_number])
+            await self._panel.partition_batcher.async_arm(
+                code, [self._device_number]
+            )
 
     async def async_alarm_arm_home(self, code: str | None = None) -> None:
         """Send arm home command."""
         _LOGGER.debug("Arming home")
 
         if code:
-            await self._satel.arm(code, [self._device_number], self._arm_home_mode)
+            await self._panel.partition_batcher.async_arm(
+                code, [self._device_number], self._arm_home_mode
+            )
 
     @property
     def alarm_state(self) -> AlarmControlPanelState | None:
@@ -0,0 +1,208 @@
+"""Coalescing of concurrent panel commands into masked frames."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+from .adapter import async_send_frame
+from .commands import PRIORITY_SECURITY, PRIORITY_SWITCH, SatelCommandQueue
+from .protocol import (
+    CMD_OUTPUTS_OFF,
+    CMD_OUTPUTS_ON,
+    CMD_ZONES_BYPASS,
+    CMD_ZONES_UNBYPASS,
+    masked_command,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+KIND_OUTPUTS = "outputs"
+KIND_BYPASS = "bypass"
+
+ACTION_ARM = "arm"
+ACTION_DISARM = "disarm"
+ACTION_CLEAR_ALARM = "clear_alarm"
+
+# Panel command for (kind, requested state)
+_COMMANDS = {
+    (KIND_OUTPUTS, True): CMD_OUTPUTS_ON,
+    (KIND_OUTPUTS, False): CMD_OUTPUTS_OFF,
+    (KIND_BYPASS, True): CMD_ZONES_BYPASS,
+    (KIND_BYPASS, False): CMD_ZONES_UNBYPASS,
+}
+
+
+class SatelSwitchBatcher:
+    """Merge output and bypass changes arriving together.
+
+    Changes requested within the coalescing window are grouped by panel
+    command and user code and sent as one masked frame per group. When
+    the same device is changed twice within the window the last request
+    wins.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        controller,
+        commands: SatelCommandQueue,
+        window: float,
+    ) -> None:
+        """Initialize the batcher."""
+        self._hass = hass
+        self._satel = controller
+        self._commands = commands
+        self._window = window
+        self._pending: dict[tuple[str, int], tuple[bool, str]] = {}
+        self._waiters: dict[tuple[int, str], list[asyncio.Future[None]]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    async def async_set(self, kind: str, code: str, number: int, state: bool) -> None:
+        """Change a single output or zone bypass."""
+        await self.async_set_many(kind, code, [number], state)
+
+    async def async_set_many(
+        self, kind: str, code: str, numbers: Iterable[int], state: bool
+    ) -> None:
+        """Change several outputs or zone bypasses with the same state."""
+        for number in numbers:
+            self._pending[(kind, number)] = (state, code)
+
+        future: asyncio.Future[None] = self._hass.loop.create_future()
+        self._waiters.setdefault((_COMMANDS[kind, state], code), []).append(future)
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(self._window, self._flush)
+        await future
+
+    @callback
+    def _flush(self) -> None:
+        """Send everything collected in the window."""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        waiters, self._waiters = self._waiters, {}
+
+        groups: dict[tuple[int, str], list[int]] = {}
+        for (kind, number), (state, code) in pending.items():
+            groups.setdefault((_COMMANDS[kind, state], code), []).append(number)
+
+        self._hass.async_create_task(self._async_send(groups, waiters))
+
+    async def _async_send(
+        self,
+        groups: dict[tuple[int, str], list[int]],
+        waiters: dict[tuple[int, str], list[asyncio.Future[None]]],
+    ) -> None:
+        """Send one frame per group and release the waiting callers."""
+        for group, numbers in groups.items():
+            command, code = group
+            _LOGGER.debug("Sending command 0x%02X for %s", command, sorted(numbers))
+            error: Exception | None = None
+            try:
+                await self._commands.async_submit(
+                    PRIORITY_SWITCH,
+                    async_send_frame,
+                    self._satel,
+                    masked_command(command, code, numbers),
+                )
+            except Exception as err:  # noqa: BLE001
+                error = err
+            _release(waiters.pop(group, ()), error)
+
+        # Callers whose every change was overridden within the window
+        for futures in waiters.values():
+            _release(futures, None)
+
+
+class SatelPartitionBatcher:
+    """Merge arm, disarm and clear alarm requests arriving together.
+
+    Requests within the coalescing window are grouped by action, arm mode
+    and user code, and each group is sent as one command carrying all its
+    partitions. Groups are sent in the order they were first requested.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        controller,
+        commands: SatelCommandQueue,
+        window: float,
+    ) -> None:
+        """Initialize the batcher."""
+        self._hass = hass
+        self._satel = controller
+        self._commands = commands
+        self._window = window
+        self._pending: dict[tuple[str, str, int], set[int]] = {}
+        self._waiters: dict[tuple[str, str, int], list[asyncio.Future[None]]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    async def async_arm(self, code: str, partitions: Iterable[int], mode: int = 0) -> None:
+        """Arm partitions in given mode."""
+        await self._async_request((ACTION_ARM, code, mode), partitions)
+
+    async def async_disarm(self, code: str, partitions: Iterable[int]) -> None:
+        """Disarm partitions."""
+        await self._async_request((ACTION_DISARM, code, 0), partitions)
+
+    async def async_clear_alarm(self, code: str, partitions: Iterable[int]) -> None:
+        """Clear alarm of partitions."""
+        await self._async_request((ACTION_CLEAR_ALARM, code, 0), partitions)
+
+    async def _async_request(
+        self, group: tuple[str, str, int], partitions: Iterable[int]
+    ) -> None:
+        """Add partitions to a group and wait until the group is sent."""
+        self._pending.setdefault(group, set()).update(partitions)
+
+        future: asyncio.Future[None] = self._hass.loop.create_future()
+        self._waiters.setdefault(group, []).append(future)
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(self._window, self._flush)
+        await future
+
+    @callback
+    def _flush(self) -> None:
+        """Send everything collected in the window."""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        waiters, self._waiters = self._waiters, {}
+        self._hass.async_create_task(self._async_send(pending, waiters))
+
+    async def _async_send(
+        self,
+        groups: dict[tuple[str, str, int], set[int]],
+        waiters: dict[tuple[str, str, int], list[asyncio.Future[None]]],
+    ) -> None:
+        """Send one command per group and release the waiting callers."""
+        for group, partitions in groups.items():
+            action, code, mode = group
+            partition_list = sorted(partitions)
+            _LOGGER.debug("Sending %s (mode %s) for partitions %s", action, mode, partition_list)
+            if action == ACTION_ARM:
+                command, args = self._satel.arm, (code, partition_list, mode)
+            elif action == ACTION_DISARM:
+                command, args = self._satel.disarm, (code, partition_list)
+            else:
+                command, args = self._satel.clear_alarm, (code, partition_list)
+
+            error: Exception | None = None
+            try:
+                await self._commands.async_submit(PRIORITY_SECURITY, command, *args)
+            except Exception as err:  # noqa: BLE001
+                error = err
+            _release(waiters[group], error)
+
+
+def _release(futures: Iterable[asyncio.Future[None]], error: Exception | None) -> None:
+    """Finish the futures of waiting callers."""
+    for future in futures:
+        if future.done():
+            continue
+        if error:
+            future.set_exception(error)
+        else:
+            future.set_result(None)
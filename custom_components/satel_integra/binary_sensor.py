@@ -6,216 +6,66 @@ from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
 )
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
 _LOGGER = logging.getLogger(__name__)
 
 from .entity import SatelIntegraEntity
 from .const import (
-    CONF_OUTPUTS,
-    CONF_ZONE_NAME,
-    CONF_ZONE_TYPE,
-    CONF_ZOME_MASK,
-    CONF_ZONES,
-    CONF_ZONES_ALARM,
-    CONF_ZONES_MEM_ALARM,
-    CONF_ZONES_TAMPER,
-    CONF_ZONES_MEM_TAMPER,
-    CONF_ZONES_BYPASS,
-    CONF_ZONES_MASKED,
-    CONF_ZONES_MEM_MASKED,
-    CONF_TROUBLE,
-    CONF_TROUBLE2,
-    
-    CONF_KEYPAD,
-    CONF_EXPANDER_BATTERY,
-    CONF_EXPANDER,
-    DATA_SATEL,
-    SIGNAL_OUTPUTS_UPDATED,
+    CONF_PANEL_ID,
+    DATA_PANELS,
     SIGNAL_VIOLATED_UPDATED,
     SIGNAL_ALARM_UPDATED,
     SIGNAL_MEM_ALARM_UPDATED,
     SIGNAL_TAMPER_UPDATED,
     SIGNAL_MEM_TAMPER_UPDATED,
-    SIGNAL_BYPASS_UPDATED,
     SIGNAL_MASKED_UPDATED,
     SIGNAL_MEM_MASKED_UPDATED,
-    SIGNAL_TROUBLE_UPDATED,
-    SIGNAL_TROUBLE2_UPDATED,
 )
 
-async def async_setup_platform(
+# Zone states rarely looked at: their entities are created disabled, so
+# they are not added, subscribed or recorded until enabled
+SECONDARY_SIGNALS = frozenset(
+    (
+        SIGNAL_ALARM_UPDATED,
+        SIGNAL_MEM_ALARM_UPDATED,
+        SIGNAL_TAMPER_UPDATED,
+        SIGNAL_MEM_TAMPER_UPDATED,
+        SIGNAL_MASKED_UPDATED,
+        SIGNAL_MEM_MASKED_UPDATED,
+    )
+)
+
+async def async_setup_entry(
     hass: HomeAssistant,
-    config: ConfigType,
+    entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
-    discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
     """Set up the Satel Integra binary sensor devices."""
-    if not discovery_info:
-        return
-
-    configured_zones = discovery_info[CONF_ZONES]
-    controller = hass.data[DATA_SATEL]
-
-    devices = []
-
-    _LOGGER.debug("Zones %s", configured_zones)
-      
-
-    for zone_num, device_config_data in configured_zones.items():
-        zone_type = device_config_data[CONF_ZONE_TYPE]
-        zone_name = device_config_data[CONF_ZONE_NAME]
-        device = SatelIntegraBinarySensor(
-            controller, 
-            zone_num, 
-            zone_name, 
-            zone_type, 
-            CONF_ZONES, 
-            SIGNAL_VIOLATED_UPDATED
-        )
-        devices.append(device)
-
-    for zone_num, device_config_data in configured_zones.items():
-        zone_type = device_config_data[CONF_ZONE_TYPE]
-        zone_name = device_config_data[CONF_ZONE_NAME] + ' (alarm)'
-        device = SatelIntegraBinarySensor(
-            controller, 
-            zone_num, 
-            zone_name, 
-            zone_type, 
-            CONF_ZONES_ALARM, 
-            SIGNAL_ALARM_UPDATED
-        )
-        devices.append(device)
-
-    for zone_num, device_config_data in configured_zones.items():
-        zone_type = device_config_data[CONF_ZONE_TYPE]
-        zone_name = device_config_data[CONF_ZONE_NAME] + ' (mem alarm)'
-        device = SatelIntegraBinarySensor(
-            controller, 
-            zone_num, 
-            zone_name, 
-            zone_type, 
-            CONF_ZONES_MEM_ALARM, 
-            SIGNAL_MEM_ALARM_UPDATED
-        )
-        devices.append(device)
-
-    for zone_num, device_config_data in configured_zones.items():
-        zone_type = device_config_data[CONF_ZONE_TYPE]
-        zone_name = device_config_data[CONF_ZONE_NAME] + ' (tamper)'
-        device = SatelIntegraBinarySensor(
-            controller, 
-            zone_num, 
-            zone_name, 
-            "tamper", 
-            CONF_ZONES_TAMPER, 
-            SIGNAL_TAMPER_UPDATED
-        )
-        devices.append(device)
-
-    for zone_num, device_config_data in configured_zones.items():
-        zone_type = device_config_data[CONF_ZONE_TYPE]
-        zone_name = device_config_data[CONF_ZONE_NAME] + ' (mem tamper)'
-        device = SatelIntegraBinarySensor(
-            controller, 
-            zone_num, 
-            zone_name, 
-            "tamper", 
-            CONF_ZONES_MEM_TAMPER, 
-            SIGNAL_MEM_TAMPER_UPDATED
-        )
-        devices.append(device)
-        
-    
-    for zone_num, device_config_data in configured_zones.items():
-        
-        try:
-            zone_mask = device_config_data[CONF_ZOME_MASK]
-        except KeyError:
-
-            zone_mask = "no"
-    
-        zone_type = device_config_data[CONF_ZONE_TYPE]
-        zone_name = device_config_data[CONF_ZONE_NAME] + ' (masked)'
-        if zone_mask == "yes":
-            device = SatelIntegraBinarySensor(controller, zone_num, zone_name, "problem", CONF_ZONES_MASKED, SIGNAL_MASKED_UPDATED)
-            devices.append(device)
-
-    for zone_num, device_config_data in configured_zones.items():
-        try:
-            zone_mask = device_config_data[CONF_ZOME_MASK]
-        except KeyError:
-            zone_mask = "no"
-        zone_type = device_config_data[CONF_ZONE_TYPE]
-        zone_name = device_config_data[CONF_ZONE_NAME] + ' (mem masked)'
-        if zone_mask == "yes":
-            device = SatelIntegraBinarySensor(controller, zone_num, zone_name, "problem", CONF_ZONES_MEM_MASKED, SIGNAL_MEM_MASKED_UPDATED)
-            devices.append(device)
-
-    configured_outputs = discovery_info[CONF_OUTPUTS]
-
-    for output_num, device_config_data in configured_outputs.items():
-        output_type = device_config_data[CONF_ZONE_TYPE]
-        output_name = device_config_data[CONF_ZONE_NAME]
-        device = SatelIntegraBinarySensor(
-            controller, output_num, output_name, output_type, "output", SIGNAL_OUTPUTS_UPDATED
+    panel = hass.data[DATA_PANELS][entry.data[CONF_PANEL_ID]]
+    panel.async_add_platform(Platform.BINARY_SENSOR, _build_entities, async_add_entities)
+
+
+def _build_entities(panel, conf):
+    """Build a binary sensor per state bit of the configured devices.
+
+    The bits are laid out by the monitored devices of the panel, from the
+    same pass that produced the trouble bits the controller reports.
+    """
+    return [
+        SatelIntegraBinarySensor(
+            panel,
+            bit.number,
+            bit.name,
+            bit.device_class,
+            bit.spec.device_type,
+            bit.spec.signal,
         )
-        devices.append(device)
-    
-    configured_expanders = discovery_info[CONF_EXPANDER]
-
-    _LOGGER.debug("Expander %s", configured_expanders)
-            
-    for zone_num, device_config_data in configured_expanders.items():
-        zone_name = device_config_data[CONF_ZONE_NAME]
-        battery = device_config_data[CONF_EXPANDER_BATTERY]
-        
-        device = SatelIntegraBinarySensor(controller, zone_num+1, zone_name + " (no comm)", "problem", CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED)
-        devices.append(device)
-        device = SatelIntegraBinarySensor(controller, zone_num + 1 + 64, zone_name + " (changed)", "problem", CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED)
-        devices.append(device)
-        device = SatelIntegraBinarySensor(controller, zone_num +1 + 64 + 64 + 8 + 8 + 8, zone_name + " (tamper)", "problem", CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED)
-        devices.append(device)
-
-        if(zone_num < 64 and battery == "yes"):
-            device = SatelIntegraBinarySensor(controller, zone_num + 128 +1, zone_name + " (AC KO)" , "problem", CONF_TROUBLE, SIGNAL_TROUBLE_UPDATED)
-            devices.append(device)
-            device = SatelIntegraBinarySensor(controller, zone_num + 128 + 64 +1 , zone_name + " (battery KO)", "problem", CONF_TROUBLE, SIGNAL_TROUBLE_UPDATED)
-            devices.append(device)
-            device = SatelIntegraBinarySensor(controller, zone_num+ 128 + 64 + 64 +1, zone_name + " (battery NOT connected)", "problem", CONF_TROUBLE, SIGNAL_TROUBLE_UPDATED)
-            devices.append(device)
-        
-
-    configured_trouble = discovery_info[CONF_TROUBLE]
-    _LOGGER.debug("Trouble %s", configured_trouble)
-
-    for zone_num, device_config_data in configured_trouble.items():
-        zone_name = device_config_data[CONF_ZONE_NAME]
-        
-        device = SatelIntegraBinarySensor(controller, zone_num + 320, zone_name, "problem", CONF_TROUBLE, SIGNAL_TROUBLE_UPDATED)
-        devices.append(device)
-    
-    configured_keypad = discovery_info[CONF_KEYPAD]
-    _LOGGER.debug("Keypad %s", configured_keypad)
-
-    for zone_num, device_config_data in configured_keypad.items():
-        zone_name = device_config_data[CONF_ZONE_NAME]
-        
-        device = SatelIntegraBinarySensor(controller, zone_num +1+ 64 + 64, zone_name + " (no comm)", "problem", CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED)
-        devices.append(device)
-        device = SatelIntegraBinarySensor(controller, zone_num + 1+64 + 64 + 8, zone_name + " (changed)", "problem", CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED)
-        devices.append(device)
-        device = SatelIntegraBinarySensor(controller, zone_num + 1+64 + 64 + 8 + 8 + 64, zone_name +" (tamper)", "problem", CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED)
-        devices.append(device)
-        device = SatelIntegraBinarySensor(controller, zone_num + 1+64 + 64 + 8 + 8 + 64 + 8, zone_name + " (init ko)", "problem", CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED)
-        devices.append(device)
-
-
-    async_add_entities(devices)
+        for bit in panel.monitored.bits
+    ]
 
 
 class SatelIntegraBinarySensor(SatelIntegraEntity, BinarySensorEntity):
@@ -224,107 +74,62 @@ class SatelIntegraBinarySensor(SatelIntegraEntity, BinarySensorEntity):
     _attr_should_poll = False
 
     def __init__(
-        self, controller, device_number, device_name, zone_type, device_type, react_to_signal
+        self, panel, device_number, device_name, zone_type, device_type, react_to_signal
     ):
         """Initialize the binary_sensor."""
-        super().__init__(controller, device_number, device_name, device_type)
+        super().__init__(panel, device_number, device_name, device_type)
         self._zone_type = zone_type
         self._device_name = device_name
         self._state = 0
-        self._attr_unique_id = f"satel_{device_type}_{zone_type}_{device_number}"
+        self._attr_unique_id = panel.unique_id(
+            f"satel_{device_type}_{zone_type}_{device_number}"
+        )
         self._react_to_signal = react_to_signal
+        self._attr_entity_registry_enabled_default = (
+            react_to_signal not in SECONDARY_SIGNALS
+        )
+        self._hold = (
+            panel.debouncer.hold_time(zone_type)
+            if react_to_signal == SIGNAL_VIOLATED_UPDATED
+            else 0
+        )
 
     async def async_added_to_hass(self) -> None:
         """Initialize state and register callbacks."""
-        
-        # Safely read initial state
-        if self._react_to_signal == SIGNAL_OUTPUTS_UPDATED:
-            outputs = getattr(self._satel, "violated_outputs", None)
-            if outputs is not None and self._device_number in outputs:
-                self._state = 1
-            else:
-                self._state = 0
-                
-        elif self._react_to_signal == SIGNAL_VIOLATED_UPDATED:
-            zones = getattr(self._satel, "violated_zones", None)
-            if zones is not None and self._device_number in zones:
-                self._state = 1
-            else:
-                self._state = 0
-                
-        elif self._react_to_signal == SIGNAL_ALARM_UPDATED:
-            zones = getattr(self._satel, "alarm_zones", None)
-            if zones is not None and self._device_number in zones:
-                self._state = 1
-            else:
-                self._state = 0
-                
-        elif self._react_to_signal == SIGNAL_MEM_ALARM_UPDATED:
-            zones = getattr(self._satel, "mem_alarm_zones", None)
-            if zones is not None and self._device_number in zones:
-                self._state = 1
-            else:
-                self._state = 0
-                
-        elif self._react_to_signal == SIGNAL_TAMPER_UPDATED:
-            zones = getattr(self._satel, "tamper_zones", None)
-            if zones is not None and self._device_number in zones:
-                self._state = 1
-            else:
-                self._state = 0
-                
-        elif self._react_to_signal == SIGNAL_MEM_TAMPER_UPDATED:
-            zones = getattr(self._satel, "mem_tamper_zones", None)
-            if zones is not None and self._device_number in zones:
-                self._state = 1
-            else:
-                self._state = 0
-                
-        elif self._react_to_signal == SIGNAL_BYPASS_UPDATED:
-            zones = getattr(self._satel, "bypass_zones", None)
-            if zones is not None and self._device_number in zones:
-                self._state = 1
-            else:
-                self._state = 0
-                
-        elif self._react_to_signal == SIGNAL_MASKED_UPDATED:
-            zones = getattr(self._satel, "masked_zones", None)
-            if zones is not None and self._device_number in zones:
-                self._state = 1
-            else:
-                self._state = 0
-                
-        elif self._react_to_signal == SIGNAL_MEM_MASKED_UPDATED:
-            zones = getattr(self._satel, "mem_masked_zones", None)
-            if zones is not None and self._device_number in zones:
-                self._state = 1
-            else:
-                self._state = 0
-                
-        elif self._react_to_signal == SIGNAL_TROUBLE_UPDATED:
-            trouble = getattr(self._satel, "trouble", None)
-            if trouble is not None and self._device_number in trouble:
-                self._state = 1
-            else:
-                self._state = 0
-                
-        elif self._react_to_signal == SIGNAL_TROUBLE2_UPDATED:
-            trouble2 = getattr(self._satel, "trouble2", None)
-            if trouble2 is not None and self._device_number in trouble2:
-                self._state = 1
-            else:
-                self._state = 0
+        await super().async_added_to_hass()
 
-        # Register dispatcher callback
-        self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass, self._react_to_signal, self._devices_updated
+        # Initial state from the bitmap store
+        self._state = int(
+            self._panel.store.is_set(
+                self._react_to_signal, self._device_number
             )
         )
 
+        # Register for changes of this zone only, chattering zone states
+        # are held by the debouncer
+        router = self._panel.router
+        if self._react_to_signal == SIGNAL_VIOLATED_UPDATED:
+            unsubscribe = self._panel.debouncer.async_subscribe(
+                router,
+                self._react_to_signal,
+                self._device_number,
+                self._zone_type,
+                self._devices_updated,
+            )
+        else:
+            unsubscribe = router.async_subscribe(
+                self._react_to_signal, self._device_number, self._devices_updated
+            )
+        self.async_on_remove(unsubscribe)
+
         # Write initial state to HA
         self.async_write_ha_state()
 
+    @property
+    def definition(self):
+        """Return the definition, including the debounce hold time."""
+        return (*super().definition, self._hold)
+
     @property
     def icon(self):
         """Icon for device by its type."""
@@ -342,9 +147,8 @@ class SatelIntegraBinarySensor(SatelIntegraEntity, BinarySensorEntity):
         return self._zone_type
 
     @callback
-    def _devices_updated(self, zones):
+    def _devices_updated(self, new_state):
         """Update the zone's state, if needed."""
-        new_state = zones.get(self._device_number, 0)
         if self._state != new_state:
             self._state = new_state
             self.async_write_ha_state()
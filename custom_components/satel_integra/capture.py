@@ -0,0 +1,174 @@
+"""Recording and replay of the raw frames exchanged with the panel.
+
+A capture file starts with CAPTURE_MAGIC and the wall clock start time
+(float64), followed by records of: time offset in seconds (float64),
+direction (uint8), length (uint16) and the frame. Received frames are
+stored as decoded by AsyncSatel, sent frames as passed to the socket
+before encryption, with the user code of control commands masked.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+import logging
+import struct
+import time
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .adapter import message_handlers
+from .protocol import CODE_COMMANDS, CODE_LENGTH
+from .tap import DIRECTION_RX, DIRECTION_TX, SatelFrameTap
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b"SATELCAP\x01"
+
+_HEADER = struct.Struct("<d")
+_RECORD = struct.Struct("<dBH")
+
+# Seconds between writes of buffered records to disk
+FLUSH_INTERVAL = 1.0
+# Sent frames start with the frame header, the command and the user code
+_CODE_START = 3
+_MASKED_CODE = b"\xff" * CODE_LENGTH
+
+
+def mask_code(frame: bytes) -> bytes:
+    """Return a sent frame with the user code of control commands masked.
+
+    The checksum is left as sent, so masked frames no longer verify.
+    """
+    if len(frame) > _CODE_START and frame[2] in CODE_COMMANDS:
+        end = _CODE_START + CODE_LENGTH
+        return frame[:_CODE_START] + _MASKED_CODE + frame[end:]
+    return frame
+
+
+def iter_records(data: bytes) -> Iterator[tuple[float, int, bytes]]:
+    """Yield (time offset, direction, frame) of a capture file content."""
+    if not data.startswith(CAPTURE_MAGIC):
+        raise ValueError("Not a Satel capture file")
+    position = len(CAPTURE_MAGIC) + _HEADER.size
+    while position < len(data):
+        offset, direction, length = _RECORD.unpack_from(data, position)
+        position += _RECORD.size
+        yield offset, direction, data[position : position + length]
+        position += length
+
+
+class SatelFrameRecorder:
+    """Record frames seen by a frame tap to a capture file."""
+
+    def __init__(self, hass: HomeAssistant, tap: SatelFrameTap) -> None:
+        """Initialize the recorder."""
+        self._hass = hass
+        self._tap = tap
+        self._remove_listener: CALLBACK_TYPE | None = None
+        self._path: str | None = None
+        self._buffer = bytearray()
+        self._started = 0.0
+        self._flush_task: asyncio.Task | None = None
+
+    @property
+    def recording(self) -> bool:
+        """Return true if frames are being recorded."""
+        return self._path is not None
+
+    async def async_start(self, path: str) -> None:
+        """Start recording into a new capture file."""
+        if self.recording:
+            await self.async_stop()
+
+        self._started = time.monotonic()
+        header = CAPTURE_MAGIC + _HEADER.pack(time.time())
+        await self._hass.async_add_executor_job(_write, path, "wb", header)
+        self._path = path
+
+        self._remove_listener = self._tap.async_add_listener(self._record)
+        self._flush_task = self._hass.async_create_background_task(
+            self._async_flush_periodically(), "satel_integra capture"
+        )
+        _LOGGER.info("Recording panel frames to %s", path)
+
+    async def async_stop(self) -> None:
+        """Stop recording and write the remaining frames."""
+        if not self.recording:
+            return
+        if self._remove_listener:
+            self._remove_listener()
+            self._remove_listener = None
+        if self._flush_task:
+            self._flush_task.cancel()
+        await self._async_flush()
+        _LOGGER.info("Recording to %s stopped", self._path)
+        self._path = None
+
+    @callback
+    def _record(self, direction: int, frame: bytes) -> None:
+        if direction == DIRECTION_TX:
+            frame = mask_code(bytes(frame))
+        self._buffer += _RECORD.pack(time.monotonic() - self._started, direction, len(frame))
+        self._buffer += frame
+
+    async def _async_flush(self) -> None:
+        if self._buffer and self._path:
+            chunk, self._buffer = bytes(self._buffer), bytearray()
+            await self._hass.async_add_executor_job(_write, self._path, "ab", chunk)
+
+    async def _async_flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            await self._async_flush()
+
+
+async def async_replay(hass: HomeAssistant, controller, path: str, speed: float) -> int:
+    """Feed received frames of a capture file to the controller handlers.
+
+    The frames go through the callbacks registered by monitor_status, as if
+    they came from the panel, so replaying is refused and stopped while
+    the panel is connected: replayed and live states would overwrite each
+    other. Speed is a multiplier of the recorded pace, 0 replays as fast
+    as possible. Return the number of frames replayed.
+    """
+    if controller.connected:
+        raise HomeAssistantError("Replay is only possible while the panel is disconnected")
+    data = await hass.async_add_executor_job(_read, path)
+    handlers = message_handlers(controller)
+    replayed = 0
+    started = time.monotonic()
+    first_offset: float | None = None
+    for offset, direction, frame in iter_records(data):
+        if direction != DIRECTION_RX or not frame:
+            continue
+        if first_offset is None:
+            first_offset = offset
+        if speed:
+            delay = (offset - first_offset) / speed - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        elif replayed % 100 == 0:
+            # Let the event loop breathe while replaying at full speed
+            await asyncio.sleep(0)
+        if controller.connected:
+            _LOGGER.warning("Replay stopped after %s frames, the panel connected", replayed)
+            break
+        handler = handlers.get(frame[0:1])
+        if handler:
+            handler(frame)
+            replayed += 1
+    _LOGGER.info(
+        "Replayed %s frames from %s in %.2fs", replayed, path, time.monotonic() - started
+    )
+    return replayed
+
+
+def _write(path: str, mode: str, data: bytes) -> None:
+    with open(path, mode) as capture_file:
+        capture_file.write(data)
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as capture_file:
+        return capture_file.read()
@@ -0,0 +1,196 @@
+"""Priority scheduled command queue for the Satel Integra connection."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+import itertools
+import logging
+import time
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Command classes, lower value is sent first
+PRIORITY_SECURITY = 0
+PRIORITY_SWITCH = 1
+PRIORITY_TELEMETRY = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_SECURITY: "security",
+    PRIORITY_SWITCH: "switch",
+    PRIORITY_TELEMETRY: "telemetry",
+}
+
+# Longest time a command of a class may wait in the queue, in seconds
+COMMAND_DEADLINES = {
+    PRIORITY_SECURITY: 30.0,
+    PRIORITY_SWITCH: 10.0,
+    PRIORITY_TELEMETRY: 60.0,
+}
+# Longest time a single command may take once started, in seconds
+COMMAND_TIMEOUT = 10.0
+# Number of recent wait times kept per class for the metrics
+WAIT_SAMPLES = 100
+
+
+class SatelCommandQueue:
+    """Serialize commands to the panel, most important first.
+
+    Security commands (arm, disarm, clear alarm) go before user switches,
+    which go before telemetry reads. Telemetry reads run one at a time in
+    their own tasks, so a read waiting for its answer does not hold back
+    the commands queued behind it.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_depth: int) -> None:
+        """Initialize the queue."""
+        self._hass = hass
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue(max_depth)
+        self._sequence = itertools.count()
+        self._telemetry_lock = asyncio.Lock()
+        self._telemetry_tasks: set[asyncio.Task] = set()
+        self._in_flight: set[asyncio.Future] = set()
+        self._worker: asyncio.Task | None = None
+        self._waits = {priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITY_NAMES}
+        self._counters = {
+            priority: {"executed": 0, "expired": 0, "rejected": 0, "failed": 0}
+            for priority in PRIORITY_NAMES
+        }
+
+    @callback
+    def async_start(self) -> None:
+        """Start sending queued commands."""
+        self._worker = self._hass.async_create_background_task(
+            self._async_work(), "satel_integra command queue"
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop sending and fail the commands still queued or running."""
+        if self._worker:
+            self._worker.cancel()
+        for task in list(self._telemetry_tasks):
+            task.cancel()
+        futures = list(self._in_flight)
+        while not self._queue.empty():
+            futures.append(self._queue.get_nowait()[3])
+        for future in futures:
+            if not future.done():
+                future.set_exception(HomeAssistantError("Satel command queue stopped"))
+
+    async def async_submit(
+        self,
+        priority: int,
+        command: Callable[..., Awaitable[_T]],
+        *args: Any,
+    ) -> _T:
+        """Queue a command and wait for it to be sent."""
+        future: asyncio.Future[_T] = self._hass.loop.create_future()
+        try:
+            self._queue.put_nowait(
+                (priority, next(self._sequence), time.monotonic(), future, command, args)
+            )
+        except asyncio.QueueFull:
+            self._counters[priority]["rejected"] += 1
+            raise HomeAssistantError(
+                f"Satel command queue is full, {PRIORITY_NAMES[priority]} command rejected"
+            ) from None
+        return await future
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Return queue wait time and counters for every command class."""
+        result = {}
+        for priority, name in PRIORITY_NAMES.items():
+            waits = sorted(self._waits[priority])
+            result[name] = {
+                **self._counters[priority],
+                "wait_avg": sum(waits) / len(waits) if waits else None,
+                "wait_p95": waits[int(len(waits) * 0.95)] if waits else None,
+                "wait_max": waits[-1] if waits else None,
+            }
+        result["depth"] = self._queue.qsize()
+        return result
+
+    async def _async_work(self) -> None:
+        """Send queued commands one by one."""
+        while True:
+            priority, _, queued_at, future, command, args = await self._queue.get()
+            if future.done():
+                continue
+            self._in_flight.add(future)
+            future.add_done_callback(self._in_flight.discard)
+
+            if priority != PRIORITY_TELEMETRY:
+                if self._started(priority, queued_at, future, command):
+                    await self._async_execute(priority, future, command, args)
+                continue
+
+            # Telemetry reads wait for each other outside of this loop
+            task = self._hass.async_create_background_task(
+                self._async_execute_telemetry(queued_at, future, command, args),
+                "satel_integra telemetry command",
+            )
+            self._telemetry_tasks.add(task)
+            task.add_done_callback(self._telemetry_tasks.discard)
+
+    async def _async_execute_telemetry(
+        self,
+        queued_at: float,
+        future: asyncio.Future,
+        command: Callable[..., Awaitable[Any]],
+        args: tuple[Any, ...],
+    ) -> None:
+        """Execute a telemetry read once the previous one is done."""
+        async with self._telemetry_lock:
+            if not future.done() and self._started(
+                PRIORITY_TELEMETRY, queued_at, future, command
+            ):
+                await self._async_execute(PRIORITY_TELEMETRY, future, command, args)
+
+    def _started(
+        self,
+        priority: int,
+        queued_at: float,
+        future: asyncio.Future,
+        command: Callable[..., Awaitable[Any]],
+    ) -> bool:
+        """Account the wait of a command, fail it if it waited too long."""
+        waited = time.monotonic() - queued_at
+        if waited > COMMAND_DEADLINES[priority]:
+            self._counters[priority]["expired"] += 1
+            _LOGGER.warning(
+                "Dropping %s command %s, it waited %.1fs in queue",
+                PRIORITY_NAMES[priority],
+                getattr(command, "__name__", repr(command)),
+                waited,
+            )
+            future.set_exception(HomeAssistantError("Satel command expired in queue"))
+            return False
+        self._waits[priority].append(waited)
+        return True
+
+    async def _async_execute(
+        self,
+        priority: int,
+        future: asyncio.Future,
+        command: Callable[..., Awaitable[Any]],
+        args: tuple[Any, ...],
+    ) -> None:
+        """Execute a command and hand its outcome to the submitter."""
+        try:
+            async with asyncio.timeout(COMMAND_TIMEOUT):
+                result = await command(*args)
+        except Exception as err:  # noqa: BLE001
+            self._counters[priority]["failed"] += 1
+            if not future.done():
+                future.set_exception(err)
+        else:
+            self._counters[priority]["executed"] += 1
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,198 @@
+"""Config flow for the Satel Integra integration."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from satel_integra2.satel_integra import AsyncSatel
+import voluptuous as vol
+
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.selector import (
+    BooleanSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    ObjectSelector,
+    TextSelector,
+)
+from homeassistant.util import slugify
+
+from . import PANEL_SCHEMA
+from .const import (
+    CONF_DEVICE_CODE,
+    CONF_DISCOVER,
+    CONF_INTEGRATION_KEY,
+    CONF_OPTIMISTIC,
+    CONF_PANEL_ID,
+    CONF_PANEL_INDEX,
+    CONF_PROXY_HOST,
+    CONF_PROXY_PORT,
+    CONNECTION_KEYS,
+    DEFAULT_PORT,
+    DEFAULT_PROXY_HOST,
+    DEVICE_OPTIONS,
+    DOMAIN,
+)
+
+# Options edited with a switch instead of as YAML
+BOOLEAN_OPTIONS = (CONF_OPTIMISTIC, CONF_DISCOVER)
+
+USER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_HOST): cv.string,
+        vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
+        vol.Optional(CONF_DEVICE_CODE): cv.string,
+        vol.Optional(CONF_INTEGRATION_KEY): cv.string,
+        vol.Optional(CONF_PANEL_ID): cv.slug,
+    }
+)
+
+
+def _split(conf: Mapping[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Split a panel configuration into entry data and options."""
+    data = {key: conf[key] for key in CONNECTION_KEYS if key in conf}
+    options = {key: conf[key] for key in DEVICE_OPTIONS if key in conf}
+    return data, options
+
+
+class SatelIntegraConfigFlow(ConfigFlow, domain=DOMAIN):
+    """Set up a panel, from the UI or from configuration.yaml."""
+
+    VERSION = 1
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> SatelIntegraOptionsFlow:
+        """Return the options flow editing the devices."""
+        return SatelIntegraOptionsFlow()
+
+    async def async_step_user(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Ask for the connection of a panel."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            panel_id = user_input.setdefault(
+                CONF_PANEL_ID,
+                slugify(f"{user_input[CONF_HOST]}_{user_input[CONF_PORT]}"),
+            )
+            await self.async_set_unique_id(panel_id)
+            self._abort_if_unique_id_configured()
+
+            if await self._async_can_connect(user_input[CONF_HOST], user_input[CONF_PORT]):
+                user_input[CONF_PANEL_INDEX] = self._free_index()
+                return self.async_create_entry(
+                    title=f"Satel {panel_id}",
+                    data=user_input,
+                    options={},
+                )
+            errors["base"] = "cannot_connect"
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=self.add_suggested_values_to_schema(USER_SCHEMA, user_input),
+            errors=errors,
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> ConfigFlowResult:
+        """Import a panel of configuration.yaml, which stays its source."""
+        data, options = _split(import_data)
+        entry = await self.async_set_unique_id(data[CONF_PANEL_ID])
+        if entry:
+            # The panel keeps its index, and with it its entity ids
+            data[CONF_PANEL_INDEX] = entry.data.get(CONF_PANEL_INDEX, 0)
+            self.hass.config_entries.async_update_entry(entry, data=data, options=options)
+            return self.async_abort(reason="already_configured")
+
+        data[CONF_PANEL_INDEX] = self._free_index(data.get(CONF_PANEL_INDEX, 0))
+        return self.async_create_entry(
+            title=f"Satel {data[CONF_PANEL_ID]}", data=data, options=options
+        )
+
+    def _free_index(self, preferred: int = 0) -> int:
+        """Return preferred if no other panel uses it, else the lowest free index.
+
+        Index 0 marks the panel whose entities keep the single panel names.
+        """
+        used = {
+            entry.data.get(CONF_PANEL_INDEX, 0)
+            for entry in self._async_current_entries(include_ignore=False)
+        }
+        if preferred not in used:
+            return preferred
+        return next(index for index in range(len(used) + 1) if index not in used)
+
+    async def _async_can_connect(self, host: str, port: int) -> bool:
+        """Return true if the panel accepts a connection."""
+        controller = AsyncSatel(host, port, self.hass.loop, {}, {}, {}, [], [])
+        try:
+            return await controller.connect()
+        finally:
+            controller.close()
+
+
+class SatelIntegraOptionsFlow(OptionsFlow):
+    """Edit the devices of a panel, applied without reconnecting."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Edit every device section as YAML."""
+        errors: dict[str, str] = {}
+        placeholders = {"error": ""}
+        if user_input is not None:
+            data = dict(self.config_entry.data)
+            data.pop(CONF_PANEL_INDEX, None)
+            try:
+                PANEL_SCHEMA({**data, **user_input})
+            except vol.Invalid as err:
+                errors["base"] = "invalid_devices"
+                placeholders["error"] = str(err)
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = user_input or self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    **{
+                        vol.Optional(key, default=options.get(key, {})): ObjectSelector()
+                        for key in DEVICE_OPTIONS
+                        if key not in BOOLEAN_OPTIONS
+                    },
+                    **{
+                        vol.Optional(key, default=options.get(key, False)): BooleanSelector()
+                        for key in BOOLEAN_OPTIONS
+                    },
+                    vol.Optional(
+                        CONF_PROXY_PORT,
+                        description={
+                            "suggested_value": options.get(
+                                CONF_PROXY_PORT, self.config_entry.data.get(CONF_PROXY_PORT)
+                            )
+                        },
+                    ): NumberSelector(
+                        NumberSelectorConfig(min=1, max=65535, mode=NumberSelectorMode.BOX)
+                    ),
+                    vol.Optional(
+                        CONF_PROXY_HOST,
+                        default=options.get(
+                            CONF_PROXY_HOST,
+                            self.config_entry.data.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST),
+                        ),
+                    ): TextSelector(),
+                }
+            ),
+            errors=errors,
+            description_placeholders=placeholders,
+        )
@@ -1,18 +1,39 @@
+from datetime import timedelta
 import logging
 
+from homeassistant.const import CONF_HOST, CONF_PORT
+
 _LOGGER = logging.getLogger(__package__)
 
 DOMAIN = "satel_integra"
 
 DEFAULT_ALARM_NAME = "satel_integra"
 DEFAULT_PORT = 7094
+# The proxy only serves clients on this host unless another address is set
+DEFAULT_PROXY_HOST = "127.0.0.1"
 DEFAULT_CONF_ARM_HOME_MODE = 1
 DEFAULT_DEVICE_PARTITION = 1
 DEFAULT_ZONE_TYPE = "motion"
 DEFAULT_EXPANDER_BATTERY = "no"
 DEFAULT_ZONE_MASK = "no"
-DATA_SATEL = "satel_integra"
+DATA_PANELS = "satel_integra_panels"
+
+# Maximum number of commands waiting to be sent to the panel
+COMMAND_QUEUE_DEPTH = 64
+# Output/bypass and arm/disarm requests arriving within this many seconds
+# share one frame
+COALESCE_WINDOW = 0.005
+
+# Status frame logging: summary period and every n-th payload dumped at debug
+LOG_SUMMARY_INTERVAL = timedelta(seconds=60)
+LOG_SAMPLE_EVERY = 10
+
+# Period of saving the state snapshot restored on startup, if it changed
+SNAPSHOT_INTERVAL = timedelta(minutes=5)
 
+CONF_PANEL_ID = "id"
+# Position of the panel, the first one keeps the unique ids of a single panel
+CONF_PANEL_INDEX = "index"
 CONF_DEVICE_CODE = "code"
 CONF_DEVICE_PARTITIONS = "partitions"
 CONF_ARM_HOME_MODE = "arm_home_mode"
@@ -23,6 +44,11 @@ CONF_EXPANDER ="expander"
 CONF_KEYPAD ="keypad"
 CONF_TROUBLE ="trouble"
 CONF_TROUBLE2 ="trouble2"
+CONF_DEBOUNCE = "debounce"
+CONF_OPTIMISTIC = "optimistic"
+CONF_DISCOVER = "discover"
+CONF_PROXY_PORT = "proxy_port"
+CONF_PROXY_HOST = "proxy_host"
 
 CONF_ZONE_TYPE = "type"
 CONF_ZONES = "zones"
@@ -40,8 +66,35 @@ CONF_SWITCHABLE_OUTPUTS = "switchable_outputs"
 CONF_SWITCHABLE_BYPASS = "switchable_bypass"
 CONF_INTEGRATION_KEY = "integration_key"
 CONF_TEMP_SENSOR_NAME = "name"
+
+# Keys stored in the config entry data, changing them needs a new connection;
+# all other keys are options applied to the running panel
+CONNECTION_KEYS = (
+    CONF_PANEL_ID,
+    CONF_PANEL_INDEX,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_DEVICE_CODE,
+    CONF_INTEGRATION_KEY,
+    CONF_PROXY_PORT,
+    CONF_PROXY_HOST,
+)
+DEVICE_OPTIONS = (
+    CONF_DEVICE_PARTITIONS,
+    CONF_ZONES,
+    CONF_OUTPUTS,
+    CONF_SWITCHABLE_OUTPUTS,
+    CONF_EXPANDER,
+    CONF_KEYPAD,
+    CONF_TROUBLE,
+    CONF_TEMP_SENSORS,
+    CONF_DEBOUNCE,
+    CONF_OPTIMISTIC,
+    CONF_DISCOVER,
+)
 ZONES = "zones"
 SIGNAL_PANEL_MESSAGE = "satel_integra.panel_message"
+SIGNAL_CONNECTION = "satel_integra.connection"
 SIGNAL_PANEL_ARM_AWAY = "satel_integra.panel_arm_away"
 SIGNAL_PANEL_ARM_HOME = "satel_integra.panel_arm_home"
 SIGNAL_PANEL_DISARM = "satel_integra.panel_disarm"
@@ -61,3 +114,32 @@ SIGNAL_OUTPUTS_BYPASS_UPDATED = "satel_integra.outputs_bypass_updated"
 
 SIGNAL_TROUBLE_UPDATED = "satel_integra.trouble_updated"
 SIGNAL_TROUBLE2_UPDATED = "satel_integra.trouble2_updated"
+
+SERVICE_SET_OUTPUTS = "set_outputs"
+SERVICE_BYPASS_ZONES = "bypass_zones"
+SERVICE_ARM_PARTITIONS = "arm_partitions"
+SERVICE_DISARM_PARTITIONS = "disarm_partitions"
+SERVICE_CLEAR_ALARM = "clear_alarm"
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_REPLAY_CAPTURE = "replay_capture"
+SERVICE_START_PROFILING = "start_profiling"
+SERVICE_STOP_PROFILING = "stop_profiling"
+SERVICE_DUMP_PROFILING = "dump_profiling"
+SERVICE_DISCOVER_DEVICES = "discover_devices"
+
+ATTR_OUTPUTS = "outputs"
+ATTR_ZONES = "zones"
+ATTR_STATE = "state"
+ATTR_BYPASS = "bypass"
+ATTR_PARTITIONS = "partitions"
+ATTR_MODE = "mode"
+ATTR_FILENAME = "filename"
+ATTR_SPEED = "speed"
+ATTR_RESET = "reset"
+ATTR_PANEL = "panel"
+
+# Fired when an optimistic switch state is not confirmed by the panel
+EVENT_SWITCH_ROLLBACK = "satel_integra_switch_rollback"
+# Fired for every new entry of the panel event log
+EVENT_LOG_ENTRY = "satel_integra_log_entry"
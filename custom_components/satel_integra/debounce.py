@@ -0,0 +1,166 @@
+"""Coalescing of chattering zone changes before they reach the entities."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable, Mapping
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .router import SatelStatusRouter
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _HeldZone:
+    """Hold time state machine of one subscribed zone.
+
+    A change after a quiet period is delivered at once and starts the hold
+    time. Changes within the hold time only update the pending state; when
+    it ends the last state is delivered right away if it differs from the
+    delivered one, which starts a new hold time.
+    """
+
+    __slots__ = (
+        "_debouncer",
+        "_zone_type",
+        "_hold",
+        "_target",
+        "_handle",
+        "_pending",
+        "_delivered",
+    )
+
+    def __init__(
+        self,
+        debouncer: SatelZoneDebouncer,
+        zone_type: str,
+        hold: float,
+        target: Callable[[Any], None],
+    ) -> None:
+        self._debouncer = debouncer
+        self._zone_type = zone_type
+        self._hold = hold
+        self._target = target
+        self._handle: asyncio.TimerHandle | None = None
+        self._pending: Any = None
+        self._delivered: Any = None
+
+    @callback
+    def __call__(self, state: Any) -> None:
+        self._debouncer.received[self._zone_type] += 1
+        if self._handle is None:
+            self._deliver(state)
+        else:
+            self._pending = state
+
+    @callback
+    def _deliver(self, state: Any) -> None:
+        self._debouncer.delivered[self._zone_type] += 1
+        self._delivered = state
+        self._handle = self._debouncer.loop.call_later(self._hold, self._release)
+        self._target(state)
+
+    @callback
+    def _release(self) -> None:
+        self._handle = None
+        pending, self._pending = self._pending, None
+        if pending is not None and pending != self._delivered:
+            self._deliver(pending)
+
+    @callback
+    def async_cancel(self) -> None:
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+
+
+class SatelZoneDebouncer:
+    """Apply a per zone type hold time between the router and the entities.
+
+    Counts the changes received from the panel and the ones written to the
+    entities, the difference is the number of suppressed transitions.
+    """
+
+    def __init__(self, hass: HomeAssistant, hold_times: Mapping[str, float]) -> None:
+        """Initialize the debouncer with hold time in seconds per zone type."""
+        self.loop = hass.loop
+        self._hold_times: dict[str, float] = {}
+        self.set_hold_times(hold_times)
+        self.received: Counter[str] = Counter()
+        self.delivered: Counter[str] = Counter()
+        self._logged_received: Counter[str] = Counter()
+        self._logged_delivered: Counter[str] = Counter()
+
+    def set_hold_times(self, hold_times: Mapping[str, float]) -> None:
+        """Set the hold times, used by zones subscribed from now on."""
+        self._hold_times = {
+            zone_type: hold for zone_type, hold in hold_times.items() if hold > 0
+        }
+
+    def hold_time(self, zone_type: str) -> float:
+        """Return the hold time of a zone type, 0 if it is not held."""
+        return self._hold_times.get(zone_type, 0)
+
+    @callback
+    def async_subscribe(
+        self,
+        router: SatelStatusRouter,
+        signal: str,
+        device_number: int,
+        zone_type: str,
+        target: Callable[[Any], None],
+    ) -> CALLBACK_TYPE:
+        """Subscribe target at the router, held if its zone type has a hold time."""
+        hold = self.hold_time(zone_type)
+        if not hold:
+            return router.async_subscribe(signal, device_number, target)
+
+        held = _HeldZone(self, zone_type, hold, target)
+        unsubscribe = router.async_subscribe(signal, device_number, held)
+
+        @callback
+        def async_unsubscribe() -> None:
+            unsubscribe()
+            held.async_cancel()
+
+        return async_unsubscribe
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return received, written and suppressed changes per zone type."""
+        return {
+            zone_type: {
+                "received": self.received[zone_type],
+                "written": self.delivered[zone_type],
+                "suppressed": self.received[zone_type] - self.delivered[zone_type],
+            }
+            for zone_type in self._hold_times
+        }
+
+    @callback
+    def async_start(self, hass: HomeAssistant, interval: timedelta) -> CALLBACK_TYPE:
+        """Start logging periodic summaries of suppressed changes."""
+        return async_track_time_interval(hass, self._async_log_summary, interval)
+
+    @callback
+    def _async_log_summary(self, now: datetime | None = None) -> None:
+        received = self.received - self._logged_received
+        delivered = self.delivered - self._logged_delivered
+        self._logged_received = self.received.copy()
+        self._logged_delivered = self.delivered.copy()
+
+        if not received or not _LOGGER.isEnabledFor(logging.INFO):
+            return
+        _LOGGER.info(
+            "Debounced zone changes: %s suppressed of %s (%s)",
+            received.total() - delivered.total(),
+            received.total(),
+            ", ".join(
+                f"{zone_type}: {count - delivered[zone_type]}/{count}"
+                for zone_type, count in sorted(received.items())
+            ),
+        )
@@ -0,0 +1,23 @@
+"""Diagnostics support for Satel Integra."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PANEL_ID, DATA_PANELS
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return connection health, command queue, debounce, event log and proxy metrics."""
+    panel = hass.data[DATA_PANELS][entry.data[CONF_PANEL_ID]]
+    return {
+        "health": panel.health.metrics(),
+        "commands": panel.commands.metrics(),
+        "debounce": panel.debouncer.stats(),
+        "eventlog": panel.eventlog.metrics(),
+        "proxy": panel.proxy.metrics() if panel.proxy else None,
+    }
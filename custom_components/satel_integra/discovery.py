@@ -0,0 +1,355 @@
+"""Discovery of the devices defined in the Satel Integra panel."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Mapping
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .adapter import async_send_frame, message_handlers
+from .commands import PRIORITY_TELEMETRY, SatelCommandQueue
+from .const import (
+    CONF_DEVICE_PARTITIONS,
+    CONF_EXPANDER,
+    CONF_KEYPAD,
+    CONF_OUTPUTS,
+    CONF_SWITCHABLE_OUTPUTS,
+    CONF_ZONE_NAME,
+    CONF_ZONES,
+)
+from .protocol import encode_frame
+from .supervisor import SatelConnectionSupervisor
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = "satel_integra.discovery"
+STORAGE_VERSION = 1
+
+CMD_INTEGRA_VERSION = b"\x7e"
+CMD_DEVICE_NAME = b"\xee"
+CMD_RESULT = b"\xef"
+# Result codes of commands that were carried out, every other code refuses
+RESULT_OK = 0x00
+RESULT_ACCEPTED = 0xFF
+
+# Device types of the read device name command
+DEVICE_PARTITION = 0x00
+DEVICE_MODULE = 0x03
+DEVICE_OUTPUT = 0x04
+DEVICE_ZONE_PARTITION = 0x05
+# Module addresses of expanders and keypads
+EXPANDER_FIRST = 129
+EXPANDER_COUNT = 64
+KEYPAD_FIRST = 193
+KEYPAD_COUNT = 8
+# Output function of outputs that are not used
+OUTPUT_NOT_USED = 0
+# Name field of the read device name answer
+NAME_START = 4
+NAME_END = 20
+
+# Zones/outputs and partitions of every INTEGRA type, by the type byte of
+# the version answer; unknown types are read as the largest one
+INTEGRA_SIZES = {
+    0: (24, 4),
+    1: (32, 16),
+    2: (64, 32),
+    3: (128, 32),
+    4: (128, 32),
+    66: (64, 32),
+    67: (128, 32),
+    72: (256, 32),
+    132: (128, 32),
+}
+DEFAULT_SIZE = (256, 32)
+
+# Seconds after monitoring starts before the version is checked, the state
+# resync goes first
+DISCOVERY_DELAY = 30
+# Minimum pause between two reads, keeps the bus free for zone monitoring
+READ_SPACING = 0.2
+# Longest wait for the answer to one read, in seconds
+READ_TIMEOUT = 5.0
+# Name reads in a row without answer after which discovery gives up, a
+# single unanswered read only skips that device
+READ_FAILURE_LIMIT = 5
+
+
+def merge_devices(
+    conf: Mapping[str, Any], devices: Mapping[str, Mapping[int, Mapping[str, Any]]]
+) -> dict[str, Any]:
+    """Return conf with the discovered devices added to its sections.
+
+    Configured devices win over discovered ones, outputs configured as
+    switchable are not added again as read only outputs.
+    """
+    merged = dict(conf)
+    switchable = {int(number) for number in conf.get(CONF_SWITCHABLE_OUTPUTS, {})}
+    for section, found in devices.items():
+        configured = {int(number): device for number, device in conf.get(section, {}).items()}
+        merged[section] = {
+            **{
+                number: dict(device)
+                for number, device in found.items()
+                if not (section == CONF_OUTPUTS and number in switchable)
+            },
+            **configured,
+        }
+    return merged
+
+
+class SatelDeviceDiscovery:
+    """Read the names of the devices defined in the panel.
+
+    The zones assigned to a partition, the used outputs, the partitions of
+    those zones and the present expanders and keypads are read one at a
+    time as telemetry commands, in the background. The result is stored
+    with the version answer of the panel and read again only when that
+    changes, after a firmware update, or when a refresh is requested.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        controller,
+        commands: SatelCommandQueue,
+        supervisor: SatelConnectionSupervisor,
+        panel_id: str,
+        index: int,
+        on_discovered: Callable[[], None],
+    ) -> None:
+        """Initialize the discovery, stored per panel except for the first one."""
+        key = STORAGE_KEY if index == 0 else f"{STORAGE_KEY}.{panel_id}"
+        self._hass = hass
+        self._satel = controller
+        self._commands = commands
+        self._supervisor = supervisor
+        self._panel_id = panel_id
+        self._on_discovered = on_discovered
+        self._storage: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, key)
+        self._version: str | None = None
+        self._pending: tuple[bytes, asyncio.Future[bytes | None]] | None = None
+        self._read_failures = 0
+        self._enabled = False
+        self._task: asyncio.Task | None = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._cancel_delayed: CALLBACK_TYPE | None = None
+        self.devices: dict[str, dict[int, dict[str, Any]]] = {}
+
+    async def async_load(self) -> None:
+        """Load the devices discovered before."""
+        data = await self._storage.async_load()
+        if not data:
+            return
+        self._version = data["version"]
+        self.devices = {
+            section: {int(number): device for number, device in found.items()}
+            for section, found in data["devices"].items()
+        }
+
+    @callback
+    def async_start(self, enabled: bool) -> None:
+        """Check the panel version every time monitoring starts."""
+        handlers = message_handlers(self._satel)
+        command_result = handlers[CMD_RESULT]
+
+        def _result(msg: bytes) -> None:
+            command_result(msg)
+            # A device that does not exist is refused with a result code,
+            # results of other commands are not refusals
+            refused = len(msg) > 1 and msg[1] not in (RESULT_OK, RESULT_ACCEPTED)
+            if refused and self._pending and not self._pending[1].done():
+                self._pending[1].set_result(None)
+
+        handlers[CMD_RESULT] = _result
+        handlers[CMD_DEVICE_NAME] = self._answer
+        handlers[CMD_INTEGRA_VERSION] = self._answer
+
+        @callback
+        def _delayed_discover(_now: datetime) -> None:
+            self._cancel_delayed = None
+            self._async_discover()
+
+        @callback
+        def _monitoring_started() -> None:
+            if self._cancel_delayed:
+                self._cancel_delayed()
+            self._cancel_delayed = async_call_later(
+                self._hass, DISCOVERY_DELAY, _delayed_discover
+            )
+
+        self._unsubs.append(self._supervisor.async_add_monitoring_listener(_monitoring_started))
+        self._enabled = enabled
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop discovering."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        if self._cancel_delayed:
+            self._cancel_delayed()
+            self._cancel_delayed = None
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def async_set_enabled(self, enabled: bool) -> None:
+        """Enable or disable discovery, discover at once when enabled."""
+        was_enabled, self._enabled = self._enabled, enabled
+        if enabled and not was_enabled:
+            self._async_discover()
+
+    @callback
+    def async_refresh(self) -> None:
+        """Read the devices again, also if the panel version is unchanged."""
+        if not self._enabled:
+            raise HomeAssistantError(f"Discovery is not enabled for panel {self._panel_id}")
+        if not self._satel.connected:
+            raise HomeAssistantError(f"Panel {self._panel_id} is not connected")
+        self._version = None
+        self._async_discover()
+
+    @callback
+    def _async_discover(self) -> None:
+        """Start a discovery unless one is running or the panel is offline."""
+        if not self._enabled or not self._satel.connected:
+            return
+        if self._task and not self._task.done():
+            return
+        self._task = self._hass.async_create_background_task(
+            self._async_discover_if_changed(), "satel_integra discovery"
+        )
+
+    async def _async_discover_if_changed(self) -> None:
+        """Read the devices if the panel version differs from the stored one."""
+        try:
+            answer = await self._async_read(CMD_INTEGRA_VERSION, b"")
+            if answer is None:
+                return
+            version = answer[1:13].hex()
+            if version == self._version:
+                return
+            _LOGGER.info("Discovering the devices of panel %s", self._panel_id)
+            self._read_failures = 0
+            devices = await self._async_read_devices(INTEGRA_SIZES.get(answer[1], DEFAULT_SIZE))
+        except (TimeoutError, HomeAssistantError) as err:
+            # Nothing is stored, discovery starts over on the next connection
+            _LOGGER.warning("Discovery of panel %s failed: %s", self._panel_id, err)
+            return
+
+        self._version, self.devices = version, devices
+        await self._storage.async_save(
+            {
+                "version": version,
+                "devices": {
+                    section: {str(number): device for number, device in found.items()}
+                    for section, found in devices.items()
+                },
+            }
+        )
+        _LOGGER.info(
+            "Discovered on panel %s: %s",
+            self._panel_id,
+            ", ".join(f"{len(found)} {section}" for section, found in devices.items()),
+        )
+        self._on_discovered()
+
+    async def _async_read_devices(
+        self, size: tuple[int, int]
+    ) -> dict[str, dict[int, dict[str, Any]]]:
+        """Read the names of every used device."""
+        zone_count, partition_count = size
+        zones: dict[int, dict[str, Any]] = {}
+        partitions: set[int] = set()
+        for number in range(1, zone_count + 1):
+            answer = await self._async_read_name(DEVICE_ZONE_PARTITION, number)
+            # Zones not assigned to a partition are not used
+            if answer and len(answer) > NAME_END and 0 < answer[NAME_END] <= partition_count:
+                zones[number] = _device(answer)
+                partitions.add(answer[NAME_END])
+
+        outputs = {}
+        for number in range(1, zone_count + 1):
+            answer = await self._async_read_name(DEVICE_OUTPUT, number)
+            if answer and answer[3] != OUTPUT_NOT_USED:
+                outputs[number] = _device(answer)
+
+        devices = {
+            CONF_DEVICE_PARTITIONS: {},
+            CONF_ZONES: zones,
+            CONF_OUTPUTS: outputs,
+            CONF_EXPANDER: {},
+            CONF_KEYPAD: {},
+        }
+        for number in sorted(partitions):
+            if answer := await self._async_read_name(DEVICE_PARTITION, number):
+                devices[CONF_DEVICE_PARTITIONS][number] = _device(answer)
+        for section, first, count in (
+            (CONF_EXPANDER, EXPANDER_FIRST, EXPANDER_COUNT),
+            (CONF_KEYPAD, KEYPAD_FIRST, KEYPAD_COUNT),
+        ):
+            for address in range(count):
+                if answer := await self._async_read_name(DEVICE_MODULE, first + address):
+                    devices[section][address] = _device(answer)
+        return devices
+
+    async def _async_read_name(self, device_type: int, number: int) -> bytes | None:
+        """Read the name answer of one device, None if it does not exist.
+
+        A read without answer skips the device, several in a row raise.
+        """
+        await asyncio.sleep(READ_SPACING)
+        if not self._satel.connected:
+            raise HomeAssistantError("Panel disconnected")
+        try:
+            answer = await self._async_read(CMD_DEVICE_NAME, bytes((device_type, number & 0xFF)))
+        except TimeoutError:
+            self._read_failures += 1
+            if self._read_failures >= READ_FAILURE_LIMIT:
+                raise
+            _LOGGER.debug(
+                "No answer reading device %s of type %s on panel %s, skipped",
+                number, device_type, self._panel_id,
+            )
+            return None
+        self._read_failures = 0
+        return answer
+
+    async def _async_read(self, command: bytes, data: bytes) -> bytes | None:
+        """Send a command, return its answer or None if it was refused."""
+        future: asyncio.Future[bytes | None] = self._hass.loop.create_future()
+        self._pending = (command + data, future)
+        try:
+            async with asyncio.timeout(READ_TIMEOUT):
+                await self._commands.async_submit(
+                    PRIORITY_TELEMETRY,
+                    async_send_frame,
+                    self._satel,
+                    encode_frame(command + data),
+                )
+                return await future
+        finally:
+            self._pending = None
+
+    def _answer(self, msg: bytes) -> None:
+        """Handle a version or device name answer of the controller."""
+        if self._pending is None:
+            return
+        # Name answers echo device type and number, the keep-alive of the
+        # controller reads a zone name too
+        expected, future = self._pending
+        if msg[: len(expected)] == expected and not future.done():
+            future.set_result(msg)
+
+
+def _device(answer: bytes) -> dict[str, Any]:
+    """Return the configuration of a device from its name answer."""
+    name = answer[NAME_START:NAME_END].decode("cp1250", errors="replace").strip()
+    return {CONF_ZONE_NAME: name}
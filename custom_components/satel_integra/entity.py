@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 
 from .const import (
@@ -15,15 +16,42 @@ class SatelIntegraEntity(Entity):
 
     _attr_should_poll = False
 
-    def __init__(self, controller, device_number, device_name, device_type):
+    def __init__(self, panel, device_number, device_name, device_type):
         """Initialize the binary_sensor."""
         self._device_number = device_number
         self._name = device_name
-        self._satel = controller
+        self._panel = panel
+        self._satel = panel.controller
         self._device_type = device_type
-        self._attr_unique_id = f"${DOMAIN}.{device_type}${device_number}"
+        self._attr_unique_id = panel.unique_id(f"${DOMAIN}.{device_type}${device_number}")
         
-        _LOGGER.info("SatelIntegraEntity.__init__ ### %s - %s", self._attr_unique_id, self._name)
+        _LOGGER.debug("SatelIntegraEntity.__init__ ### %s - %s", self._attr_unique_id, self._name)
+
+    async def async_added_to_hass(self) -> None:
+        """Register for changes of the panel connection."""
+        self.async_on_remove(
+            self._panel.router.async_subscribe_connection(
+                self._connection_updated
+            )
+        )
+
+    @callback
+    def _connection_updated(self, available):
+        """Write the availability change."""
+        self.async_write_ha_state()
+
+    @property
+    def definition(self):
+        """Return what the entity was configured with.
+
+        An entity whose definition changes with new options is replaced.
+        """
+        return (type(self), self._name)
+
+    @property
+    def available(self):
+        """Return true if the panel state is known."""
+        return self._panel.router.available
 
     @property
     def name(self):
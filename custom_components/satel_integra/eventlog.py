@@ -0,0 +1,274 @@
+"""Incremental reader of the Satel Integra event log."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+import json
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .adapter import async_send_frame, message_handlers
+from .commands import PRIORITY_TELEMETRY, SatelCommandQueue
+from .const import ATTR_PANEL, EVENT_LOG_ENTRY
+from .protocol import encode_frame
+from .supervisor import SatelConnectionSupervisor
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = "satel_integra.eventlog"
+STORAGE_VERSION = 1
+# Local copy of the events read, one JSON object per line
+CACHE_FILE = "satel_integra_events{suffix}.jsonl"
+
+CMD_READ_EVENT = b"\x8c"
+# Event index asking for the most recent event; reading the index of an
+# event returns the event before it
+NEWEST_EVENT = 0xFFFFFF
+# Length of the answer after the command byte
+EVENT_LENGTH = 15
+
+# Seconds between checks for new events while connected
+POLL_INTERVAL = timedelta(seconds=60)
+# Seconds after a reconnect before catching up, the state resync goes first
+CATCH_UP_DELAY = 15
+# Minimum pause between two reads, keeps the bus free for zone monitoring
+READ_SPACING = 0.5
+# Longest wait for the answer to one read, in seconds
+READ_TIMEOUT = 5.0
+# Most events read in one catch-up, older ones are skipped
+CATCH_UP_LIMIT = 200
+# Events read when no cursor is stored yet, the history is not replayed
+INITIAL_EVENTS = 20
+# Number of events kept in memory for the diagnostics
+RECENT_EVENTS = 20
+
+
+@dataclass(frozen=True, slots=True)
+class SatelLogEvent:
+    """One entry of the panel event log, raw is the undecoded answer."""
+
+    index: int
+    time: str | None
+    event_class: int
+    code: int
+    restore: bool
+    partition: int
+    keypad: int
+    source: int
+    object: int
+    user: int
+    raw: str
+
+
+def parse_event(payload: bytes, now: datetime) -> SatelLogEvent | None:
+    """Decode the answer to a read event command, None if no event is stored.
+
+    The panel sends the year modulo 4 only, the full year is the latest
+    one not after now. The answer ends with the index of the event and the
+    index that was read, which is NEWEST_EVENT for the newest event.
+    """
+    if not payload[0] & 0x20:
+        return None
+    minutes = (payload[2] & 0x0F) << 8 | payload[3]
+    year = 4 * (now.year // 4) + (payload[0] >> 6)
+    try:
+        when = datetime(
+            year, payload[2] >> 4, payload[1] & 0x1F, minutes // 60, minutes % 60,
+            tzinfo=now.tzinfo,
+        )
+        if when > now:
+            when = when.replace(year=year - 4)
+    except ValueError:
+        when = None
+    return SatelLogEvent(
+        index=int.from_bytes(payload[9:12], "big"),
+        time=when.isoformat() if when else None,
+        event_class=payload[1] >> 5,
+        code=(payload[4] & 0x03) << 8 | payload[5],
+        restore=bool(payload[4] & 0x04),
+        partition=(payload[4] >> 3) + 1,
+        keypad=(payload[6] >> 3) + 1,
+        source=payload[7],
+        object=payload[8] >> 5,
+        user=payload[8] & 0x1F,
+        raw=payload.hex(),
+    )
+
+
+class SatelEventLog:
+    """Read new panel events from the last one seen, one at a time.
+
+    The index of the last event seen is stored, so events logged while
+    Home Assistant was stopped or disconnected are caught up: after every
+    connect and then periodically the reader walks back from the newest
+    event to the stored one, then fires the new events oldest first and
+    appends them to a local file. Reads are telemetry commands spaced by
+    READ_SPACING, so a long catch-up never holds back the zone monitoring
+    or user commands.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        controller,
+        commands: SatelCommandQueue,
+        supervisor: SatelConnectionSupervisor,
+        panel_id: str,
+        index: int,
+    ) -> None:
+        """Initialize the reader, stored per panel except for the first one."""
+        suffix = f".{panel_id}" if index else ""
+        self._hass = hass
+        self._satel = controller
+        self._commands = commands
+        self._supervisor = supervisor
+        self._panel_id = panel_id
+        self._storage: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}{suffix}"
+        )
+        self._path = hass.config.path(CACHE_FILE.format(suffix=suffix.replace(".", "_")))
+        self._cursor: int | None = None
+        self._pending: asyncio.Future[bytes] | None = None
+        self._task: asyncio.Task | None = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._cancel_delayed: CALLBACK_TYPE | None = None
+        self.recent: deque[SatelLogEvent] = deque(maxlen=RECENT_EVENTS)
+        self._counters = {"read": 0, "new": 0, "skipped": 0, "failed": 0}
+
+    async def async_start(self) -> None:
+        """Restore the cursor and catch up whenever the panel connects."""
+        data = await self._storage.async_load()
+        if data:
+            self._cursor = data.get("cursor")
+            # Stored by versions that kept the index read instead of the
+            # index of the event, read the initial events again
+            if self._cursor == NEWEST_EVENT:
+                self._cursor = None
+        message_handlers(self._satel)[CMD_READ_EVENT] = self._answer
+
+        @callback
+        def _delayed_catch_up(_now: datetime) -> None:
+            self._cancel_delayed = None
+            self._async_catch_up_later()
+
+        @callback
+        def _monitoring_started() -> None:
+            if self._cancel_delayed:
+                self._cancel_delayed()
+            self._cancel_delayed = async_call_later(
+                self._hass, CATCH_UP_DELAY, _delayed_catch_up
+            )
+
+        self._unsubs.append(self._supervisor.async_add_monitoring_listener(_monitoring_started))
+        self._unsubs.append(
+            async_track_time_interval(self._hass, self._async_catch_up_later, POLL_INTERVAL)
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop reading, events not read yet are caught up on the next start."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        if self._cancel_delayed:
+            self._cancel_delayed()
+            self._cancel_delayed = None
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def metrics(self) -> dict[str, Any]:
+        """Return the cursor, read counters and the most recent events."""
+        return {
+            "cursor": self._cursor,
+            **self._counters,
+            "recent": [asdict(event) for event in self.recent],
+        }
+
+    @callback
+    def _async_catch_up_later(self, _now: datetime | None = None) -> None:
+        """Start a catch-up unless one is running or the panel is offline."""
+        if not self._satel.connected or (self._task and not self._task.done()):
+            return
+        self._task = self._hass.async_create_background_task(
+            self._async_catch_up(), "satel_integra event log"
+        )
+
+    async def _async_catch_up(self) -> None:
+        """Read the events after the cursor, then fire and store them."""
+        try:
+            newest = await self._async_read(NEWEST_EVENT)
+            if newest is None or newest.index == self._cursor:
+                return
+            events = [newest]
+            limit = INITIAL_EVENTS if self._cursor is None else CATCH_UP_LIMIT
+            while True:
+                if len(events) == limit:
+                    if self._cursor is not None:
+                        _LOGGER.warning(
+                            "Panel %s logged more than %s events since the last read,"
+                            " older ones are skipped",
+                            self._panel_id, CATCH_UP_LIMIT,
+                        )
+                        self._counters["skipped"] += 1
+                    break
+                await asyncio.sleep(READ_SPACING)
+                event = await self._async_read(events[-1].index)
+                # Stop at the last event seen, or when the log wrapped around
+                if event is None or event.index in (self._cursor, newest.index):
+                    break
+                events.append(event)
+        except (TimeoutError, HomeAssistantError) as err:
+            # The cursor is kept, the same events are read again next time
+            self._counters["failed"] += 1
+            _LOGGER.debug("Reading the event log of panel %s failed: %s", self._panel_id, err)
+            return
+
+        events.reverse()
+        for event in events:
+            self._hass.bus.async_fire(EVENT_LOG_ENTRY, {ATTR_PANEL: self._panel_id, **asdict(event)})
+        self.recent.extend(events)
+        self._counters["new"] += len(events)
+        self._cursor = newest.index
+        await self._storage.async_save({"cursor": self._cursor})
+        lines = "".join(json.dumps(asdict(event)) + "\n" for event in events)
+        await self._hass.async_add_executor_job(_append, self._path, lines)
+        _LOGGER.debug("Read %s new events of panel %s", len(events), self._panel_id)
+
+    async def _async_read(self, index: int) -> SatelLogEvent | None:
+        """Read one event, None if the log holds no event there."""
+        self._pending = self._hass.loop.create_future()
+        try:
+            async with asyncio.timeout(READ_TIMEOUT):
+                await self._commands.async_submit(
+                    PRIORITY_TELEMETRY,
+                    async_send_frame,
+                    self._satel,
+                    encode_frame(CMD_READ_EVENT + index.to_bytes(3, "big")),
+                )
+                payload = await self._pending
+        finally:
+            self._pending = None
+        self._counters["read"] += 1
+        return parse_event(payload, dt_util.now())
+
+    def _answer(self, msg: bytes) -> None:
+        """Handle a read event answer of the controller."""
+        payload = msg[1:]
+        if len(payload) < EVENT_LENGTH:
+            _LOGGER.debug("Ignoring short event log answer %s", payload.hex())
+            return
+        if self._pending and not self._pending.done():
+            self._pending.set_result(payload)
+
+
+def _append(path: str, lines: str) -> None:
+    with open(path, "a", encoding="utf-8") as cache_file:
+        cache_file.write(lines)
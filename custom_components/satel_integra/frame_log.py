@@ -0,0 +1,70 @@
+"""Rate-limited diagnostics logging of Satel Integra status frames."""
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SatelFrameLogger:
+    """Count status frames and log them without flooding the log.
+
+    One summary line per interval is logged at INFO. Full payloads are
+    logged at DEBUG only, for every n-th frame of each category.
+    """
+
+    def __init__(self, interval: timedelta, sample_every: int) -> None:
+        """Initialize the frame logger."""
+        self._interval = interval
+        self._sample_every = max(1, sample_every)
+        self._frames: Counter[str] = Counter()
+        self._changed: Counter[str] = Counter()
+        self._sampled: Counter[str] = Counter()
+        self._started = time.monotonic()
+
+    @callback
+    def async_start(self, hass: HomeAssistant) -> CALLBACK_TYPE:
+        """Start logging periodic summaries."""
+        self._started = time.monotonic()
+        return async_track_time_interval(hass, self._async_log_summary, self._interval)
+
+    @callback
+    def record(self, category: str, changed: int, payload: Any = None) -> None:
+        """Account a frame of a category with bitmap of changed bits."""
+        self._frames[category] += 1
+        self._changed[category] += changed.bit_count()
+
+        if not _LOGGER.isEnabledFor(logging.DEBUG):
+            return
+        count = self._sampled[category]
+        self._sampled[category] = count + 1
+        if count % self._sample_every == 0:
+            _LOGGER.debug("%s frame #%s, payload: %s", category, count + 1, payload)
+
+    @callback
+    def _async_log_summary(self, now: datetime | None = None) -> None:
+        """Log and reset the counters of the last interval."""
+        elapsed = time.monotonic() - self._started
+        self._started += elapsed
+        frames, changed = self._frames, self._changed
+        self._frames, self._changed = Counter(), Counter()
+
+        if not frames or not _LOGGER.isEnabledFor(logging.INFO):
+            return
+        _LOGGER.info(
+            "Status frames in last %.0fs: %.2f frames/s, %s changed bits (%s)",
+            elapsed,
+            frames.total() / elapsed if elapsed else 0,
+            changed.total(),
+            ", ".join(
+                f"{category}: {count}/{changed[category]}"
+                for category, count in sorted(frames.items())
+            ),
+        )
@@ -0,0 +1,186 @@
+"""Health of the connection to the Satel Integra panel."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .adapter import drop_connection
+from .router import SatelStatusRouter
+from .supervisor import STATE_QUERY_LIMIT, SatelConnectionSupervisor
+from .tap import DIRECTION_TX, SatelFrameTap
+
+_LOGGER = logging.getLogger(__name__)
+
+# Read device name, sent by keep_alive and answered with the same command
+KEEP_ALIVE_COMMAND = 0xEE
+# Answer of commands changing the panel state
+RESULT_COMMAND = 0xEF
+# Commands answered with RESULT_COMMAND: start monitoring, arm ... outputs off
+RESULT_ANSWERED = frozenset((0x7F, *range(0x80, 0x8A)))
+
+# Offset of the command in a sent frame, after the FE FE header
+TX_COMMAND_OFFSET = 2
+
+# Number of recent round trip times kept per kind
+RTT_SAMPLES = 100
+# Seconds after which a request without answer counts as timed out
+REPLY_TIMEOUT = 5.0
+# Seconds without any frame from a connected panel after which the link is
+# considered half-open, keep-alive is answered every 20s
+STALL_TIMEOUT = 60.0
+CHECK_INTERVAL = timedelta(seconds=10)
+
+RTT_KEEP_ALIVE = "keep_alive"
+RTT_COMMAND = "command"
+
+
+def summarize(samples: deque[float]) -> dict[str, float | None]:
+    """Return p50, p95 and max of round trip samples in milliseconds."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": None, "p95": None, "max": None, "samples": 0}
+    return {
+        "p50": round(ordered[len(ordered) // 2] * 1000, 1),
+        "p95": round(ordered[int(len(ordered) * 0.95)] * 1000, 1),
+        "max": round(ordered[-1] * 1000, 1),
+        "samples": len(ordered),
+    }
+
+
+class SatelHealthMonitor:
+    """Watch the frames exchanged with the panel.
+
+    Requests are matched with the next answer of the expected command to
+    measure round trip times, if sent less than REPLY_TIMEOUT ago. State
+    queries are not timed: the panel pushes the same frames while
+    monitoring, so their answers cannot be told from a push. A connected
+    panel answers keep-alive every 20s, so a link without any frame for
+    STALL_TIMEOUT is half-open; it is closed, which makes the monitoring
+    loop of the controller reconnect.
+    """
+
+    def __init__(
+        self,
+        controller,
+        tap: SatelFrameTap,
+        router: SatelStatusRouter,
+        supervisor: SatelConnectionSupervisor,
+    ) -> None:
+        """Initialize the monitor."""
+        self._controller = controller
+        self._router = router
+        self._supervisor = supervisor
+        self._pending: dict[int, deque[tuple[float, str]]] = {}
+        self._rtt = {
+            RTT_KEEP_ALIVE: deque(maxlen=RTT_SAMPLES),
+            RTT_COMMAND: deque(maxlen=RTT_SAMPLES),
+        }
+        self._last_frame = time.monotonic()
+        self.timeouts = 0
+        self.stalls = 0
+        self.stalled = False
+        self._listeners: list[Callable[[], None]] = []
+        self._unsub: list[CALLBACK_TYPE] = [tap.async_add_listener(self._frame)]
+
+    @callback
+    def async_start(self, hass: HomeAssistant) -> CALLBACK_TYPE:
+        """Start the periodic checks."""
+        self._unsub.append(
+            self._router.async_subscribe_connection(self._connection_updated)
+        )
+        self._unsub.append(
+            async_track_time_interval(hass, self._async_check, CHECK_INTERVAL)
+        )
+
+        @callback
+        def async_stop() -> None:
+            while self._unsub:
+                self._unsub.pop()()
+
+        return async_stop
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for updates of the metrics after every check."""
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(listener)
+
+        return remove_listener
+
+    def metrics(self) -> dict[str, Any]:
+        """Return the health metrics."""
+        return {
+            "connected": bool(self._controller.connected),
+            "stalled": self.stalled,
+            "last_frame_age": round(time.monotonic() - self._last_frame, 1),
+            "keep_alive_rtt_ms": summarize(self._rtt[RTT_KEEP_ALIVE]),
+            "command_rtt_ms": summarize(self._rtt[RTT_COMMAND]),
+            "timeouts": self.timeouts,
+            "stalls": self.stalls,
+            "reconnects": self._supervisor.reconnects,
+            "failed_connects": self._supervisor.failed_connects,
+        }
+
+    @callback
+    def _frame(self, direction: int, frame: bytes) -> None:
+        now = time.monotonic()
+        if direction == DIRECTION_TX:
+            if len(frame) <= TX_COMMAND_OFFSET:
+                return
+            command = frame[TX_COMMAND_OFFSET]
+            if command < STATE_QUERY_LIMIT:
+                return
+            kind = RTT_KEEP_ALIVE if command == KEEP_ALIVE_COMMAND else RTT_COMMAND
+            answer = RESULT_COMMAND if command in RESULT_ANSWERED else command
+            self._pending.setdefault(answer, deque(maxlen=RTT_SAMPLES)).append((now, kind))
+            return
+
+        self._last_frame = now
+        self.stalled = False
+        # Only answers to requests in flight, never a monitoring push
+        if frame[0] < STATE_QUERY_LIMIT or not (pending := self._pending.get(frame[0])):
+            return
+        self._expire(pending, now)
+        if pending:
+            sent, kind = pending.popleft()
+            self._rtt[kind].append(now - sent)
+
+    def _expire(self, pending: deque[tuple[float, str]], now: float) -> None:
+        """Count the requests of pending not answered in time as timed out."""
+        while pending and now - pending[0][0] > REPLY_TIMEOUT:
+            pending.popleft()
+            self.timeouts += 1
+
+    @callback
+    def _connection_updated(self, available: bool) -> None:
+        self._last_frame = time.monotonic()
+        self._pending.clear()
+
+    @callback
+    def _async_check(self, now: datetime | None = None) -> None:
+        monotonic = time.monotonic()
+        for pending in self._pending.values():
+            self._expire(pending, monotonic)
+
+        silence = monotonic - self._last_frame
+        if self._controller.connected and silence > STALL_TIMEOUT and not self.stalled:
+            self.stalled = True
+            self.stalls += 1
+            _LOGGER.warning(
+                "No frame from the panel for %.0fs, closing the stalled connection",
+                silence,
+            )
+            drop_connection(self._controller)
+
+        for listener in list(self._listeners):
+            listener()
@@ -0,0 +1,168 @@
+"""Bit layout of the Satel Integra zone, output and trouble states."""
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+from .const import (
+    CONF_EXPANDER,
+    CONF_EXPANDER_BATTERY,
+    CONF_KEYPAD,
+    CONF_OUTPUTS,
+    CONF_TROUBLE,
+    CONF_TROUBLE2,
+    CONF_ZOME_MASK,
+    CONF_ZONE_NAME,
+    CONF_ZONE_TYPE,
+    CONF_ZONES,
+    CONF_ZONES_ALARM,
+    CONF_ZONES_MASKED,
+    CONF_ZONES_MEM_ALARM,
+    CONF_ZONES_MEM_MASKED,
+    CONF_ZONES_MEM_TAMPER,
+    CONF_ZONES_TAMPER,
+    DEFAULT_ZONE_MASK,
+    SIGNAL_ALARM_UPDATED,
+    SIGNAL_MASKED_UPDATED,
+    SIGNAL_MEM_ALARM_UPDATED,
+    SIGNAL_MEM_MASKED_UPDATED,
+    SIGNAL_MEM_TAMPER_UPDATED,
+    SIGNAL_OUTPUTS_UPDATED,
+    SIGNAL_TAMPER_UPDATED,
+    SIGNAL_TROUBLE2_UPDATED,
+    SIGNAL_TROUBLE_UPDATED,
+    SIGNAL_VIOLATED_UPDATED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEVICE_TYPE_OUTPUT = "output"
+DEVICE_CLASS_PROBLEM = "problem"
+DEVICE_CLASS_TAMPER = "tamper"
+
+
+def _masked(device: Mapping[str, Any]) -> bool:
+    return device.get(CONF_ZOME_MASK, DEFAULT_ZONE_MASK) == "yes"
+
+
+def _battery(number: int, device: Mapping[str, Any]) -> bool:
+    return number < 64 and device[CONF_EXPANDER_BATTERY] == "yes"
+
+
+@dataclass(frozen=True, slots=True)
+class BitSpec:
+    """One state bit of a configured device.
+
+    The bit number is the configured device number plus offset, the device
+    class None stands for the configured zone type.
+    """
+
+    device_type: str
+    signal: str
+    offset: int
+    suffix: str
+    device_class: str | None = None
+    condition: Callable[[int, Mapping[str, Any]], bool] | None = None
+
+
+# Trouble part 1: expander AC and battery troubles for the first 64
+# addresses, then the configured system troubles
+_EXPANDER_AC = 128 + 1
+_EXPANDER_BATTERY = 128 + 64 + 1
+_EXPANDER_NO_BATTERY = 128 + 64 + 64 + 1
+_SYSTEM_TROUBLE = 320
+# Trouble part 2: module no comm, changed and tamper blocks; keypads
+# follow the 128 expander addresses
+_NO_COMM = 1
+_CHANGED = 1 + 64
+_KEYPAD_NO_COMM = 1 + 128
+_KEYPAD_CHANGED = 1 + 128 + 8
+_EXPANDER_TAMPER = 1 + 128 + 8 + 8 + 8
+_KEYPAD_TAMPER = 1 + 128 + 8 + 8 + 64
+_KEYPAD_INIT = 1 + 128 + 8 + 8 + 64 + 8
+
+# Bits of every configured device, per configuration section
+LAYOUT: tuple[tuple[str, tuple[BitSpec, ...]], ...] = (
+    (
+        CONF_ZONES,
+        (
+            BitSpec(CONF_ZONES, SIGNAL_VIOLATED_UPDATED, 0, ""),
+            BitSpec(CONF_ZONES_ALARM, SIGNAL_ALARM_UPDATED, 0, " (alarm)"),
+            BitSpec(CONF_ZONES_MEM_ALARM, SIGNAL_MEM_ALARM_UPDATED, 0, " (mem alarm)"),
+            BitSpec(CONF_ZONES_TAMPER, SIGNAL_TAMPER_UPDATED, 0, " (tamper)", DEVICE_CLASS_TAMPER),
+            BitSpec(CONF_ZONES_MEM_TAMPER, SIGNAL_MEM_TAMPER_UPDATED, 0, " (mem tamper)", DEVICE_CLASS_TAMPER),
+            BitSpec(CONF_ZONES_MASKED, SIGNAL_MASKED_UPDATED, 0, " (masked)", DEVICE_CLASS_PROBLEM, lambda _, zone: _masked(zone)),
+            BitSpec(CONF_ZONES_MEM_MASKED, SIGNAL_MEM_MASKED_UPDATED, 0, " (mem masked)", DEVICE_CLASS_PROBLEM, lambda _, zone: _masked(zone)),
+        ),
+    ),
+    (
+        CONF_OUTPUTS,
+        (BitSpec(DEVICE_TYPE_OUTPUT, SIGNAL_OUTPUTS_UPDATED, 0, ""),),
+    ),
+    (
+        CONF_EXPANDER,
+        (
+            BitSpec(CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED, _NO_COMM, " (no comm)", DEVICE_CLASS_PROBLEM),
+            BitSpec(CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED, _CHANGED, " (changed)", DEVICE_CLASS_PROBLEM),
+            BitSpec(CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED, _EXPANDER_TAMPER, " (tamper)", DEVICE_CLASS_PROBLEM),
+            BitSpec(CONF_TROUBLE, SIGNAL_TROUBLE_UPDATED, _EXPANDER_AC, " (AC KO)", DEVICE_CLASS_PROBLEM, _battery),
+            BitSpec(CONF_TROUBLE, SIGNAL_TROUBLE_UPDATED, _EXPANDER_BATTERY, " (battery KO)", DEVICE_CLASS_PROBLEM, _battery),
+            BitSpec(CONF_TROUBLE, SIGNAL_TROUBLE_UPDATED, _EXPANDER_NO_BATTERY, " (battery NOT connected)", DEVICE_CLASS_PROBLEM, _battery),
+        ),
+    ),
+    (
+        CONF_TROUBLE,
+        (BitSpec(CONF_TROUBLE, SIGNAL_TROUBLE_UPDATED, _SYSTEM_TROUBLE, "", DEVICE_CLASS_PROBLEM),),
+    ),
+    (
+        CONF_KEYPAD,
+        (
+            BitSpec(CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED, _KEYPAD_NO_COMM, " (no comm)", DEVICE_CLASS_PROBLEM),
+            BitSpec(CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED, _KEYPAD_CHANGED, " (changed)", DEVICE_CLASS_PROBLEM),
+            BitSpec(CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED, _KEYPAD_TAMPER, " (tamper)", DEVICE_CLASS_PROBLEM),
+            BitSpec(CONF_TROUBLE2, SIGNAL_TROUBLE2_UPDATED, _KEYPAD_INIT, " (init ko)", DEVICE_CLASS_PROBLEM),
+        ),
+    ),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Bit:
+    """A state bit of a configured device, with the entity showing it."""
+
+    spec: BitSpec
+    number: int
+    name: str
+    device_class: str
+
+
+def build_bits(conf: Mapping[str, Any]) -> list[Bit]:
+    """Return the bits of all configured devices in one pass over LAYOUT.
+
+    A bit claimed by two devices is kept for the first one only, with a
+    warning, as both would show the same state under the same unique id.
+    """
+    bits = []
+    claimed: dict[tuple[str, int], Bit] = {}
+    for section, specs in LAYOUT:
+        for number, device in conf[section].items():
+            for spec in specs:
+                if spec.condition and not spec.condition(number, device):
+                    continue
+                bit = Bit(
+                    spec,
+                    number + spec.offset,
+                    device[CONF_ZONE_NAME] + spec.suffix,
+                    spec.device_class or device[CONF_ZONE_TYPE],
+                )
+                key = (spec.signal, bit.number)
+                if (owner := claimed.setdefault(key, bit)) is not bit:
+                    _LOGGER.warning(
+                        "%s uses bit %s of %s already used by %s, check the %s numbers",
+                        bit.name, bit.number, spec.device_type, owner.name, section,
+                    )
+                    continue
+                bits.append(bit)
+    return bits
@@ -0,0 +1,74 @@
+"""Devices whose states the Satel Integra controller reports."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any
+
+from .const import (
+    CONF_DEVICE_PARTITIONS,
+    CONF_OUTPUTS,
+    CONF_SWITCHABLE_OUTPUTS,
+    CONF_ZONES,
+    SIGNAL_TROUBLE2_UPDATED,
+    SIGNAL_TROUBLE_UPDATED,
+)
+from .layout import Bit, build_bits
+
+KIND_ZONES = "zones"
+KIND_OUTPUTS = "outputs"
+KIND_PARTITIONS = "partitions"
+KIND_TROUBLE = "trouble"
+
+
+class SatelMonitoredDevices:
+    """The device collections handed to AsyncSatel.
+
+    AsyncSatel keeps the collections it was created with, so they are
+    updated in place: changed options take effect with the next status
+    frame, without a new connection. The trouble bits come from the same
+    layout pass as the binary sensors, kept in bits.
+    """
+
+    def __init__(self, conf: Mapping[str, Any]) -> None:
+        """Initialize the collections from the panel configuration."""
+        self.zones: dict[int, Any] = {}
+        self.outputs: OrderedDict[int, Any] = OrderedDict()
+        self.partitions: dict[int, Any] = {}
+        self.trouble: list[int] = []
+        self.trouble2: list[int] = []
+        self.bits: list[Bit] = []
+        self.update(conf)
+
+    def update(self, conf: Mapping[str, Any]) -> set[str]:
+        """Update the collections.
+
+        Return the kinds that gained devices, their states are not known yet.
+        """
+        added = set()
+        outputs = OrderedDict(
+            list(conf[CONF_OUTPUTS].items()) + list(conf[CONF_SWITCHABLE_OUTPUTS].items())
+        )
+        self.bits = build_bits(conf)
+        trouble = [bit.number for bit in self.bits if bit.spec.signal == SIGNAL_TROUBLE_UPDATED]
+        trouble2 = [bit.number for bit in self.bits if bit.spec.signal == SIGNAL_TROUBLE2_UPDATED]
+
+        if self._replace(self.zones, conf[CONF_ZONES]):
+            added.add(KIND_ZONES)
+        if self._replace(self.outputs, outputs):
+            added.add(KIND_OUTPUTS)
+        if self._replace(self.partitions, conf[CONF_DEVICE_PARTITIONS]):
+            added.add(KIND_PARTITIONS)
+        if not (set(trouble) <= set(self.trouble) and set(trouble2) <= set(self.trouble2)):
+            added.add(KIND_TROUBLE)
+        self.trouble[:] = trouble
+        self.trouble2[:] = trouble2
+        return added
+
+    @staticmethod
+    def _replace(current: dict[int, Any], new: Mapping[int, Any]) -> bool:
+        """Replace the devices of current, return true if any was added."""
+        added = not new.keys() <= current.keys()
+        current.clear()
+        current.update(new)
+        return added
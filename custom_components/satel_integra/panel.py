@@ -0,0 +1,167 @@
+"""Runtime objects of one Satel Integra panel."""
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .batcher import SatelPartitionBatcher, SatelSwitchBatcher
+from .capture import SatelFrameRecorder
+from .commands import SatelCommandQueue
+from .const import CONF_DEBOUNCE, CONF_DISCOVER, CONF_TEMP_SENSORS, DOMAIN
+from .debounce import SatelZoneDebouncer
+from .discovery import SatelDeviceDiscovery
+from .eventlog import SatelEventLog
+from .health import SatelHealthMonitor
+from .monitored import SatelMonitoredDevices
+from .profiler import SatelLatencyProfiler
+from .proxy import SatelLocalProxy
+from .router import SatelStatusRouter
+from .snapshot import SatelSnapshot
+from .state import SatelStateStore
+from .supervisor import SatelConnectionSupervisor
+from .tap import SatelFrameTap
+
+if TYPE_CHECKING:
+    from .temperature import SatelTemperatureCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Builds the entities of one platform from the panel configuration
+EntityBuilder = Callable[["SatelPanel", Mapping[str, Any]], list[Entity]]
+
+
+@dataclass
+class _PlatformEntities:
+    """Entities of one platform and how to build and add them."""
+
+    build: EntityBuilder
+    async_add_entities: AddEntitiesCallback
+    entities: dict[str, Entity] = field(default_factory=dict)
+
+
+@dataclass
+class SatelPanel:
+    """Everything belonging to one configured panel.
+
+    Each panel has its own controller, connection, state store and router,
+    so status frames of one panel never reach entities of another.
+    """
+
+    panel_id: str
+    index: int
+    code: str | None
+    controller: Any
+    tap: SatelFrameTap
+    recorder: SatelFrameRecorder
+    store: SatelStateStore
+    router: SatelStatusRouter
+    debouncer: SatelZoneDebouncer
+    snapshot: SatelSnapshot
+    commands: SatelCommandQueue
+    batcher: SatelSwitchBatcher
+    partition_batcher: SatelPartitionBatcher
+    supervisor: SatelConnectionSupervisor
+    health: SatelHealthMonitor
+    eventlog: SatelEventLog
+    discovery: SatelDeviceDiscovery
+    profiler: SatelLatencyProfiler
+    conf: Mapping[str, Any]
+    monitored: SatelMonitoredDevices
+    temperature: SatelTemperatureCoordinator | None = None
+    proxy: SatelLocalProxy | None = None
+    close: CALLBACK_TYPE | None = None
+    platforms: dict[str, _PlatformEntities] = field(default_factory=dict)
+
+    @property
+    def title(self) -> str:
+        """Return the name prefix of the panel's own entities."""
+        return "Satel" if self.index == 0 else f"Satel {self.panel_id}"
+
+    def unique_id(self, unique_id: str) -> str:
+        """Return unique_id namespaced to the panel.
+
+        The first panel keeps the unique ids used before several panels
+        were supported.
+        """
+        return unique_id if self.index == 0 else f"{self.panel_id}_{unique_id}"
+
+    @callback
+    def async_add_platform(
+        self,
+        platform: str,
+        build: EntityBuilder,
+        async_add_entities: AddEntitiesCallback,
+    ) -> None:
+        """Add the entities of a platform, rebuilt when the options change."""
+        entities = {entity.unique_id: entity for entity in build(self, self.conf)}
+        self.platforms[platform] = _PlatformEntities(build, async_add_entities, entities)
+        async_add_entities(entities.values())
+
+    async def async_update_options(
+        self, hass: HomeAssistant, conf: Mapping[str, Any]
+    ) -> None:
+        """Apply new device options to the running panel.
+
+        The connection is kept. Only entities that were added, removed or
+        changed are touched, and only the states of newly monitored kinds
+        of devices are queried.
+        """
+        self.conf = conf
+        added = self.monitored.update(conf)
+        self.debouncer.set_hold_times(conf[CONF_DEBOUNCE])
+        if self.temperature:
+            self.temperature.async_set_sensors(list(conf[CONF_TEMP_SENSORS]))
+        self.discovery.async_set_enabled(conf[CONF_DISCOVER])
+
+        registry = er.async_get(hass)
+        for platform, entities in self.platforms.items():
+            await self._async_update_platform(registry, platform, entities)
+
+        if added:
+            self.supervisor.async_resync(added)
+
+    async def _async_update_platform(
+        self,
+        registry: er.EntityRegistry,
+        platform: str,
+        platform_entities: _PlatformEntities,
+    ) -> None:
+        """Replace the entities of a platform whose definition changed."""
+        current = platform_entities.entities
+        wanted = {
+            entity.unique_id: entity
+            for entity in platform_entities.build(self, self.conf)
+        }
+        replaced = [
+            unique_id
+            for unique_id, entity in current.items()
+            if unique_id not in wanted or entity.definition != wanted[unique_id].definition
+        ]
+        for unique_id in replaced:
+            entity = current.pop(unique_id)
+            # Entities disabled in the registry were never added
+            if entity.hass is not None:
+                await entity.async_remove()
+            if unique_id not in wanted and (
+                entity_id := registry.async_get_entity_id(platform, DOMAIN, unique_id)
+            ):
+                registry.async_remove(entity_id)
+
+        added = [entity for unique_id, entity in wanted.items() if unique_id not in current]
+        current.update((entity.unique_id, entity) for entity in added)
+        if added or replaced:
+            _LOGGER.debug(
+                "Panel %s %s: %s entities removed or replaced, %s added",
+                self.panel_id,
+                platform,
+                len(replaced),
+                len(added),
+            )
+            platform_entities.async_add_entities(added)
@@ -0,0 +1,184 @@
+"""Latency profiling of the status frame push pipeline."""
+from __future__ import annotations
+
+import logging
+from time import perf_counter
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import (
+    SIGNAL_ALARM_UPDATED,
+    SIGNAL_BYPASS_UPDATED,
+    SIGNAL_MASKED_UPDATED,
+    SIGNAL_MEM_ALARM_UPDATED,
+    SIGNAL_MEM_MASKED_UPDATED,
+    SIGNAL_MEM_TAMPER_UPDATED,
+    SIGNAL_OUTPUTS_UPDATED,
+    SIGNAL_PANEL_MESSAGE,
+    SIGNAL_TAMPER_UPDATED,
+    SIGNAL_TROUBLE2_UPDATED,
+    SIGNAL_TROUBLE_UPDATED,
+    SIGNAL_VIOLATED_UPDATED,
+)
+from .router import STAGE_DISPATCH, SatelStatusRouter
+from .supervisor import STATE_QUERY_LIMIT
+from .tap import DIRECTION_RX, SatelFrameTap
+
+_LOGGER = logging.getLogger(__name__)
+
+LABELS = {
+    SIGNAL_VIOLATED_UPDATED: "violated",
+    SIGNAL_ALARM_UPDATED: "alarm",
+    SIGNAL_MEM_ALARM_UPDATED: "mem_alarm",
+    SIGNAL_TAMPER_UPDATED: "tamper",
+    SIGNAL_MEM_TAMPER_UPDATED: "mem_tamper",
+    SIGNAL_BYPASS_UPDATED: "bypass",
+    SIGNAL_MASKED_UPDATED: "masked",
+    SIGNAL_MEM_MASKED_UPDATED: "mem_masked",
+    SIGNAL_OUTPUTS_UPDATED: "outputs",
+    SIGNAL_TROUBLE_UPDATED: "trouble",
+    SIGNAL_TROUBLE2_UPDATED: "trouble2",
+    SIGNAL_PANEL_MESSAGE: "partitions",
+}
+
+# Frame decoded by AsyncSatel until its status reaches the router, which
+# covers the message handler parsing the frame and the status callback
+STAGE_PARSE = "parse"
+# The route and entity stages are timed by the router, an entity update
+# includes debouncing and async_write_ha_state
+# Frame decoded until the last entity is written
+STAGE_TOTAL = "total"
+
+# Upper bounds of the histogram buckets in microseconds, the last bucket
+# is unbounded
+BUCKETS_US = (10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000)
+
+
+class _Histogram:
+    """Bucketed durations of one stage."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS_US) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        micros = seconds * 1e6
+        index = 0
+        while index < len(BUCKETS_US) and micros > BUCKETS_US[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += micros
+        if micros > self.max:
+            self.max = micros
+
+    def percentile(self, fraction: float) -> float:
+        """Return the upper bound of the bucket holding the percentile.
+
+        The bound is capped at the largest duration seen.
+        """
+        rank = self.count * fraction
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if index < len(BUCKETS_US):
+                    return min(BUCKETS_US[index], round(self.max, 1))
+                return round(self.max, 1)
+        return round(self.max, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_us": round(self.total / self.count, 1) if self.count else None,
+            "p50_us": self.percentile(0.5),
+            "p95_us": self.percentile(0.95),
+            "max_us": round(self.max, 1),
+            "buckets": {
+                f"le_{bound}" if index < len(BUCKETS_US) else "inf": count
+                for index, (bound, count) in enumerate(
+                    zip((*BUCKETS_US, None), self.counts)
+                )
+                if count
+            },
+        }
+
+
+class SatelLatencyProfiler:
+    """Time every stage between a status frame and the entity writes.
+
+    While stopped nothing is hooked: the tap has no listener and the router
+    has no timing hook. Starting sets both, stopping removes them again.
+    """
+
+    def __init__(self, tap: SatelFrameTap, router: SatelStatusRouter) -> None:
+        """Initialize the profiler."""
+        self._tap = tap
+        self._router = router
+        self._histograms: dict[str, dict[str, _Histogram]] = {}
+        self._received_at: float | None = None
+        self._remove_listener: CALLBACK_TYPE | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Return true if profiling is running."""
+        return self._remove_listener is not None
+
+    @callback
+    def async_start(self) -> None:
+        """Hook the timing into the pipeline."""
+        if self.enabled:
+            return
+        self._remove_listener = self._tap.async_add_listener(self._frame)
+        self._router.timing = self._timing
+        _LOGGER.info("Latency profiling started")
+
+    @callback
+    def async_stop(self) -> None:
+        """Remove the timing hooks, the histograms are kept."""
+        if not self.enabled:
+            return
+        self._remove_listener()
+        self._remove_listener = None
+        self._router.timing = None
+        self._received_at = None
+        _LOGGER.info("Latency profiling stopped")
+
+    def dump(self, reset: bool = False) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return the histograms per label and stage."""
+        result = {
+            label: {stage: histogram.as_dict() for stage, histogram in stages.items()}
+            for label, stages in sorted(self._histograms.items())
+        }
+        if reset:
+            self._histograms = {}
+        return result
+
+    def _add(self, label: str, stage: str, seconds: float) -> None:
+        stages = self._histograms.setdefault(label, {})
+        histogram = stages.get(stage)
+        if histogram is None:
+            histogram = stages[stage] = _Histogram()
+        histogram.add(seconds)
+
+    @callback
+    def _frame(self, direction: int, frame: bytes) -> None:
+        if direction == DIRECTION_RX and frame[0] < STATE_QUERY_LIMIT:
+            self._received_at = perf_counter()
+
+    def _timing(self, signal: str, stage: str, started: float, finished: float) -> None:
+        """Account a stage timed by the router."""
+        label = LABELS.get(signal, signal)
+        if stage != STAGE_DISPATCH:
+            self._add(label, stage, finished - started)
+            return
+        # Parse and total run from the frame that led to this dispatch
+        received_at, self._received_at = self._received_at, None
+        if received_at is not None:
+            self._add(label, STAGE_PARSE, started - received_at)
+            self._add(label, STAGE_TOTAL, finished - received_at)
@@ -0,0 +1,66 @@
+"""Satel integration protocol frames not covered by AsyncSatel."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from satel_integra2.satel_integra import checksum
+
+CMD_ZONES_BYPASS = 0x86
+CMD_ZONES_UNBYPASS = 0x87
+CMD_OUTPUTS_ON = 0x88
+CMD_OUTPUTS_OFF = 0x89
+# Control commands taking a user code in their first bytes: arm, disarm,
+# clear alarm, bypass, outputs, open door and clear trouble memory
+CODE_COMMANDS = range(0x80, 0x8C)
+CODE_LENGTH = 8
+
+# Length in bytes of zone and output lists of INTEGRA 256
+DEVICE_LIST_LENGTH = 32
+
+FRAME_HEADER = b"\xfe\xfe"
+FRAME_FOOTER = b"\xfe\x0d"
+
+
+def code_bytes(code: str) -> bytes:
+    """Encode a user code padded to 8 bytes."""
+    return bytes.fromhex(code.ljust(CODE_LENGTH * 2, "F"))
+
+
+def bitmask_bytes(numbers: Iterable[int], length: int = DEVICE_LIST_LENGTH) -> bytes:
+    """Encode 1-based device numbers as a little endian bitmask."""
+    mask = 0
+    for number in numbers:
+        if not 1 <= number <= length * 8:
+            raise ValueError(f"Device number {number} out of range")
+        mask |= 1 << (number - 1)
+    return mask.to_bytes(length, "little")
+
+
+def masked_command(command: int, code: str, numbers: Iterable[int]) -> bytes:
+    """Build a frame of a command taking a user code and device list."""
+    return encode_frame(
+        command.to_bytes(1, "big") + code_bytes(code) + bitmask_bytes(numbers)
+    )
+
+
+def encode_frame(data: bytes) -> bytes:
+    """Build a frame, escaping 0xFE in data and checksum.
+
+    Unlike generate_query this escapes, as needed for arbitrary data.
+    """
+    crc = checksum(data)
+    body = bytes(data) + bytes((crc >> 8, crc & 0xFF))
+    return FRAME_HEADER + body.replace(b"\xfe", b"\xfe\xf0") + FRAME_FOOTER
+
+
+def decode_frame(frame: bytes) -> bytes:
+    """Verify and strip a frame, return its data."""
+    if frame[:2] != FRAME_HEADER or frame[-2:] != FRAME_FOOTER:
+        raise ValueError(f"Malformed frame {frame.hex()}")
+    escaped = frame[2:-2]
+    if b"\xfe" in escaped.replace(b"\xfe\xf0", b""):
+        raise ValueError(f"Unescaped 0xFE in frame {frame.hex()}")
+    body = escaped.replace(b"\xfe\xf0", b"\xfe")
+    if len(body) < 3 or checksum(body[:-2]) != int.from_bytes(body[-2:], "big"):
+        raise ValueError(f"Wrong checksum {frame.hex()}")
+    return body[:-2]
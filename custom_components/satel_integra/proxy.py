@@ -0,0 +1,262 @@
+"""Local TCP proxy sharing the panel connection with other clients."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .adapter import async_send_frame
+from .commands import (
+    PRIORITY_SECURITY,
+    PRIORITY_SWITCH,
+    PRIORITY_TELEMETRY,
+    SatelCommandQueue,
+)
+from .monitored import KIND_OUTPUTS, KIND_ZONES
+from .protocol import (
+    CMD_OUTPUTS_OFF,
+    CMD_ZONES_BYPASS,
+    FRAME_FOOTER,
+    decode_frame,
+    encode_frame,
+)
+from .state import iter_bits
+from .supervisor import RESYNC_COMMANDS, STATE_QUERY_LIMIT, SatelConnectionSupervisor
+from .tap import DIRECTION_RX, SatelFrameTap
+
+_LOGGER = logging.getLogger(__name__)
+
+CMD_NEW_DATA = 0x7F
+CMD_ARM_MODE0 = 0x80
+CMD_CLEAR_ALARM = 0x85
+CMD_RESULT = 0xEF
+RESULT_ACCEPTED = 0xFF
+# Suffix asking for the 32 byte lists of INTEGRA 256
+LONG_LIST = 0xFF
+LONG_LIST_COMMANDS = frozenset(RESYNC_COMMANDS[KIND_ZONES] + RESYNC_COMMANDS[KIND_OUTPUTS])
+SHORT_LIST_LENGTH = 16
+# Bytes of the new data flags, one bit per state command
+NEW_DATA_LENGTH = STATE_QUERY_LIMIT // 8
+
+MAX_CLIENTS = 8
+# Bytes a client may leave unread before it is disconnected
+MAX_CLIENT_BUFFER = 64 * 1024
+# Longest wait for the panel to answer a forwarded command, in seconds
+ANSWER_TIMEOUT = 5.0
+
+
+def _priority(command: int) -> int:
+    """Return the command class of a forwarded command."""
+    if CMD_ARM_MODE0 <= command <= CMD_CLEAR_ALARM:
+        return PRIORITY_SECURITY
+    if CMD_ZONES_BYPASS <= command <= CMD_OUTPUTS_OFF:
+        return PRIORITY_SWITCH
+    return PRIORITY_TELEMETRY
+
+
+class _ProxyClient:
+    """A local client with the state commands it monitors."""
+
+    __slots__ = ("writer", "peer", "monitored", "changed")
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.peer = writer.get_extra_info("peername")
+        self.monitored: set[int] = set()
+        self.changed: set[int] = set()
+
+
+class SatelLocalProxy:
+    """Serve the integration protocol to local clients over one connection.
+
+    The ETHM module accepts few clients, so other software connects here
+    instead, unencrypted. State frames of the panel are kept in memory:
+    state queries are answered from them while connected, and every
+    client monitoring a state command (0x7F with a command mask) gets
+    its frames pushed when they change. Other commands are sent through
+    the command queue in their class, and the next answer with the same
+    command or a result frame is returned to the client. The queued
+    command waits for that answer, so the next command of its class is
+    only sent after it; a telemetry read can still interleave with a
+    security or switch command, as for the integration itself.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        controller,
+        tap: SatelFrameTap,
+        commands: SatelCommandQueue,
+        supervisor: SatelConnectionSupervisor,
+        panel_id: str,
+    ) -> None:
+        """Initialize the proxy."""
+        self._hass = hass
+        self._satel = controller
+        self._tap = tap
+        self._commands = commands
+        self._supervisor = supervisor
+        self._panel_id = panel_id
+        self._server: asyncio.Server | None = None
+        self._clients: set[_ProxyClient] = set()
+        self._states: dict[int, bytes] = {}
+        self._waiters: list[tuple[tuple[int, int], asyncio.Future[bytes]]] = []
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._counters = {"cached": 0, "forwarded": 0, "failed": 0, "dropped": 0}
+
+    async def async_start(self, host: str, port: int) -> None:
+        """Listen for clients on the address host and port."""
+        self._server = await asyncio.start_server(self._async_serve, host, port)
+        self._unsubs.append(self._tap.async_add_listener(self._frame))
+        # States are read again after every connection
+        self._unsubs.append(
+            self._supervisor.async_add_monitoring_listener(self._states.clear)
+        )
+        _LOGGER.info("Panel %s proxy listening on %s port %s", self._panel_id, host, port)
+
+    async def async_stop(self) -> None:
+        """Stop listening and disconnect the clients."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        if self._server is None:
+            return
+        self._server.close()
+        for client in list(self._clients):
+            client.writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    def metrics(self) -> dict[str, Any]:
+        """Return the connected clients and request counters."""
+        return {
+            "clients": [str(client.peer) for client in self._clients],
+            **self._counters,
+        }
+
+    async def _async_serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the requests of one client until it disconnects."""
+        client = _ProxyClient(writer)
+        if len(self._clients) >= MAX_CLIENTS:
+            _LOGGER.warning("Proxy client %s refused, %s clients connected", client.peer, MAX_CLIENTS)
+            writer.close()
+            return
+        _LOGGER.debug("Proxy client %s connected", client.peer)
+        self._clients.add(client)
+        try:
+            while not writer.is_closing():
+                frame = await reader.readuntil(FRAME_FOOTER)
+                try:
+                    data = decode_frame(frame)
+                except ValueError as err:
+                    _LOGGER.debug("Proxy client %s: %s", client.peer, err)
+                    continue
+                await self._async_request(client, data)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            self._clients.discard(client)
+            writer.close()
+            _LOGGER.debug("Proxy client %s disconnected", client.peer)
+
+    async def _async_request(self, client: _ProxyClient, data: bytes) -> None:
+        """Answer one request of a client."""
+        command = data[0]
+        if command == CMD_NEW_DATA:
+            self._new_data(client, data)
+            return
+        if command < STATE_QUERY_LIMIT and (answer := self._cached(data)) is not None:
+            self._counters["cached"] += 1
+            self._send(client, answer)
+            return
+
+        try:
+            answer = await self._commands.async_submit(
+                _priority(command), self._async_forward, data
+            )
+        except (TimeoutError, HomeAssistantError) as err:
+            self._counters["failed"] += 1
+            _LOGGER.debug(
+                "Proxy command 0x%02x of %s failed: %s", command, client.peer, err or "timeout"
+            )
+            return
+        self._counters["forwarded"] += 1
+        self._send(client, answer)
+
+    async def _async_forward(self, data: bytes) -> bytes:
+        """Send a client command and return the answer of the panel."""
+        if not self._satel.connected:
+            raise HomeAssistantError("Panel is not connected")
+        future: asyncio.Future[bytes] = self._hass.loop.create_future()
+        waiter = ((data[0], CMD_RESULT), future)
+        self._waiters.append(waiter)
+        try:
+            await async_send_frame(self._satel, encode_frame(data))
+            async with asyncio.timeout(ANSWER_TIMEOUT):
+                return await future
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _cached(self, data: bytes) -> bytes | None:
+        """Return the stored answer to a state query, None if unknown."""
+        answer = self._states.get(data[0])
+        if answer is None or not self._satel.connected:
+            return None
+        if data[0] in LONG_LIST_COMMANDS:
+            if data[1:2] == bytes((LONG_LIST,)):
+                return answer if len(answer) > SHORT_LIST_LENGTH + 1 else None
+            return answer[: SHORT_LIST_LENGTH + 1]
+        return answer
+
+    def _new_data(self, client: _ProxyClient, data: bytes) -> None:
+        """Answer the new data flags, or start monitoring the given commands."""
+        if len(data) == 1:
+            flags = sum(1 << command for command in client.changed)
+            client.changed.clear()
+            self._send(client, bytes((CMD_NEW_DATA,)) + flags.to_bytes(NEW_DATA_LENGTH, "little"))
+            return
+        mask = int.from_bytes(data[1:], "little")
+        client.monitored = {command for command in iter_bits(mask) if command < STATE_QUERY_LIMIT}
+        self._send(client, bytes((CMD_RESULT, RESULT_ACCEPTED)))
+        for command in sorted(client.monitored & self._states.keys()):
+            self._send(client, self._states[command])
+
+    def _send(self, client: _ProxyClient, data: bytes) -> None:
+        """Send a frame, disconnect the client if it does not keep up."""
+        writer = client.writer
+        if writer.is_closing():
+            return
+        if writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+            _LOGGER.warning("Proxy client %s does not keep up, disconnecting", client.peer)
+            self._counters["dropped"] += 1
+            writer.close()
+            return
+        writer.write(encode_frame(data))
+
+    @callback
+    def _frame(self, direction: int, frame: bytes) -> None:
+        """Hand a panel frame to the waiting and monitoring clients."""
+        if direction != DIRECTION_RX or not frame:
+            return
+        command = frame[0]
+        for waiter in list(self._waiters):
+            commands, future = waiter
+            if future.done():
+                self._waiters.remove(waiter)
+            elif command in commands:
+                self._waiters.remove(waiter)
+                future.set_result(bytes(frame))
+                break
+
+        if command >= STATE_QUERY_LIMIT or self._states.get(command) == frame:
+            return
+        self._states[command] = bytes(frame)
+        for client in list(self._clients):
+            client.changed.add(command)
+            if command in client.monitored:
+                self._send(client, frame)
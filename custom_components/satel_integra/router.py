@@ -0,0 +1,231 @@
+"""Targeted routing of Satel Integra status frames to entities."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Collection, Mapping
+import logging
+from time import perf_counter
+from typing import Any
+
+from satel_integra2.satel_integra import AlarmState
+
+from homeassistant.components.alarm_control_panel import AlarmControlPanelState
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import SIGNAL_CONNECTION, SIGNAL_PANEL_MESSAGE
+from .state import SatelStateStore, iter_bits
+
+_LOGGER = logging.getLogger(__name__)
+
+# Satel partition states in order of priority, highest first
+STATE_MAP = OrderedDict(
+    [
+        (AlarmState.TRIGGERED, AlarmControlPanelState.TRIGGERED),
+        (AlarmState.TRIGGERED_FIRE, AlarmControlPanelState.TRIGGERED),
+        (AlarmState.TRIGGERED_MEM, AlarmControlPanelState.TRIGGERED),
+        (AlarmState.TRIGGERED_MEM_FIRE, AlarmControlPanelState.TRIGGERED),
+        (AlarmState.ENTRY_TIME, AlarmControlPanelState.PENDING),
+        (AlarmState.ARMED_MODE3, AlarmControlPanelState.ARMED_HOME),
+        (AlarmState.ARMED_MODE2, AlarmControlPanelState.ARMED_HOME),
+        (AlarmState.ARMED_MODE1, AlarmControlPanelState.ARMED_HOME),
+        (AlarmState.ARMED_MODE0, AlarmControlPanelState.ARMED_AWAY),
+        (AlarmState.EXIT_COUNTDOWN_OVER_10, AlarmControlPanelState.PENDING),
+        (AlarmState.EXIT_COUNTDOWN_UNDER_10, AlarmControlPanelState.PENDING),
+    ]
+)
+
+# Satel partition states of armed partitions, a disarm is confirmed by a
+# message without the partition in any of them
+ARMED_STATES = (
+    AlarmState.ARMED_MODE0,
+    AlarmState.ARMED_MODE1,
+    AlarmState.ARMED_MODE2,
+    AlarmState.ARMED_MODE3,
+    AlarmState.ARMED_SUPPRESSED,
+)
+
+
+# Stages reported to the timing hook: the diff of a status against the state
+# store (for partitions including the entity updates), one entity update and
+# the whole dispatch
+STAGE_ROUTE = "route"
+STAGE_ENTITY = "entity"
+STAGE_DISPATCH = "dispatch"
+
+# Timing hook called with signal, stage, start and end perf_counter()
+DispatchTiming = Callable[[str, str, float, float], None]
+
+
+class SatelStatusRouter:
+    """Route status frames only to the entities whose state changed.
+
+    Entities subscribe for a (status category, device number) pair. Every
+    incoming frame is XOR-ed with the previous bitmap of the same category
+    kept in the state store and only subscribers of the changed device
+    numbers are called. Stages of every dispatch are timed only while a
+    timing hook is set.
+    """
+
+    def __init__(self, store: SatelStateStore) -> None:
+        """Initialize the router."""
+        self.store = store
+        self._listeners: dict[str, dict[int, list[Callable[[Any], None]]]] = (
+            defaultdict(dict)
+        )
+        self._connected = False
+        self._restored = False
+        self._partition_states: dict[int, AlarmControlPanelState] = {}
+        self._armed: set[int] = set()
+        self._disarm_waiters: list[tuple[frozenset[int], asyncio.Future[None]]] = []
+        self.timing: DispatchTiming | None = None
+
+    @callback
+    def async_subscribe(
+        self, signal: str, device_number: int, target: Callable[[Any], None]
+    ) -> CALLBACK_TYPE:
+        """Subscribe target for changes of one device in given category."""
+        targets = self._listeners[signal].setdefault(device_number, [])
+        targets.append(target)
+
+        @callback
+        def async_unsubscribe() -> None:
+            targets.remove(target)
+            if not targets:
+                self._listeners[signal].pop(device_number, None)
+
+        return async_unsubscribe
+
+    @callback
+    def async_dispatch(self, signal: str, status: dict[int, Any]) -> int:
+        """Deliver the changed part of a status frame to subscribers.
+
+        Return the bitmap of changed device numbers.
+        """
+        timing = self.timing
+        started = perf_counter() if timing else 0.0
+        changed = self.store.update(signal, status)
+        if timing:
+            timing(signal, STAGE_ROUTE, started, perf_counter())
+
+        listeners = self._listeners.get(signal)
+        if changed and listeners:
+            bitmap = self.store.bitmap(signal)
+            for device_number in iter_bits(changed):
+                for target in listeners.get(device_number, ()):
+                    if timing:
+                        begin = perf_counter()
+                        target(bitmap >> device_number & 1)
+                        timing(signal, STAGE_ENTITY, begin, perf_counter())
+                    else:
+                        target(bitmap >> device_number & 1)
+
+        if timing:
+            timing(signal, STAGE_DISPATCH, started, perf_counter())
+        return changed
+
+    @property
+    def available(self) -> bool:
+        """Return true if the panel is connected or a restored state is shown."""
+        return self._connected or self._restored
+
+    @callback
+    def async_subscribe_connection(self, target: Callable[[bool], None]) -> CALLBACK_TYPE:
+        """Subscribe target for changes of availability."""
+        return self.async_subscribe(SIGNAL_CONNECTION, 0, target)
+
+    @callback
+    def async_set_connected(self, connected: bool) -> None:
+        """Track the panel connection, a restored state is kept until then."""
+        was_available = self.available
+        self._connected, self._restored = bool(connected), False
+        if self.available == was_available:
+            return
+        for target in list(self._listeners.get(SIGNAL_CONNECTION, {}).get(0, ())):
+            target(self.available)
+
+    def partition_state(self, partition: int) -> AlarmControlPanelState:
+        """Return the current state of a partition."""
+        return self._partition_states.get(partition, AlarmControlPanelState.DISARMED)
+
+    def armed(self, partitions: Collection[int]) -> bool:
+        """Return true if any of the partitions was armed in the last message."""
+        return not self._armed.isdisjoint(partitions)
+
+    @callback
+    def async_wait_disarmed(self, partitions: Collection[int]) -> asyncio.Future[None]:
+        """Return a future done by the next message with none of partitions armed.
+
+        Create it before sending the disarm command, so that the message
+        confirming it cannot be missed.
+        """
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._disarm_waiters.append((frozenset(partitions), future))
+        return future
+
+    def partition_states(self) -> dict[int, AlarmControlPanelState]:
+        """Return the partitions which are not disarmed and their states."""
+        return dict(self._partition_states)
+
+    @callback
+    def async_restore_partitions(
+        self, states: Mapping[int, AlarmControlPanelState]
+    ) -> None:
+        """Seed partition states saved before a restart.
+
+        They are shown as available until the panel is connected or the
+        connection fails.
+        """
+        self._restored = not self._connected
+        self._partition_states = dict(states)
+
+    @callback
+    def async_dispatch_partitions(
+        self, partition_states: Mapping[AlarmState, list[int]], connected: bool
+    ) -> int:
+        """Deliver the partitions whose state changed with a panel message.
+
+        The highest priority state of every partition is computed once per
+        message. Return the bitmap of changed partitions.
+        """
+        timing = self.timing
+        started = perf_counter() if timing else 0.0
+        states: dict[int, AlarmControlPanelState] = {}
+        for satel_state, ha_state in reversed(STATE_MAP.items()):
+            for partition in partition_states.get(satel_state, ()):
+                states[partition] = ha_state
+
+        previous, self._partition_states = self._partition_states, states
+
+        self._armed = {
+            partition
+            for satel_state in ARMED_STATES
+            for partition in partition_states.get(satel_state, ())
+        }
+        if self._disarm_waiters:
+            waiting = []
+            for partitions, future in self._disarm_waiters:
+                if future.done():
+                    continue
+                if self._armed.isdisjoint(partitions):
+                    future.set_result(None)
+                else:
+                    waiting.append((partitions, future))
+            self._disarm_waiters = waiting
+
+        changed = 0
+        listeners = self._listeners.get(SIGNAL_PANEL_MESSAGE, {})
+        for partition in previous.keys() | states.keys():
+            if previous.get(partition) == states.get(partition):
+                continue
+            changed |= 1 << partition
+            for target in listeners.get(partition, ()):
+                target(self.partition_state(partition))
+
+        self.async_set_connected(connected)
+        if timing:
+            finished = perf_counter()
+            timing(SIGNAL_PANEL_MESSAGE, STAGE_ROUTE, started, finished)
+            timing(SIGNAL_PANEL_MESSAGE, STAGE_DISPATCH, started, finished)
+        return changed
+
@@ -4,61 +4,145 @@ from __future__ import annotations
 import logging
 from datetime import timedelta
 
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
-from homeassistant.const import UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, Platform, UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
 from .entity import SatelIntegraEntity
+from .temperature import SatelTemperatureCoordinator
+from .panel import SatelPanel
 from .const import (
-    DATA_SATEL,
+    CONF_PANEL_ID,
+    DATA_PANELS,
     CONF_TEMP_SENSORS,
     CONF_TEMP_SENSOR_NAME,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-async def async_setup_platform(
+async def async_setup_entry(
     hass: HomeAssistant,
-    config: ConfigType,
+    entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
-    discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
     """Set up the Satel Integra temperature sensor devices."""
-    if not discovery_info:
-        return
+    panel = hass.data[DATA_PANELS][entry.data[CONF_PANEL_ID]]
+
+    coordinator = SatelTemperatureCoordinator(
+        hass,
+        panel.controller,
+        panel.commands,
+        list(panel.conf[CONF_TEMP_SENSORS]),
+        SCAN_INTERVAL,
+        TEMP_READ_TIMEOUT,
+    )
+    panel.temperature = coordinator
+
+    panel.async_add_platform(Platform.SENSOR, _build_entities, async_add_entities)
 
-    controller = hass.data[DATA_SATEL]
+    coordinator.async_start()
 
     async_add_entities(
-        [SatelIntegraTemperatureSensor(controller, sensor_num, device_config_data[CONF_TEMP_SENSOR_NAME])
-            for sensor_num, device_config_data in discovery_info[CONF_TEMP_SENSORS].items()],
-        update_before_add=True)
+        SatelIntegraHealthSensor(panel, *description)
+        for description in HEALTH_SENSORS
+    )
+
+
+def _build_entities(panel, conf):
+    """Build the configured temperature sensors."""
+    return [
+        SatelIntegraTemperatureSensor(panel, panel.temperature, sensor_num, device_config_data[CONF_TEMP_SENSOR_NAME])
+        for sensor_num, device_config_data in conf[CONF_TEMP_SENSORS].items()
+    ]
 
-PARALLEL_UPDATES = 0
 SCAN_INTERVAL = timedelta(seconds=120)
+TEMP_READ_TIMEOUT = 20
+
+# Connection health sensors: metric key, name, unit, state class; round trip
+# times show the p95 and carry the whole summary as attributes
+HEALTH_SENSORS = (
+    ("keep_alive_rtt_ms", "keep-alive round trip", UnitOfTime.MILLISECONDS, SensorStateClass.MEASUREMENT),
+    ("command_rtt_ms", "command round trip", UnitOfTime.MILLISECONDS, SensorStateClass.MEASUREMENT),
+    ("timeouts", "command timeouts", None, SensorStateClass.TOTAL_INCREASING),
+    ("reconnects", "reconnects", None, SensorStateClass.TOTAL_INCREASING),
+    ("stalls", "link stalls", None, SensorStateClass.TOTAL_INCREASING),
+)
 
 class SatelIntegraTemperatureSensor(SatelIntegraEntity, SensorEntity):
     """Representation of an Satel Integra temperature sensor."""
 
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-    _attr_should_poll = True
+    _attr_should_poll = False
 
     def __init__(
-        self, controller, device_number, device_name
+        self, panel, coordinator, device_number, device_name
     ):
         """Initialize the sensor."""
-        super().__init__(controller, device_number, device_name, "temp")
-
-    async def async_update(self) -> None:
-        # generate random temperature between 20.5 and 22.5
-        _LOGGER.info("async_update sensor %s", self._device_number)
-        import random
-        # self._attr_native_value = float(round(random.uniform(20.5, 22.5), 1))
-
-        try:
-            self._attr_native_value = await self._satel.read_temp_and_wait(self._device_number)
-        except TimeoutError:
-            _LOGGER.error("Timeout error while reading temperature %s", self._device_number)
+        super().__init__(panel, device_number, device_name, "temp")
+        self._coordinator = coordinator
+
+    async def async_added_to_hass(self) -> None:
+        """Register for temperature updates."""
+        await super().async_added_to_hass()
+        self._attr_native_value = self._coordinator.data.get(self._device_number)
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self._temperature_updated)
+        )
+
+    @callback
+    def _temperature_updated(self) -> None:
+        """Update the temperature, if needed."""
+        value = self._coordinator.data.get(self._device_number)
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
+
+
+class SatelIntegraHealthSensor(SensorEntity):
+    """Diagnostic sensor of the panel connection health."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+
+    def __init__(self, panel: SatelPanel, key, name, unit, state_class):
+        """Initialize the sensor."""
+        self._health = panel.health
+        self._key = key
+        self._attr_name = f"{panel.title} {name}"
+        self._attr_unique_id = panel.unique_id(f"satel_health_{key}")
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+        self._attr_extra_state_attributes = None
+
+    async def async_added_to_hass(self) -> None:
+        """Register for health updates."""
+        self._update()
+        self.async_on_remove(self._health.async_add_listener(self._health_updated))
+
+    @callback
+    def _update(self) -> bool:
+        """Read the metric, return true if it changed."""
+        value = self._health.metrics()[self._key]
+        attributes = None
+        if isinstance(value, dict):
+            value, attributes = value["p95"], value
+        changed = (value, attributes) != (
+            self._attr_native_value,
+            self._attr_extra_state_attributes,
+        )
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = attributes
+        return changed
+
+    @callback
+    def _health_updated(self) -> None:
+        """Update the metric, if needed."""
+        if self._update():
+            self.async_write_ha_state()
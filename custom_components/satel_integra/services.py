@@ -0,0 +1,237 @@
+"""Services of the Satel Integra integration."""
+from __future__ import annotations
+
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .batcher import KIND_BYPASS, KIND_OUTPUTS
+from .capture import async_replay
+from .panel import SatelPanel
+from .const import (
+    ATTR_BYPASS,
+    ATTR_FILENAME,
+    ATTR_MODE,
+    ATTR_OUTPUTS,
+    ATTR_PANEL,
+    ATTR_PARTITIONS,
+    ATTR_RESET,
+    ATTR_SPEED,
+    ATTR_STATE,
+    ATTR_ZONES,
+    CONF_DEVICE_CODE,
+    DATA_PANELS,
+    DOMAIN,
+    SERVICE_ARM_PARTITIONS,
+    SERVICE_BYPASS_ZONES,
+    SERVICE_CLEAR_ALARM,
+    SERVICE_DISCOVER_DEVICES,
+    SERVICE_DISARM_PARTITIONS,
+    SERVICE_DUMP_PROFILING,
+    SERVICE_REPLAY_CAPTURE,
+    SERVICE_SET_OUTPUTS,
+    SERVICE_START_CAPTURE,
+    SERVICE_START_PROFILING,
+    SERVICE_STOP_CAPTURE,
+    SERVICE_STOP_PROFILING,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEVICE_LIST = vol.All(cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(min=1, max=256))])
+PARTITION_LIST = vol.All(
+    cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(min=1, max=31))]
+)
+
+# Every service acts on the first configured panel unless one is given
+PANEL_SCHEMA = vol.Schema({vol.Optional(ATTR_PANEL): cv.slug})
+
+SET_OUTPUTS_SCHEMA = PANEL_SCHEMA.extend(
+    {
+        vol.Required(ATTR_OUTPUTS): DEVICE_LIST,
+        vol.Required(ATTR_STATE): cv.boolean,
+        vol.Optional(CONF_DEVICE_CODE): cv.string,
+    }
+)
+BYPASS_ZONES_SCHEMA = PANEL_SCHEMA.extend(
+    {
+        vol.Required(ATTR_ZONES): DEVICE_LIST,
+        vol.Optional(ATTR_BYPASS, default=True): cv.boolean,
+        vol.Optional(CONF_DEVICE_CODE): cv.string,
+    }
+)
+
+ARM_PARTITIONS_SCHEMA = PANEL_SCHEMA.extend(
+    {
+        vol.Required(ATTR_PARTITIONS): PARTITION_LIST,
+        vol.Optional(ATTR_MODE, default=0): vol.All(vol.Coerce(int), vol.In([0, 1, 2, 3])),
+        vol.Required(CONF_DEVICE_CODE): cv.string,
+    }
+)
+# Arming, disarming and clearing always need the code of the caller, like
+# the alarm control panel entities
+PARTITIONS_SCHEMA = PANEL_SCHEMA.extend(
+    {
+        vol.Required(ATTR_PARTITIONS): PARTITION_LIST,
+        vol.Required(CONF_DEVICE_CODE): cv.string,
+    }
+)
+START_CAPTURE_SCHEMA = PANEL_SCHEMA.extend({vol.Required(ATTR_FILENAME): cv.string})
+REPLAY_CAPTURE_SCHEMA = PANEL_SCHEMA.extend(
+    {
+        vol.Required(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_SPEED, default=1): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+DUMP_PROFILING_SCHEMA = PANEL_SCHEMA.extend(
+    {vol.Optional(ATTR_RESET, default=False): cv.boolean}
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    def _panel(call: ServiceCall) -> SatelPanel:
+        panels = hass.data[DATA_PANELS]
+        panel_id = call.data.get(ATTR_PANEL)
+        if panel_id is None:
+            if not panels:
+                raise HomeAssistantError("No panel is set up")
+            return min(panels.values(), key=lambda panel: panel.index)
+        if panel_id not in panels:
+            raise HomeAssistantError(f"Unknown panel {panel_id}")
+        return panels[panel_id]
+
+    def _code(call: ServiceCall) -> str:
+        """Return the code for switching, the configured one by default."""
+        code = call.data.get(CONF_DEVICE_CODE, _panel(call).code)
+        if not code:
+            raise HomeAssistantError("A user code is needed, none is configured")
+        return code
+
+    def _path(call: ServiceCall) -> str:
+        path = hass.config.path(call.data[ATTR_FILENAME])
+        if not hass.config.is_allowed_path(path):
+            raise HomeAssistantError(f"Access to {path} is not allowed")
+        return path
+
+    async def async_set_outputs(call: ServiceCall) -> None:
+        """Turn several outputs on or off with one command."""
+        await _panel(call).batcher.async_set_many(
+            KIND_OUTPUTS, _code(call), call.data[ATTR_OUTPUTS], call.data[ATTR_STATE]
+        )
+
+    async def async_bypass_zones(call: ServiceCall) -> None:
+        """Bypass or unbypass several zones with one command."""
+        await _panel(call).batcher.async_set_many(
+            KIND_BYPASS, _code(call), call.data[ATTR_ZONES], call.data[ATTR_BYPASS]
+        )
+
+    async def async_arm_partitions(call: ServiceCall) -> None:
+        """Arm several partitions with one command."""
+        await _panel(call).partition_batcher.async_arm(
+            call.data[CONF_DEVICE_CODE], call.data[ATTR_PARTITIONS], call.data[ATTR_MODE]
+        )
+
+    async def async_disarm_partitions(call: ServiceCall) -> None:
+        """Disarm several partitions with one command."""
+        await _panel(call).partition_batcher.async_disarm(
+            call.data[CONF_DEVICE_CODE], call.data[ATTR_PARTITIONS]
+        )
+
+    async def async_clear_alarm(call: ServiceCall) -> None:
+        """Clear alarm of several partitions with one command."""
+        await _panel(call).partition_batcher.async_clear_alarm(
+            call.data[CONF_DEVICE_CODE], call.data[ATTR_PARTITIONS]
+        )
+
+    async def async_start_capture(call: ServiceCall) -> None:
+        """Start recording panel frames to a capture file."""
+        await _panel(call).recorder.async_start(_path(call))
+
+    async def async_stop_capture(call: ServiceCall) -> None:
+        """Stop recording panel frames."""
+        await _panel(call).recorder.async_stop()
+
+    async def async_replay_capture(call: ServiceCall) -> None:
+        """Replay received frames of a capture file."""
+        await async_replay(
+            hass, _panel(call).controller, _path(call), call.data[ATTR_SPEED]
+        )
+
+    async def async_start_profiling(call: ServiceCall) -> None:
+        """Start timing the status frame pipeline."""
+        _panel(call).profiler.async_start()
+
+    async def async_stop_profiling(call: ServiceCall) -> None:
+        """Stop timing the status frame pipeline."""
+        _panel(call).profiler.async_stop()
+
+    async def async_discover_devices(call: ServiceCall) -> None:
+        """Read the devices of the panel again."""
+        _panel(call).discovery.async_refresh()
+
+    async def async_dump_profiling(call: ServiceCall) -> ServiceResponse:
+        """Log and return the latency histograms."""
+        histograms = _panel(call).profiler.dump(call.data[ATTR_RESET])
+        for label, stages in histograms.items():
+            _LOGGER.info(
+                "Latency of %s: %s",
+                label,
+                ", ".join(
+                    f"{stage} n={histogram['count']} avg={histogram['avg_us']}us "
+                    f"p95<={histogram['p95_us']}us max={histogram['max_us']}us"
+                    for stage, histogram in stages.items()
+                ),
+            )
+        return {"histograms": histograms}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_OUTPUTS, async_set_outputs, schema=SET_OUTPUTS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_BYPASS_ZONES, async_bypass_zones, schema=BYPASS_ZONES_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_ARM_PARTITIONS, async_arm_partitions, schema=ARM_PARTITIONS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_DISARM_PARTITIONS, async_disarm_partitions, schema=PARTITIONS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_CLEAR_ALARM, async_clear_alarm, schema=PARTITIONS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_CAPTURE, async_start_capture, schema=START_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_CAPTURE, async_stop_capture, schema=PANEL_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REPLAY_CAPTURE, async_replay_capture, schema=REPLAY_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_PROFILING, async_start_profiling, schema=PANEL_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_PROFILING, async_stop_profiling, schema=PANEL_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_DISCOVER_DEVICES, async_discover_devices, schema=PANEL_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_PROFILING,
+        async_dump_profiling,
+        schema=DUMP_PROFILING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
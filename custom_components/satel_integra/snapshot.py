@@ -0,0 +1,103 @@
+"""Persistent snapshot of the last known Satel Integra state."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.components.alarm_control_panel import AlarmControlPanelState
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .router import SatelStatusRouter
+from .state import CATEGORY_WIDTHS, SatelStateStore
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = "satel_integra.snapshot"
+STORAGE_VERSION = 1
+
+# Seconds a scheduled save waits, shutdown saves are flushed by the final write
+SAVE_DELAY = 10
+
+
+class SatelSnapshot:
+    """Save the state bitmaps and partition states, restore them on startup.
+
+    Bitmaps are stored as hex strings, partition states by their value. The
+    restored state is shown until the panel reports the live one; status
+    frames are diffed against it, so only entities whose state changed in
+    the meantime are updated.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        store: SatelStateStore,
+        router: SatelStatusRouter,
+        panel_id: str | None = None,
+    ) -> None:
+        """Initialize the snapshot, stored per panel_id if given."""
+        key = STORAGE_KEY if panel_id is None else f"{STORAGE_KEY}.{panel_id}"
+        self._storage: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, key)
+        self._store = store
+        self._router = router
+        self._saved: dict[str, Any] | None = None
+
+    async def async_restore(self) -> bool:
+        """Seed the state store and router from the snapshot.
+
+        Return true if a snapshot was restored.
+        """
+        data = await self._storage.async_load()
+        if not data:
+            return False
+
+        for category, bitmap in data.get("bitmaps", {}).items():
+            if category in CATEGORY_WIDTHS:
+                self._store.update_bitmap(category, int(bitmap, 16))
+        self._router.async_restore_partitions(
+            {
+                int(partition): AlarmControlPanelState(state)
+                for partition, state in data.get("partitions", {}).items()
+            }
+        )
+        self._saved = {key: data.get(key) for key in ("bitmaps", "partitions")}
+        _LOGGER.debug("Restored state snapshot saved at %s", data.get("saved"))
+        return True
+
+    @callback
+    def async_start(self, hass: HomeAssistant, interval: timedelta) -> CALLBACK_TYPE:
+        """Start saving the snapshot periodically."""
+        return async_track_time_interval(hass, self._async_save_if_changed, interval)
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Schedule a save, flushed at the latest when Home Assistant stops."""
+        self._storage.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _async_save_if_changed(self, now: datetime | None = None) -> None:
+        if self._state() != self._saved:
+            self.async_schedule_save()
+
+    @callback
+    def _state(self) -> dict[str, Any]:
+        """Return the current bitmaps and partition states."""
+        return {
+            "bitmaps": {
+                category: format(self._store.bitmap(category), "x")
+                for category in CATEGORY_WIDTHS
+            },
+            "partitions": {
+                str(partition): str(state)
+                for partition, state in self._router.partition_states().items()
+            },
+        }
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        self._saved = self._state()
+        return {"saved": dt_util.utcnow().isoformat(), **self._saved}
@@ -0,0 +1,81 @@
+"""Compact bitmap store of the Satel Integra controller state."""
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from .const import (
+    SIGNAL_ALARM_UPDATED,
+    SIGNAL_BYPASS_UPDATED,
+    SIGNAL_MASKED_UPDATED,
+    SIGNAL_MEM_ALARM_UPDATED,
+    SIGNAL_MEM_MASKED_UPDATED,
+    SIGNAL_MEM_TAMPER_UPDATED,
+    SIGNAL_OUTPUTS_UPDATED,
+    SIGNAL_TAMPER_UPDATED,
+    SIGNAL_TROUBLE2_UPDATED,
+    SIGNAL_TROUBLE_UPDATED,
+    SIGNAL_VIOLATED_UPDATED,
+)
+
+# Upper bound of bit numbers reported by the panel for each status category.
+CATEGORY_WIDTHS = {
+    SIGNAL_VIOLATED_UPDATED: 256,
+    SIGNAL_ALARM_UPDATED: 256,
+    SIGNAL_MEM_ALARM_UPDATED: 256,
+    SIGNAL_TAMPER_UPDATED: 256,
+    SIGNAL_MEM_TAMPER_UPDATED: 256,
+    SIGNAL_BYPASS_UPDATED: 256,
+    SIGNAL_MASKED_UPDATED: 256,
+    SIGNAL_MEM_MASKED_UPDATED: 256,
+    SIGNAL_OUTPUTS_UPDATED: 256,
+    SIGNAL_TROUBLE_UPDATED: 47 * 8,
+    SIGNAL_TROUBLE2_UPDATED: 47 * 8,
+}
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield positions of bits set in mask, lowest first."""
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+class SatelStateStore:
+    """One fixed-width bitmap per status category.
+
+    Device numbers are used directly as bit positions, so bit 0 is never
+    set for the 1-based zone and output numbers of the panel.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._bitmaps: dict[str, int] = dict.fromkeys(CATEGORY_WIDTHS, 0)
+        self._masks = {
+            category: (1 << (width + 1)) - 1
+            for category, width in CATEGORY_WIDTHS.items()
+        }
+
+    def update(self, category: str, status: Mapping[int, Any]) -> int:
+        """Store a status frame and return the bitmap of changed bits."""
+        bitmap = 0
+        for device_number, state in status.items():
+            if state:
+                bitmap |= 1 << device_number
+        return self.update_bitmap(category, bitmap)
+
+    def update_bitmap(self, category: str, bitmap: int) -> int:
+        """Replace the bitmap of a category and return the changed bits."""
+        bitmap &= self._masks[category]
+        changed = self._bitmaps[category] ^ bitmap
+        self._bitmaps[category] = bitmap
+        return changed
+
+    def bitmap(self, category: str) -> int:
+        """Return the current bitmap of a category."""
+        return self._bitmaps[category]
+
+    def is_set(self, category: str, device_number: int) -> bool:
+        """Return true if the bit of the device is set in the category."""
+        return bool(self._bitmaps[category] >> device_number & 1)
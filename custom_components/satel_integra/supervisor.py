@@ -0,0 +1,179 @@
+"""Background connection to the Satel Integra panel."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Collection
+import logging
+import random
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .adapter import (
+    async_send_frame,
+    message_handlers,
+    reconnect_delay,
+    set_reconnect_delay,
+    wrap_connection,
+)
+from .commands import PRIORITY_TELEMETRY, SatelCommandQueue
+from .monitored import KIND_OUTPUTS, KIND_PARTITIONS, KIND_TROUBLE, KIND_ZONES
+from .protocol import encode_frame
+from .router import SatelStatusRouter
+
+_LOGGER = logging.getLogger(__name__)
+
+# Reconnect delay in seconds, doubled after every failed attempt
+BACKOFF_MIN = 2
+BACKOFF_MAX = 300
+
+# Commands below this one read zone, partition, output and trouble states
+STATE_QUERY_LIMIT = 0x30
+
+# State commands answering for each kind of monitored device
+RESYNC_COMMANDS = {
+    KIND_ZONES: (*range(0x00, 0x09), 0x28, 0x29),
+    KIND_OUTPUTS: (0x17,),
+    KIND_PARTITIONS: (*range(0x09, 0x17), 0x2A),
+    KIND_TROUBLE: tuple(range(0x1B, 0x25)),
+}
+
+
+class SatelConnectionSupervisor:
+    """Connect in the background and resynchronize after every connection.
+
+    The connect of the controller is wrapped once, so the reconnects done
+    by its monitoring loop use the same backoff: the delay it sleeps after
+    a failed attempt doubles up to BACKOFF_MAX, with random jitter so that
+    several clients do not hammer a rebooting module in step. Every time
+    monitoring (re)starts, all state commands handled by the controller
+    are queried again and the answers go through the usual callbacks,
+    then the monitoring listeners are called.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        controller,
+        router: SatelStatusRouter,
+        commands: SatelCommandQueue,
+    ) -> None:
+        """Wrap the connect and start of monitoring of the controller."""
+        self._hass = hass
+        self._controller = controller
+        self._router = router
+        self._commands = commands
+        self._failures = 0
+        self._connections = 0
+        self.failed_connects = 0
+        self._task: asyncio.Task | None = None
+        self._resync_task: asyncio.Task | None = None
+        self._monitoring_listeners: list[Callable[[], None]] = []
+        wrap_connection(controller, self._connection_result, self._monitoring_started)
+
+    @property
+    def delay(self) -> float:
+        """Return the delay before the next connection attempt."""
+        return reconnect_delay(self._controller)
+
+    @property
+    def reconnects(self) -> int:
+        """Return the number of connections after the first one."""
+        return max(0, self._connections - 1)
+
+    @callback
+    def async_start(self, on_connected: Callable[[], None]) -> None:
+        """Connect in the background, call on_connected once connected."""
+        self._task = self._hass.async_create_background_task(
+            self._async_connect(on_connected), "satel_integra connect"
+        )
+
+    @callback
+    def async_add_monitoring_listener(self, listener: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call listener every time monitoring (re)starts."""
+        self._monitoring_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._monitoring_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop connecting and resynchronizing."""
+        for task in (self._task, self._resync_task):
+            if task:
+                task.cancel()
+
+    async def _async_connect(self, on_connected: Callable[[], None]) -> None:
+        while not await self._controller.connect():
+            if self._controller.closed:
+                return
+            await asyncio.sleep(self.delay)
+        on_connected()
+
+    @callback
+    def _monitoring_started(self) -> None:
+        self._async_schedule_resync()
+        for listener in list(self._monitoring_listeners):
+            listener()
+
+    @callback
+    def _connection_result(self, connected: bool) -> None:
+        controller = self._controller
+        if connected:
+            if self._failures:
+                _LOGGER.info("Connected after %s failed attempts", self._failures)
+            self._failures = 0
+            self._connections += 1
+            set_reconnect_delay(controller, BACKOFF_MIN)
+        else:
+            self._failures += 1
+            self.failed_connects += 1
+            delay = min(BACKOFF_MAX, BACKOFF_MIN * 2 ** (self._failures - 1))
+            set_reconnect_delay(controller, delay * random.uniform(0.5, 1))
+            _LOGGER.warning(
+                "Connection attempt %s failed, next one in %.1fs",
+                self._failures,
+                self.delay,
+            )
+        self._router.async_set_connected(connected)
+
+    @callback
+    def async_resync(self, kinds: Collection[str]) -> None:
+        """Query the states of the given kinds of devices again."""
+        if not self._controller.connected:
+            return
+        if self._resync_task and not self._resync_task.done():
+            # Replacing a running resync, which may be a full one
+            self._async_schedule_resync()
+            return
+        self._async_schedule_resync(
+            {command for kind in kinds for command in RESYNC_COMMANDS[kind]}
+        )
+
+    @callback
+    def _async_schedule_resync(self, only: Collection[int] | None = None) -> None:
+        if self._resync_task and not self._resync_task.done():
+            self._resync_task.cancel()
+        self._resync_task = self._hass.async_create_background_task(
+            self._async_resync(only), "satel_integra resync"
+        )
+
+    async def _async_resync(self, only: Collection[int] | None) -> None:
+        """Query every state the controller monitors, or only some of them."""
+        controller = self._controller
+        queries = sorted(
+            command
+            for command in message_handlers(controller)
+            if command[0] < STATE_QUERY_LIMIT and (only is None or command[0] in only)
+        )
+        _LOGGER.debug("Resynchronizing %s states", len(queries))
+        try:
+            for command in queries:
+                await self._commands.async_submit(
+                    PRIORITY_TELEMETRY, async_send_frame, controller, encode_frame(command)
+                )
+        except HomeAssistantError as err:
+            _LOGGER.warning("State resynchronization incomplete: %s", err)
@@ -1,44 +1,56 @@
 """Support for Satel Integra modifiable outputs represented as switches."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from .entity import SatelIntegraEntity
+from .batcher import KIND_BYPASS, KIND_OUTPUTS
 from . import (
-    CONF_DEVICE_CODE,
     CONF_SWITCHABLE_OUTPUTS,
     CONF_SWITCHABLE_BYPASS,
     CONF_ZONE_NAME,
     CONF_ZONES,
-    DATA_SATEL,
+    CONF_PANEL_ID,
+    CONF_OPTIMISTIC,
+    DATA_PANELS,
+    EVENT_SWITCH_ROLLBACK,
     SIGNAL_OUTPUTS_UPDATED,
     SIGNAL_BYPASS_UPDATED
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds the panel has to report an optimistic state once the command is
+# sent, before it is rolled back
+CONFIRM_TIMEOUT = 5
+
+ROLLBACK_FAILED = "failed"
+ROLLBACK_TIMEOUT = "timeout"
+
 DEPENDENCIES = ["satel_integra"]
 
 
-async def async_setup_platform(
+async def async_setup_entry(
     hass: HomeAssistant,
-    config: ConfigType,
+    entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
-    discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
     """Set up the Satel Integra switch devices."""
-    if not discovery_info:
-        return
+    panel = hass.data[DATA_PANELS][entry.data[CONF_PANEL_ID]]
+    panel.async_add_platform(Platform.SWITCH, _build_entities, async_add_entities)
+
 
-    configured_output = discovery_info[CONF_SWITCHABLE_OUTPUTS]
-    configured_zones = discovery_info[CONF_ZONES]
-    controller = hass.data[DATA_SATEL]
+def _build_entities(panel, conf):
+    """Build the output and bypass switches."""
+    configured_output = conf[CONF_SWITCHABLE_OUTPUTS]
+    configured_zones = conf[CONF_ZONES]
 
     devices = []
 
@@ -46,7 +58,7 @@ async def async_setup_platform(
         zone_name = device_config_data[CONF_ZONE_NAME]
 
         device = SatelIntegraSwitch(
-            controller, zone_num, zone_name, discovery_info[CONF_DEVICE_CODE],CONF_SWITCHABLE_OUTPUTS,SIGNAL_OUTPUTS_UPDATED
+            panel, zone_num, zone_name, panel.code,CONF_SWITCHABLE_OUTPUTS,SIGNAL_OUTPUTS_UPDATED
         )
 
         devices.append(device)
@@ -55,13 +67,11 @@ async def async_setup_platform(
         output_name = device_config_data[CONF_ZONE_NAME] + ' (bypass)' 
 
         device = SatelIntegraSwitch(
-            controller, output_num, output_name, discovery_info[CONF_DEVICE_CODE], CONF_SWITCHABLE_BYPASS, SIGNAL_BYPASS_UPDATED
+            panel, output_num, output_name, panel.code, CONF_SWITCHABLE_BYPASS, SIGNAL_BYPASS_UPDATED
         )
         devices.append(device)
 
-
-
-    async_add_entities(devices)
+    return devices
 
 
 class SatelIntegraSwitch(SatelIntegraEntity, SwitchEntity):
@@ -69,93 +79,164 @@ class SatelIntegraSwitch(SatelIntegraEntity, SwitchEntity):
 
     _attr_should_poll = False
 
-    def __init__(self, controller, device_number, device_name, code, device_type, react_to_signal):
+    def __init__(self, panel, device_number, device_name, code, device_type, react_to_signal):
         """Initialize the binary_sensor."""
-        super().__init__(controller, device_number, device_name, device_type) # should be "switch")
+        super().__init__(panel, device_number, device_name, device_type) # should be "switch")
         self._state = False
         self._code = code
-        
+        self._kind = KIND_OUTPUTS if react_to_signal == SIGNAL_OUTPUTS_UPDATED else KIND_BYPASS
+        # Optimistic state waiting for the panel to report it
+        self._pending: bool | None = None
+        self._pending_timeout: asyncio.TimerHandle | None = None
+
         self._device_type = device_type
         self._react_to_signal = react_to_signal
+        # Bypass switches are created disabled, like the secondary zone states
+        self._attr_entity_registry_enabled_default = (
+            react_to_signal != SIGNAL_BYPASS_UPDATED
+        )
 
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
+        await super().async_added_to_hass()
+        router = self._panel.router
         if self._react_to_signal == SIGNAL_OUTPUTS_UPDATED:
             self.async_on_remove(
-                async_dispatcher_connect(
-                    self.hass, SIGNAL_OUTPUTS_UPDATED, self._devices_updated
+                router.async_subscribe(
+                    SIGNAL_OUTPUTS_UPDATED, self._device_number, self._devices_updated
                 )
             )
 
         if self._react_to_signal == SIGNAL_BYPASS_UPDATED:
             self.async_on_remove(
-                async_dispatcher_connect(
-                    self.hass, SIGNAL_BYPASS_UPDATED, self._devices_updated_bypass
+                router.async_subscribe(
+                    SIGNAL_BYPASS_UPDATED, self._device_number, self._devices_updated_bypass
                 )
             )
 
-        initial_state = self._read_state()
-        if initial_state is not None:
-            self._state = initial_state
-            self.async_write_ha_state()
+        self._state = self._read_state()
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop a pending confirmation."""
+        self._clear_pending()
 
     @callback
-    def _devices_updated(self, zones):
+    def _devices_updated(self, state):
         """Update switch state, if needed."""
-        new_state = bool(zones.get(self._device_number, 0))
-        if new_state != self._state:
-            self._state = new_state
-            self.async_write_ha_state()
+        new_state = bool(state)
         _LOGGER.debug(
-            "SWITCH UPDATE STATUS name: %s, number:%s, old_state:%s, new_state:%s zones: %s",
-            self._name, self._device_number, self._state, new_state, zones
+            "SWITCH UPDATE STATUS name: %s, number:%s, old_state:%s, new_state:%s",
+            self._name, self._device_number, self._state, new_state
         )
+        self._reported(new_state)
 
     @callback
-    def _devices_updated_bypass(self, zones):
+    def _devices_updated_bypass(self, state):
         """Update switch state, if needed."""
-        new_state = bool(zones.get(self._device_number, 0))
+        new_state = bool(state)
+        _LOGGER.debug(
+            "BYPASS SWITCH UPDATE STATUS name: %s, number:%s, old_state:%s, new_state:%s",
+            self._name, self._device_number, self._state, new_state
+        )
+        self._reported(new_state)
+
+    @callback
+    def _reported(self, new_state):
+        """Apply a state reported by the panel, confirming a pending one.
+
+        Only changed bits are reported, so while a state is pending the
+        report is the pending state; if the panel does not change the bit
+        the confirmation times out.
+        """
+        if new_state == self._pending:
+            self._clear_pending()
         if new_state != self._state:
             self._state = new_state
             self.async_write_ha_state()
-        _LOGGER.debug(
-            "BYPASS SWITCH UPDATE STATUS name: %s, number:%s, old_state:%s, new_state:%s zones: %s",
-            self._name, self._device_number, self._state, new_state, zones
-        )
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the device on."""
-        if self._react_to_signal == SIGNAL_OUTPUTS_UPDATED:
-            _LOGGER.debug(
-                "COMMAND SWITCH ON %s: name: %s  number %s: type:%s status: %s, turning ON",
-                self._react_to_signal, self._name, self._device_number, self._device_type, self._state
-            )
-            await self._satel.set_output(self._code, self._device_number, True)
-            self.async_write_ha_state()
-        if self._react_to_signal == SIGNAL_BYPASS_UPDATED:
-            _LOGGER.debug(
-                "COMMAND ZONE BYPASS %s: name: %s  number %s: type:%s status: %s, turning ON",
-                self._react_to_signal, self._name, self._device_number, self._device_type, self._state
-            )
-            await self._satel.set_bypass(self._code, self._device_number, True)
-            self.async_write_ha_state()
+        await self._async_set(True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the device off."""
-        if self._react_to_signal == SIGNAL_OUTPUTS_UPDATED:
-            _LOGGER.debug(
-                "COMMAND SWITCH OFF %s: name: %s  number %s: type:%s status: %s, turning OFF",
-                self._react_to_signal, self._name, self._device_number, self._device_type, self._state
-            )
-            await self._satel.set_output(self._code, self._device_number, False)
+        await self._async_set(False)
+
+    async def _async_set(self, state):
+        """Send the new state, shown at once in optimistic mode."""
+        _LOGGER.debug(
+            "COMMAND %s %s: name: %s  number %s: type:%s status: %s, turning %s",
+            self._kind, self._react_to_signal, self._name, self._device_number,
+            self._device_type, self._state, "ON" if state else "OFF"
+        )
+        optimistic = self._panel.conf[CONF_OPTIMISTIC]
+        if optimistic:
+            self._clear_pending()
+            self._pending = state
+            self._state = state
             self.async_write_ha_state()
-        if self._react_to_signal == SIGNAL_BYPASS_UPDATED:
-            _LOGGER.debug(
-                "COMMAND ZONE UN-BYPASS %s: name: %s  number %s: type:%s status: %s, turning OFF",
-                self._react_to_signal, self._name, self._device_number, self._device_type, self._state
+
+        try:
+            await self._panel.batcher.async_set(
+                self._kind, self._code, self._device_number, state
             )
-            await self._satel.set_bypass(self._code, self._device_number, False)
+        except (Exception, asyncio.CancelledError):
+            if optimistic and self._pending == state:
+                self._rollback(ROLLBACK_FAILED, self._read_state())
+            raise
+
+        if not optimistic:
             self.async_write_ha_state()
+        elif self._pending == state:
+            # Timed from the send, the command may wait in the queue longer
+            # than CONFIRM_TIMEOUT
+            if self._pending_timeout:
+                self._pending_timeout.cancel()
+            self._pending_timeout = self.hass.loop.call_later(
+                CONFIRM_TIMEOUT, self._confirm_timeout
+            )
+
+    @callback
+    def _confirm_timeout(self):
+        """Roll back a state the panel did not report in time."""
+        self._pending_timeout = None
+        reported = self._read_state()
+        if reported == self._pending:
+            self._clear_pending()
+        else:
+            self._rollback(ROLLBACK_TIMEOUT, reported)
+
+    @callback
+    def _rollback(self, reason, reported):
+        """Show the state the panel reports instead of the optimistic one."""
+        requested = self._pending
+        self._clear_pending()
+        _LOGGER.warning(
+            "%s was not set to %s by the panel (%s), rolled back",
+            self._name, "on" if requested else "off", reason
+        )
+        self.hass.bus.async_fire(
+            EVENT_SWITCH_ROLLBACK,
+            {
+                "entity_id": self.entity_id,
+                "panel": self._panel.panel_id,
+                "kind": self._kind,
+                "number": self._device_number,
+                "requested": requested,
+                "reported": reported,
+                "reason": reason,
+            },
+        )
+        self._state = reported
+        self.async_write_ha_state()
+
+    @callback
+    def _clear_pending(self):
+        if self._pending_timeout:
+            self._pending_timeout.cancel()
+            self._pending_timeout = None
+        self._pending = None
 
     @property
     def is_on(self):
@@ -164,14 +245,6 @@ class SatelIntegraSwitch(SatelIntegraEntity, SwitchEntity):
 
     def _read_state(self):
         """Read state of the device."""
-        if self._react_to_signal == SIGNAL_OUTPUTS_UPDATED:
-            outputs = getattr(self._satel, "violated_outputs", None)
-            if outputs is None:
-                return None
-            return self._device_number in outputs
-        if self._react_to_signal == SIGNAL_BYPASS_UPDATED:
-            bypass = getattr(self._satel, "bypass_zones", None)
-            if bypass is None:
-                return None
-            return self._device_number in bypass
-        return None
+        return self._panel.store.is_set(
+            self._react_to_signal, self._device_number
+        )
@@ -0,0 +1,56 @@
+"""Observation of the raw frames exchanged with the panel."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .adapter import wrap_frame_io
+
+_LOGGER = logging.getLogger(__name__)
+
+DIRECTION_RX = 0
+DIRECTION_TX = 1
+
+
+class SatelFrameTap:
+    """Hand every frame read from or sent to the panel to listeners.
+
+    Received frames are passed as decoded by AsyncSatel, sent frames as
+    passed to the socket before encryption. The controller is wrapped
+    once; listeners come and go without touching it again.
+    """
+
+    def __init__(self, controller) -> None:
+        """Wrap the frame I/O of the controller."""
+        self._listeners: list[Callable[[int, bytes], None]] = []
+
+        def _read(data: bytes) -> None:
+            if self._listeners:
+                self._notify(DIRECTION_RX, data)
+
+        def _send(data: bytes) -> None:
+            if self._listeners:
+                self._notify(DIRECTION_TX, data)
+
+        wrap_frame_io(controller, _read, _send)
+
+    @callback
+    def async_add_listener(self, listener: Callable[[int, bytes], None]) -> CALLBACK_TYPE:
+        """Listen for frames, listener gets direction and frame."""
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def _notify(self, direction: int, frame: bytes) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(direction, frame)
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Error in frame listener")
@@ -0,0 +1,189 @@
+"""Batched, adaptive polling of Satel Integra temperature sensors."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import contextlib
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+import logging
+from statistics import pstdev
+import time
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .commands import PRIORITY_TELEMETRY, SatelCommandQueue
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bounds of the per-sensor poll interval, in seconds
+MIN_POLL_INTERVAL = 30.0
+MAX_POLL_INTERVAL = 600.0
+# Minimum pause between two reads, keeps the bus free for zone monitoring
+READ_SPACING = 1.0
+# Number of recent readings used to estimate how fast a sensor changes
+HISTORY_LENGTH = 5
+# Standard deviation (degC) of recent readings for fast changing/stable rooms
+FAST_CHANGE_STDEV = 0.5
+STABLE_STDEV = 0.1
+
+
+@dataclass(slots=True)
+class _SensorSchedule:
+    """Poll schedule of a single temperature sensor."""
+
+    interval: float
+    next_due: float = 0.0
+    failures: int = 0
+    history: deque[float] = field(
+        default_factory=lambda: deque(maxlen=HISTORY_LENGTH)
+    )
+
+
+class SatelTemperatureCoordinator:
+    """Own all temperature reads over the shared panel connection.
+
+    Every sensor has its own poll interval picked from the variance of its
+    recent readings: stable rooms back off up to MAX_POLL_INTERVAL, fast
+    changing ones tighten down to MIN_POLL_INTERVAL. Sensors timing out
+    back off exponentially. Due sensors are read one at a time and are
+    notified once per batch.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        controller,
+        commands: SatelCommandQueue,
+        sensors: list[int],
+        interval: timedelta,
+        read_timeout: float,
+    ) -> None:
+        """Initialize the coordinator."""
+        self._hass = hass
+        self._satel = controller
+        self._commands = commands
+        self._default_interval = interval.total_seconds()
+        self._read_timeout = read_timeout
+        self._listeners: list[Callable[[], None]] = []
+        self._schedules = {
+            sensor: _SensorSchedule(self._default_interval) for sensor in sensors
+        }
+        self.data: dict[int, float | None] = dict.fromkeys(sensors)
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for completed batches of reads."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_start(self) -> None:
+        """Start polling in the background."""
+        if self._schedules and (self._task is None or self._task.done()):
+            self._task = self._hass.async_create_background_task(
+                self._async_poll(), "satel_integra temperature polling"
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def async_set_sensors(self, sensors: list[int]) -> None:
+        """Poll the given sensors, new ones are read right away."""
+        for sensor in set(self._schedules) - set(sensors):
+            del self._schedules[sensor]
+            del self.data[sensor]
+        for sensor in sensors:
+            if sensor not in self._schedules:
+                self._schedules[sensor] = _SensorSchedule(self._default_interval)
+                self.data[sensor] = None
+        # The poll loop may sleep until a removed sensor is due
+        self._wake.set()
+        self.async_start()
+
+    def poll_intervals(self) -> dict[int, float]:
+        """Return the current poll interval of every sensor."""
+        return {sensor: schedule.interval for sensor, schedule in self._schedules.items()}
+
+    async def _async_poll(self) -> None:
+        """Read the sensors that are due, then sleep until the next one is."""
+        while self._schedules and not self._satel.closed:
+            now = time.monotonic()
+            due = sorted(
+                (schedule.next_due, sensor)
+                for sensor, schedule in self._schedules.items()
+                if schedule.next_due <= now
+            )
+            if not due:
+                next_due = min(s.next_due for s in self._schedules.values())
+                self._wake.clear()
+                with contextlib.suppress(TimeoutError):
+                    async with asyncio.timeout(next_due - now):
+                        await self._wake.wait()
+                continue
+
+            for index, (_, sensor) in enumerate(due):
+                if index:
+                    await asyncio.sleep(READ_SPACING)
+                await self._async_read(sensor)
+
+            for update_callback in list(self._listeners):
+                update_callback()
+
+    async def _async_read(self, sensor: int) -> None:
+        """Read a single sensor and reschedule it."""
+        if (schedule := self._schedules.get(sensor)) is None:
+            return
+        try:
+            async with asyncio.timeout(self._read_timeout):
+                value = await self._commands.async_submit(
+                    PRIORITY_TELEMETRY, self._satel.read_temp_and_wait, sensor
+                )
+        except (TimeoutError, HomeAssistantError):
+            schedule.failures += 1
+            schedule.interval = min(
+                self._default_interval * 2 ** schedule.failures, MAX_POLL_INTERVAL
+            )
+            if schedule.failures == 1:
+                _LOGGER.warning("Timeout error while reading temperature %s", sensor)
+            else:
+                _LOGGER.debug(
+                    "Timeout %s while reading temperature %s, next try in %ss",
+                    schedule.failures, sensor, schedule.interval,
+                )
+        else:
+            if sensor not in self._schedules:
+                return
+            if schedule.failures:
+                _LOGGER.info("Temperature %s readable again", sensor)
+            schedule.failures = 0
+            self.data[sensor] = value
+            if value is not None:
+                schedule.history.append(value)
+            schedule.interval = self._adapt_interval(schedule)
+        schedule.next_due = time.monotonic() + schedule.interval
+
+    def _adapt_interval(self, schedule: _SensorSchedule) -> float:
+        """Pick the next poll interval from the variance of recent readings."""
+        if len(schedule.history) < 2:
+            return self._default_interval
+        stdev = pstdev(schedule.history)
+        if stdev >= FAST_CHANGE_STDEV:
+            return MIN_POLL_INTERVAL
+        if stdev <= STABLE_STDEV and len(schedule.history) == HISTORY_LENGTH:
+            return min(schedule.interval * 2, MAX_POLL_INTERVAL)
+        return min(schedule.interval * 2, self._default_interval)
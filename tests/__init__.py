@@ -0,0 +1 @@
+"""Tests for the Satel Integra integration."""
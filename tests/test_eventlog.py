@@ -0,0 +1,37 @@
+"""Tests of the event log answer decoding."""
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from custom_components.satel_integra.eventlog import parse_event
+
+NOW = datetime(2026, 10, 18, 15, 0, tzinfo=UTC)
+
+# Answer to reading the newest event (index FFFFFF), without the command:
+# 2026-10-18 14:35, class 1, code 13 in partition 1 from keypad 1, source
+# 5, object 0 user 2; event index 000456, index read FFFFFF
+NEWEST = bytes.fromhex("a032a36b000d000502" "000456" "ffffff")
+
+
+def test_parse_newest() -> None:
+    """The event index comes from the answer, not from the index read."""
+    event = parse_event(NEWEST, NOW)
+    assert event is not None
+    assert event.index == 0x000456
+    assert event.time == "2026-10-18T14:35:00+00:00"
+    assert (event.event_class, event.code, event.restore) == (1, 13, False)
+    assert (event.partition, event.keypad, event.source) == (1, 1, 5)
+    assert (event.object, event.user) == (0, 2)
+    assert event.raw == NEWEST.hex()
+
+
+def test_parse_year_before() -> None:
+    """A date after now is in the previous four year cycle."""
+    event = parse_event(NEWEST, datetime(2026, 10, 18, 14, 0, tzinfo=UTC))
+    assert event is not None
+    assert event.time == "2022-10-18T14:35:00+00:00"
+
+
+def test_parse_empty() -> None:
+    """An answer without the event present flag holds no event."""
+    assert parse_event(bytes(9) + bytes.fromhex("000000ffffff"), NOW) is None
@@ -0,0 +1,54 @@
+"""Tests of the bit layout against the offsets of the original entities."""
+from __future__ import annotations
+
+from custom_components.satel_integra.const import (
+    CONF_EXPANDER,
+    CONF_EXPANDER_BATTERY,
+    CONF_KEYPAD,
+    CONF_OUTPUTS,
+    CONF_TROUBLE,
+    CONF_ZONE_NAME,
+    CONF_ZONE_TYPE,
+    CONF_ZONES,
+    SIGNAL_TROUBLE2_UPDATED,
+    SIGNAL_TROUBLE_UPDATED,
+)
+from custom_components.satel_integra.layout import build_bits
+
+CONF = {
+    CONF_ZONES: {},
+    CONF_OUTPUTS: {},
+    CONF_EXPANDER: {
+        2: {CONF_ZONE_NAME: "Exp", CONF_ZONE_TYPE: "problem", CONF_EXPANDER_BATTERY: "yes"},
+        70: {CONF_ZONE_NAME: "Far", CONF_ZONE_TYPE: "problem", CONF_EXPANDER_BATTERY: "yes"},
+    },
+    CONF_TROUBLE: {5: {CONF_ZONE_NAME: "Fuse", CONF_ZONE_TYPE: "problem"}},
+    CONF_KEYPAD: {1: {CONF_ZONE_NAME: "Hall", CONF_ZONE_TYPE: "problem"}},
+}
+
+# Bits the entities used before the layout table, written out as they were:
+# device number plus the offset of every block
+EXPECTED = [
+    (SIGNAL_TROUBLE2_UPDATED, 2 + 1, "Exp (no comm)"),
+    (SIGNAL_TROUBLE2_UPDATED, 2 + 1 + 64, "Exp (changed)"),
+    (SIGNAL_TROUBLE2_UPDATED, 2 + 1 + 64 + 64 + 8 + 8 + 8, "Exp (tamper)"),
+    (SIGNAL_TROUBLE_UPDATED, 2 + 128 + 1, "Exp (AC KO)"),
+    (SIGNAL_TROUBLE_UPDATED, 2 + 128 + 64 + 1, "Exp (battery KO)"),
+    (SIGNAL_TROUBLE_UPDATED, 2 + 128 + 64 + 64 + 1, "Exp (battery NOT connected)"),
+    # Expanders from address 64 on report no power troubles
+    (SIGNAL_TROUBLE2_UPDATED, 70 + 1, "Far (no comm)"),
+    (SIGNAL_TROUBLE2_UPDATED, 70 + 1 + 64, "Far (changed)"),
+    (SIGNAL_TROUBLE2_UPDATED, 70 + 1 + 64 + 64 + 8 + 8 + 8, "Far (tamper)"),
+    (SIGNAL_TROUBLE_UPDATED, 5 + 320, "Fuse"),
+    (SIGNAL_TROUBLE2_UPDATED, 1 + 1 + 64 + 64, "Hall (no comm)"),
+    (SIGNAL_TROUBLE2_UPDATED, 1 + 1 + 64 + 64 + 8, "Hall (changed)"),
+    (SIGNAL_TROUBLE2_UPDATED, 1 + 1 + 64 + 64 + 8 + 8 + 64, "Hall (tamper)"),
+    (SIGNAL_TROUBLE2_UPDATED, 1 + 1 + 64 + 64 + 8 + 8 + 64 + 8, "Hall (init ko)"),
+]
+
+
+def test_trouble_bits() -> None:
+    """Expander, keypad and trouble bits keep their original numbers."""
+    bits = build_bits(CONF)
+    assert [(bit.spec.signal, bit.number, bit.name) for bit in bits] == EXPECTED
+    assert {bit.device_class for bit in bits} == {"problem"}
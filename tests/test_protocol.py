@@ -0,0 +1,66 @@
+"""Tests of the frame encoding."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.satel_integra.protocol import (
+    FRAME_FOOTER,
+    FRAME_HEADER,
+    bitmask_bytes,
+    code_bytes,
+    decode_frame,
+    encode_frame,
+    masked_command,
+)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"\x7e",
+        # 0xFE in the data
+        b"\x00\xfe\x00\x00\x01",
+        b"\x17" + b"\xfe" * 32,
+        b"\xfe\xf0\xfe\x0d",
+        # 0xFE in the checksum, 0x61FE
+        b"\x7e\x00\xb9",
+    ],
+)
+def test_round_trip(data: bytes) -> None:
+    """Frames decode to the data they were built from."""
+    frame = encode_frame(data)
+    assert frame.startswith(FRAME_HEADER)
+    assert frame.endswith(FRAME_FOOTER)
+    # Only the header and footer hold an unescaped 0xFE
+    assert b"\xfe" not in frame[2:-2].replace(b"\xfe\xf0", b"")
+    assert decode_frame(frame) == data
+
+
+def test_escaped_checksum() -> None:
+    """A 0xFE checksum byte is escaped like the data."""
+    assert encode_frame(b"\x7e\x00\xb9") == bytes.fromhex("fefe7e00b961fef0fe0d")
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [
+        bytes.fromhex("fefe7e00b961fef0"),
+        bytes.fromhex("fefe7e00b961fefe0d"),
+        bytes.fromhex("fefe7e00b961fff0fe0d"),
+        bytes.fromhex("fefe00fe0d"),
+    ],
+)
+def test_decode_invalid(frame: bytes) -> None:
+    """Truncated frames, unescaped 0xFE and wrong checksums are rejected."""
+    with pytest.raises(ValueError):
+        decode_frame(frame)
+
+
+def test_masked_command_escapes_bitmask() -> None:
+    """A bitmask byte of 0xFE is escaped in the frame sent."""
+    numbers = range(2, 9)
+    data = b"\x88" + code_bytes("1234") + bitmask_bytes(numbers)
+    assert b"\xfe" in data
+    frame = masked_command(0x88, "1234", numbers)
+    assert b"\xfe" not in frame[2:-2].replace(b"\xfe\xf0", b"")
+    assert decode_frame(frame) == data
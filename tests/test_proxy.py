@@ -0,0 +1,148 @@
+"""Tests of the local proxy against the panel simulator."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+
+from satel_integra2.satel_integra import AsyncSatel
+
+from custom_components.satel_integra.adapter import async_send_frame
+from custom_components.satel_integra.commands import SatelCommandQueue
+from custom_components.satel_integra.const import DEFAULT_PROXY_HOST
+from custom_components.satel_integra.protocol import (
+    FRAME_FOOTER,
+    bitmask_bytes,
+    code_bytes,
+    decode_frame,
+    encode_frame,
+)
+from custom_components.satel_integra.proxy import SatelLocalProxy
+from custom_components.satel_integra.tap import SatelFrameTap
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "tools"))
+from panel_simulator import (  # noqa: E402
+    CMD_OUTPUTS,
+    CMD_ZONES_VIOLATED,
+    PanelSimulator,
+)
+
+CODE = "1234"
+# Commands monitored by the integration in the tests
+MONITORED = (CMD_ZONES_VIOLATED, CMD_OUTPUTS)
+
+Request = Callable[[bytes], Awaitable[bytes]]
+
+
+@asynccontextmanager
+async def _proxy(
+    simulator: PanelSimulator,
+) -> AsyncIterator[tuple[SatelLocalProxy, asyncio.StreamReader, Request]]:
+    """Connect the integration to the simulator, and a client to its proxy."""
+    loop = asyncio.get_running_loop()
+    hass = SimpleNamespace(
+        loop=loop, async_create_background_task=lambda coro, name: loop.create_task(coro)
+    )
+    controller = AsyncSatel("127.0.0.1", await simulator.start(), loop)
+    assert await controller.connect()
+    tap = SatelFrameTap(controller)
+    commands = SatelCommandQueue(hass, 10)
+    commands.async_start()
+    supervisor = SimpleNamespace(async_add_monitoring_listener=lambda listener: lambda: None)
+
+    async def _update() -> None:
+        while controller.connected:
+            await controller._update_status()  # noqa: SLF001
+
+    updates = loop.create_task(_update())
+    mask = sum(1 << command for command in MONITORED).to_bytes(12, "little")
+    await async_send_frame(controller, encode_frame(b"\x7f" + mask))
+
+    proxy = SatelLocalProxy(hass, controller, tap, commands, supervisor, "test")
+    await proxy.async_start(DEFAULT_PROXY_HOST, 0)
+    port = proxy._server.sockets[0].getsockname()[1]  # noqa: SLF001
+    reader, writer = await asyncio.open_connection(DEFAULT_PROXY_HOST, port)
+
+    async def request(data: bytes) -> bytes:
+        writer.write(encode_frame(data))
+        return await _read(reader)
+
+    try:
+        # Wait for the states pushed after monitoring started
+        while len(proxy._states) < len(MONITORED):  # noqa: SLF001
+            await asyncio.sleep(0.01)
+        yield proxy, reader, request
+    finally:
+        writer.close()
+        await proxy.async_stop()
+        commands.async_stop()
+        controller.close()
+        updates.cancel()
+        await simulator.stop()
+
+
+async def _read(reader: asyncio.StreamReader) -> bytes:
+    async with asyncio.timeout(2):
+        return decode_frame(await reader.readuntil(FRAME_FOOTER))
+
+
+def test_listens_on_localhost() -> None:
+    """The proxy is only reachable from the host by default."""
+
+    async def scenario() -> None:
+        async with _proxy(PanelSimulator()) as (proxy, _reader, _request):
+            host = proxy._server.sockets[0].getsockname()[0]  # noqa: SLF001
+            assert host == "127.0.0.1"
+
+    asyncio.run(scenario())
+
+
+def test_state_query_answered_from_cache() -> None:
+    """State queries are answered with the states monitored from the panel."""
+    simulator = PanelSimulator()
+    simulator.set_state(CMD_ZONES_VIOLATED, 3, True)
+
+    async def scenario() -> None:
+        async with _proxy(simulator) as (proxy, _reader, request):
+            sent = simulator.frames_sent
+            answer = await request(bytes((CMD_ZONES_VIOLATED,)))
+            assert answer == bytes((CMD_ZONES_VIOLATED, 0x04)) + bytes(15)
+            assert simulator.frames_sent == sent
+            assert proxy.metrics()["cached"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_monitoring_pushes_changes() -> None:
+    """A monitoring client gets the changed states of its commands."""
+    simulator = PanelSimulator()
+
+    async def scenario() -> None:
+        async with _proxy(simulator) as (_unused, reader, request):
+            mask = (1 << CMD_OUTPUTS).to_bytes(4, "little")
+            assert await request(b"\x7f" + mask) == b"\xef\xff"
+            assert (await _read(reader))[0] == CMD_OUTPUTS
+            simulator.set_state(CMD_OUTPUTS, 9, True)
+            assert await _read(reader) == bytes((CMD_OUTPUTS, 0, 0x01)) + bytes(30)
+
+    asyncio.run(scenario())
+
+
+def test_control_command_forwarded() -> None:
+    """Control commands reach the panel and return its result."""
+    simulator = PanelSimulator()
+
+    async def scenario() -> None:
+        async with _proxy(simulator) as (proxy, _reader, request):
+            outputs = bitmask_bytes([2])
+            answer = await request(b"\x88" + code_bytes(CODE) + outputs)
+            assert answer == b"\xef\xff"
+            assert simulator.states[CMD_OUTPUTS] == {2}
+            answer = await request(b"\x88" + code_bytes("9999") + outputs)
+            assert answer == b"\xef\x01"
+            assert proxy.metrics()["forwarded"] == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,133 @@
+"""Load and latency benchmark of the integration against the panel simulator.
+
+Sets up the satel_integra component in a bare Home Assistant instance,
+connected to the simulator, runs a zone change storm and reports the
+latency from a frame being sent to the binary sensor state being written,
+CPU time per frame and memory, for every zone count, e.g.:
+
+    python tools/benchmark.py --zones 32 128 256 --rate 200 --duration 30
+
+Needs a Home Assistant development environment (homeassistant package).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+from pathlib import Path
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from homeassistant import bootstrap, config_entries, loader
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.setup import async_setup_component
+
+from panel_simulator import CMD_ZONES_VIOLATED, PanelSimulator
+
+DOMAIN = "satel_integra"
+REPOSITORY = Path(__file__).resolve().parent.parent
+
+
+async def _async_start_hass(config_dir: str) -> HomeAssistant:
+    """Start a bare Home Assistant instance loading this repository."""
+    os.symlink(REPOSITORY / "custom_components", Path(config_dir) / "custom_components")
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    await hass.config_entries.async_initialize()
+    await hass.async_start()
+    return hass
+
+
+async def async_run_benchmark(zones: int, rate: float, duration: float) -> dict:
+    """Run one storm against a panel with given number of zones."""
+    simulator = PanelSimulator(zones=zones)
+    port = await simulator.start()
+    latencies: list[float] = []
+
+    @callback
+    def _state_changed(event: Event) -> None:
+        entity_id = event.data["entity_id"]
+        prefix, _, number = entity_id.rpartition("_")
+        if prefix != "binary_sensor.zone" or not number.isdigit():
+            return
+        changed_at = simulator.changed_at.get((CMD_ZONES_VIOLATED, int(number)))
+        if changed_at is not None:
+            latencies.append(time.perf_counter() - changed_at)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        tracemalloc.start()
+        hass = await _async_start_hass(config_dir)
+        await async_setup_component(
+            hass,
+            DOMAIN,
+            {
+                DOMAIN: {
+                    "host": "127.0.0.1",
+                    "port": port,
+                    "zones": {zone: {"name": f"Zone {zone}"} for zone in range(1, zones + 1)},
+                }
+            },
+        )
+        await hass.async_block_till_done()
+        # Let the monitoring start and the initial picture settle
+        await asyncio.sleep(2)
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _state_changed)
+        setup_memory, _ = tracemalloc.get_traced_memory()
+
+        frames_before = simulator.frames_sent
+        cpu_before = time.process_time()
+        changes = await simulator.run_storm(rate, duration)
+        await asyncio.sleep(1)
+        cpu = time.process_time() - cpu_before
+        frames = simulator.frames_sent - frames_before
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        await hass.async_stop()
+    await simulator.stop()
+
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+    return {
+        "zones": zones,
+        "changes": changes,
+        "frames": frames,
+        "state_writes": len(latencies),
+        "p50_ms": percentiles[49] * 1000,
+        "p95_ms": percentiles[94] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+        "max_ms": max(latencies, default=0) * 1000,
+        "cpu_per_frame_us": cpu / frames * 1e6 if frames else 0,
+        "setup_memory_kib": setup_memory / 1024,
+        "peak_memory_kib": peak_memory / 1024,
+    }
+
+
+async def _main(args: argparse.Namespace) -> None:
+    results = [
+        await async_run_benchmark(zones, args.rate, args.duration) for zones in args.zones
+    ]
+    columns = list(results[0])
+    print(" ".join(f"{column:>16}" for column in columns))
+    for result in results:
+        print(
+            " ".join(
+                f"{value:>16.2f}" if isinstance(value, float) else f"{value:>16}"
+                for value in result.values()
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--zones", type=int, nargs="+", default=[32, 128, 256])
+    parser.add_argument("--rate", type=float, default=100, help="zone changes per second")
+    parser.add_argument("--duration", type=float, default=20, help="storm length in seconds")
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,473 @@
+"""Offline ETHM-1 Plus simulator speaking the Satel integration protocol.
+
+Serves the frames used by AsyncSatel: monitoring (0x7F), zone, output,
+partition and trouble state queries, arm/disarm/clear alarm, bypass,
+outputs, temperature reads and device names. Encrypted communication is
+supported when an integration key is given.
+
+Zone change storms can be generated at a fixed rate, either random or
+from a script, e.g.:
+
+    python tools/panel_simulator.py --zones 256 --rate 200
+
+Frames recorded with the satel_integra.start_capture service can be
+played back to the connected clients:
+
+    python tools/panel_simulator.py --replay satel_capture.bin --speed 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Iterable
+import json
+import logging
+import os
+import random
+import struct
+import time
+
+from satel_integra2.encryption import SatelEncryption
+
+_LOGGER = logging.getLogger("panel_simulator")
+
+END_SEQUENCE = b"\xFE\x0D"
+
+# Zone state commands
+CMD_ZONES_VIOLATED = 0x00
+CMD_ZONES_TAMPER = 0x01
+CMD_ZONES_ALARM = 0x02
+CMD_ZONES_TAMPER_ALARM = 0x03
+CMD_ZONES_ALARM_MEMORY = 0x04
+CMD_ZONES_TAMPER_ALARM_MEMORY = 0x05
+CMD_ZONES_BYPASS = 0x06
+CMD_ZONES_MASKED = 0x28
+CMD_ZONES_MASKED_MEMORY = 0x29
+# Partition state commands
+CMD_ARMED_SUPPRESSED = 0x09
+CMD_ARMED_MODE0 = 0x0A
+CMD_ARMED_MODE2 = 0x0B
+CMD_ARMED_MODE3 = 0x0C
+CMD_ENTRY_TIME = 0x0E
+CMD_EXIT_OVER_10 = 0x0F
+CMD_EXIT_UNDER_10 = 0x10
+CMD_PARTITIONS_ALARM = 0x13
+CMD_PARTITIONS_FIRE_ALARM = 0x14
+CMD_ARMED_MODE1 = 0x2A
+# Other states
+CMD_OUTPUTS = 0x17
+CMD_TROUBLE = 0x1B
+CMD_TROUBLE2 = 0x1C
+# Requests
+CMD_READ_TEMPERATURE = 0x7D
+CMD_START_MONITORING = 0x7F
+CMD_ARM_MODE0 = 0x80
+CMD_DISARM = 0x84
+CMD_CLEAR_ALARM = 0x85
+CMD_BYPASS = 0x86
+CMD_UNBYPASS = 0x87
+CMD_OUTPUTS_ON = 0x88
+CMD_OUTPUTS_OFF = 0x89
+CMD_DEVICE_NAME = 0xEE
+CMD_RESULT = 0xEF
+
+# Payload length of every state command
+STATE_LENGTHS = {
+    CMD_ZONES_VIOLATED: 32,
+    CMD_ZONES_TAMPER: 32,
+    CMD_ZONES_ALARM: 32,
+    CMD_ZONES_TAMPER_ALARM: 32,
+    CMD_ZONES_ALARM_MEMORY: 32,
+    CMD_ZONES_TAMPER_ALARM_MEMORY: 32,
+    CMD_ZONES_BYPASS: 32,
+    CMD_ZONES_MASKED: 32,
+    CMD_ZONES_MASKED_MEMORY: 32,
+    CMD_OUTPUTS: 32,
+    CMD_ARMED_SUPPRESSED: 4,
+    CMD_ARMED_MODE0: 4,
+    CMD_ARMED_MODE1: 4,
+    CMD_ARMED_MODE2: 4,
+    CMD_ARMED_MODE3: 4,
+    CMD_ENTRY_TIME: 4,
+    CMD_EXIT_OVER_10: 4,
+    CMD_EXIT_UNDER_10: 4,
+    CMD_PARTITIONS_ALARM: 4,
+    CMD_PARTITIONS_FIRE_ALARM: 4,
+    CMD_TROUBLE: 47,
+    CMD_TROUBLE2: 26,
+}
+
+# Capture file format of custom_components/satel_integra/capture.py
+CAPTURE_MAGIC = b"SATELCAP\x01"
+CAPTURE_HEADER = struct.Struct("<d")
+CAPTURE_RECORD = struct.Struct("<dBH")
+CAPTURE_RX = 0
+
+RESULT_OK = 0x00
+RESULT_ACCEPTED = 0xFF
+RESULT_BAD_CODE = 0x01
+
+
+def checksum(data: bytes) -> int:
+    """Calculate the frame checksum as per Satel manual."""
+    crc = 0x147A
+    for byte in data:
+        crc = ((crc << 1) & 0xFFFF) | (crc & 0x8000) >> 15
+        crc ^= 0xFFFF
+        crc = (crc + (crc >> 8) + byte) & 0xFFFF
+    return crc
+
+
+def encode_frame(data: bytes) -> bytes:
+    """Add header, checksum, escaping and footer to frame data."""
+    crc = checksum(data)
+    body = bytes(data) + bytes((crc >> 8, crc & 0xFF))
+    return b"\xFE\xFE" + body.replace(b"\xFE", b"\xFE\xF0") + END_SEQUENCE
+
+
+def decode_frame(frame: bytes) -> bytes:
+    """Verify and strip a received frame, return its data."""
+    if frame[:2] != b"\xFE\xFE" or frame[-2:] != END_SEQUENCE:
+        raise ValueError(f"Malformed frame {frame.hex()}")
+    body = frame[2:-2].replace(b"\xFE\xF0", b"\xFE")
+    if checksum(body[:-2]) != int.from_bytes(body[-2:], "big"):
+        raise ValueError(f"Wrong checksum {frame.hex()}")
+    return body[:-2]
+
+
+def bits_to_bytes(bits: Iterable[int], length: int) -> bytes:
+    """Encode 1-based bit numbers as little endian bitmask."""
+    mask = 0
+    for bit in bits:
+        mask |= 1 << (bit - 1)
+    return mask.to_bytes(length, "little")
+
+
+def bytes_to_bits(data: bytes) -> set[int]:
+    """Decode little endian bitmask to 1-based bit numbers."""
+    mask = int.from_bytes(data, "little")
+    return {bit + 1 for bit in range(len(data) * 8) if mask >> bit & 1}
+
+
+def read_capture(path: str) -> list[tuple[float, bytes]]:
+    """Return (time offset, frame) of frames received in a capture file."""
+    with open(path, "rb") as capture_file:
+        data = capture_file.read()
+    if not data.startswith(CAPTURE_MAGIC):
+        raise ValueError(f"{path} is not a Satel capture file")
+    frames = []
+    position = len(CAPTURE_MAGIC) + CAPTURE_HEADER.size
+    while position < len(data):
+        offset, direction, length = CAPTURE_RECORD.unpack_from(data, position)
+        position += CAPTURE_RECORD.size
+        if direction == CAPTURE_RX:
+            frames.append((offset, data[position : position + length]))
+        position += length
+    return frames
+
+
+class _EncryptedChannel:
+    """Server side of the encrypted integration protocol."""
+
+    def __init__(self, integration_key: str) -> None:
+        self._encryption = SatelEncryption(integration_key)
+        self._counter = 0
+        self._id_s = 0
+        self._id_r = 0
+
+    def unwrap(self, pdu: bytes) -> bytes:
+        decrypted = self._encryption.decrypt(pdu)
+        self._id_r = decrypted[4]
+        data = decrypted[6:]
+        if END_SEQUENCE in data:
+            data = data.split(END_SEQUENCE)[0] + END_SEQUENCE
+        return data
+
+    def wrap(self, frame: bytes) -> bytes:
+        header = (
+            os.urandom(2)
+            + self._counter.to_bytes(2, "big")
+            + bytes((self._id_s, self._id_r))
+        )
+        self._counter = (self._counter + 1) & 0xFFFF
+        self._id_s = (self._id_s + 1) & 0xFF
+        pdu = self._encryption.encrypt(header + frame)
+        return len(pdu).to_bytes(1, "big") + pdu
+
+
+class _Client:
+    """A connected integration client."""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        integration_key: str,
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.monitored: set[int] = set()
+        self.channel = _EncryptedChannel(integration_key) if integration_key else None
+
+    async def read_frame(self) -> bytes:
+        if self.channel:
+            length = (await self.reader.readexactly(1))[0]
+            return self.channel.unwrap(await self.reader.readexactly(length))
+        return await self.reader.readuntil(END_SEQUENCE)
+
+    def send(self, data: bytes) -> None:
+        frame = encode_frame(data)
+        self.writer.write(self.channel.wrap(frame) if self.channel else frame)
+
+
+class PanelSimulator:
+    """Simulated INTEGRA panel with an ETHM-1 Plus module."""
+
+    def __init__(
+        self,
+        zones: int = 32,
+        outputs: int = 32,
+        partitions: int = 4,
+        code: str = "1234",
+        integration_key: str = "",
+        temperature_sensors: Iterable[int] = (),
+        response_delay: float = 0.0,
+    ) -> None:
+        """Initialize the simulator, all zones idle and partitions disarmed."""
+        self.zones = zones
+        self.outputs = outputs
+        self.partitions = partitions
+        self.code = code
+        self.integration_key = integration_key
+        self.response_delay = response_delay
+        self.states: dict[int, set[int]] = {command: set() for command in STATE_LENGTHS}
+        self.temperatures = {sensor: 21.0 for sensor in temperature_sensors}
+        # perf_counter() of the last change of every (command, bit)
+        self.changed_at: dict[tuple[int, int], float] = {}
+        self.frames_sent = 0
+        self._clients: set[_Client] = set()
+        self._server: asyncio.Server | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening and return the bound port."""
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Disconnect clients and stop listening."""
+        for client in list(self._clients):
+            client.writer.close()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def set_state(self, command: int, bit: int, value: bool) -> None:
+        """Change a single bit of a state and notify monitoring clients."""
+        bits = self.states[command]
+        if (bit in bits) == value:
+            return
+        if value:
+            bits.add(bit)
+        else:
+            bits.discard(bit)
+        self.changed_at[(command, bit)] = time.perf_counter()
+        self._notify(command)
+
+    def send_raw_state(self, data: bytes) -> None:
+        """Push a recorded state frame to every monitoring client."""
+        command = data[0]
+        if command not in STATE_LENGTHS:
+            return
+        self.states[command] = bytes_to_bits(data[1:])
+        for client in self._clients:
+            if command in client.monitored:
+                client.send(data)
+                self.frames_sent += 1
+
+    async def replay(self, frames: list[tuple[float, bytes]], speed: float) -> int:
+        """Play recorded state frames at speed times the recorded pace.
+
+        Speed 0 plays them as fast as possible. Return the number of frames.
+        """
+        if not frames:
+            return 0
+        started = time.monotonic()
+        first_offset = frames[0][0]
+        for offset, data in frames:
+            if speed:
+                delay = (offset - first_offset) / speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)
+            self.send_raw_state(data)
+        return len(frames)
+
+    async def run_storm(
+        self,
+        rate: float,
+        duration: float,
+        command: int = CMD_ZONES_VIOLATED,
+        script: list[dict] | None = None,
+    ) -> int:
+        """Toggle zones at given changes per second, return number of changes.
+
+        Without a script random zones are toggled. A script is a list of
+        {"zone": n, "state": 0/1} steps, optionally with "command", played
+        in a loop.
+        """
+        interval = 1 / rate
+        deadline = time.monotonic() + duration
+        changes = 0
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            if script:
+                step = script[changes % len(script)]
+                self.set_state(step.get("command", command), step["zone"], bool(step["state"]))
+            else:
+                zone = random.randint(1, self.zones)
+                self.set_state(command, zone, zone not in self.states[command])
+            changes += 1
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+        return changes
+
+    def _notify(self, command: int) -> None:
+        data = self._state_frame(command)
+        for client in self._clients:
+            if command in client.monitored:
+                client.send(data)
+                self.frames_sent += 1
+
+    def _state_frame(self, command: int) -> bytes:
+        return bytes((command,)) + bits_to_bytes(self.states[command], STATE_LENGTHS[command])
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        client = _Client(reader, writer, self.integration_key)
+        self._clients.add(client)
+        _LOGGER.info("Client connected: %s", writer.get_extra_info("peername"))
+        try:
+            while True:
+                data = decode_frame(await client.read_frame())
+                if self.response_delay:
+                    await asyncio.sleep(self.response_delay)
+                self._handle_request(client, data)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        except ValueError as err:
+            _LOGGER.warning("Dropping client: %s", err)
+        finally:
+            self._clients.discard(client)
+            writer.close()
+            _LOGGER.info("Client disconnected")
+
+    def _handle_request(self, client: _Client, data: bytes) -> None:
+        command = data[0]
+        if command == CMD_START_MONITORING:
+            # Bit n of the 12 byte mask selects state command n
+            client.monitored = {
+                bit - 1 for bit in bytes_to_bits(data[1:13]) if bit - 1 in STATE_LENGTHS
+            }
+            client.send(bytes((CMD_RESULT, RESULT_ACCEPTED)))
+            for monitored in sorted(client.monitored):
+                client.send(self._state_frame(monitored))
+        elif command in STATE_LENGTHS:
+            client.send(self._state_frame(command))
+        elif command == CMD_READ_TEMPERATURE:
+            zone = data[1] or 256
+            value = round(self.temperatures.get(zone, 21.0) * 2 + 0x6E)
+            client.send(bytes((command, data[1])) + value.to_bytes(2, "big"))
+        elif command == CMD_DEVICE_NAME:
+            kind, number = data[1], data[2]
+            name = f"Device {number}".ljust(16).encode("ascii")
+            client.send(bytes((command, kind, number, 0)) + name)
+        elif CMD_ARM_MODE0 <= command <= CMD_OUTPUTS_OFF:
+            self._handle_control(client, command, data[1:9], data[9:])
+        else:
+            _LOGGER.debug("Ignoring command 0x%02X", command)
+
+    def _handle_control(
+        self, client: _Client, command: int, code: bytes, payload: bytes
+    ) -> None:
+        if code.hex().upper().rstrip("F") != self.code.upper():
+            client.send(bytes((CMD_RESULT, RESULT_BAD_CODE)))
+            return
+        client.send(bytes((CMD_RESULT, RESULT_ACCEPTED)))
+
+        targets = bytes_to_bits(payload)
+        if command < CMD_DISARM:
+            mode = (CMD_ARMED_MODE0, CMD_ARMED_MODE1, CMD_ARMED_MODE2, CMD_ARMED_MODE3)[
+                command - CMD_ARM_MODE0
+            ]
+            for partition in targets:
+                self.set_state(mode, partition, True)
+        elif command == CMD_DISARM:
+            for partition in targets:
+                for mode in (CMD_ARMED_MODE0, CMD_ARMED_MODE1, CMD_ARMED_MODE2, CMD_ARMED_MODE3):
+                    self.set_state(mode, partition, False)
+        elif command == CMD_CLEAR_ALARM:
+            for partition in targets:
+                self.set_state(CMD_PARTITIONS_ALARM, partition, False)
+                self.set_state(CMD_PARTITIONS_FIRE_ALARM, partition, False)
+        else:
+            state = {
+                CMD_BYPASS: (CMD_ZONES_BYPASS, True),
+                CMD_UNBYPASS: (CMD_ZONES_BYPASS, False),
+                CMD_OUTPUTS_ON: (CMD_OUTPUTS, True),
+                CMD_OUTPUTS_OFF: (CMD_OUTPUTS, False),
+            }[command]
+            for bit in targets:
+                self.set_state(state[0], bit, state[1])
+
+
+async def _main(args: argparse.Namespace) -> None:
+    simulator = PanelSimulator(
+        zones=args.zones,
+        outputs=args.outputs,
+        partitions=args.partitions,
+        code=args.code,
+        integration_key=args.integration_key,
+        temperature_sensors=range(1, args.temperature_sensors + 1),
+    )
+    port = await simulator.start(args.host, args.port)
+    _LOGGER.info("Simulating %s zones on %s:%s", args.zones, args.host, port)
+
+    script = None
+    if args.script:
+        with open(args.script, encoding="utf-8") as script_file:
+            script = json.load(script_file)
+    try:
+        if args.replay:
+            await asyncio.sleep(args.delay)
+            played = await simulator.replay(read_capture(args.replay), args.speed)
+            _LOGGER.info("Replay done, %s frames", played)
+        elif args.rate:
+            # Give clients time to connect before the storm
+            await asyncio.sleep(args.delay)
+            changes = await simulator.run_storm(args.rate, args.duration, script=script)
+            _LOGGER.info("Storm done, %s changes, %s frames sent", changes, simulator.frames_sent)
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7094)
+    parser.add_argument("--zones", type=int, default=32)
+    parser.add_argument("--outputs", type=int, default=32)
+    parser.add_argument("--partitions", type=int, default=4)
+    parser.add_argument("--temperature-sensors", type=int, default=0)
+    parser.add_argument("--code", default="1234")
+    parser.add_argument("--integration-key", default="")
+    parser.add_argument("--rate", type=float, default=0, help="zone changes per second")
+    parser.add_argument("--duration", type=float, default=60, help="storm length in seconds")
+    parser.add_argument("--delay", type=float, default=5, help="seconds before the storm/replay")
+    parser.add_argument("--script", help="JSON list of zone changes to play")
+    parser.add_argument("--replay", help="capture file to play back")
+    parser.add_argument("--speed", type=float, default=1, help="replay speed, 0 is maximum")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))